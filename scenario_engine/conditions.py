@@ -11,10 +11,11 @@ so the report overclaims. Worse, a set with nothing at all in common intersects
 to no conditions and reads as unconditional.
 
 This computes a minimal disjunctive normal form instead (Quine-McCluskey plus a
-greedy cover). Every implicant is a subset of the qualifying set by
-construction, and together they cover it, so the description is exactly the set
--- never broader. An unconditional result falls out naturally: the full cube
-collapses to a single implicant with no conditions.
+greedy cover, shortened by a bounded branch and bound when the instance is
+small). Every implicant is a subset of the qualifying set by construction, and
+together they cover it, so the description is exactly the set -- never broader.
+An unconditional result falls out naturally: the full cube collapses to a single
+implicant with no conditions.
 """
 
 
@@ -23,6 +24,13 @@ def _prime_implicants(minterms, num_vars):
 
     An implicant is (value, care_mask): bits set in care_mask are pinned to the
     matching bits of value, the rest are don't-cares.
+
+    Two implicants merge only when they pin the same variables and differ in
+    exactly one of them, so the one with the 0 there has its partner one set bit
+    up -- the next popcount bucket, in Quine-McCluskey's terms. Rather than
+    comparing every pair of a round, each implicant looks up those partners
+    directly, one per cared bit it has clear: a round costs implicants x
+    variables set lookups instead of implicants squared.
     """
     full_care = (1 << num_vars) - 1
     groups = {(m, full_care) for m in minterms}
@@ -31,48 +39,105 @@ def _prime_implicants(minterms, num_vars):
     while groups:
         merged = set()
         combined = set()
-        group_list = sorted(groups)
-        for i in range(len(group_list)):
-            value_a, care_a = group_list[i]
-            for j in range(i + 1, len(group_list)):
-                value_b, care_b = group_list[j]
-                if care_a != care_b:
-                    continue
-                diff = (value_a ^ value_b) & care_a
-                # exactly one cared bit differs -> that bit becomes don't-care
-                if diff and diff & (diff - 1) == 0:
-                    merged.add(group_list[i])
-                    merged.add(group_list[j])
-                    combined.add((value_a & ~diff, care_a & ~diff))
-        primes.update(g for g in group_list if g not in merged)
+        # Walked, and its primes kept, in sorted order, as the all-pairs pass did:
+        # sets of the same implicants added in another order can iterate in
+        # another order, and the cover breaks its ties in iteration order.
+        ordered = sorted(groups)
+        for value, care in ordered:
+            clear = care & ~value
+            while clear:
+                bit = clear & -clear
+                clear ^= bit
+                partner = (value | bit, care)
+                if partner in groups:
+                    # the differing bit becomes don't-care
+                    merged.add((value, care))
+                    merged.add(partner)
+                    combined.add((value, care & ~bit))
+        primes.update(g for g in ordered if g not in merged)
         groups = combined
 
     return primes
 
 
-def _outcomes_matching(implicant, minterms):
+# The exact cover is only tried on small instances -- the few dozen primes a real
+# team's scenarios come to -- and only for so many nodes, after which it settles
+# for the best cover it has, never longer than the greedy one. Past either limit
+# the search costs far more than the line or two it could save.
+EXACT_COVER_PRIMES = 40
+EXACT_COVER_NODES = 5_000
+
+
+def _coverage(implicant, num_vars):
+    """The outcomes `implicant` covers, as a bitmap: bit m set for outcome m."""
     value, care = implicant
-    return {m for m in minterms if m & care == value}
+    free = ~care & ((1 << num_vars) - 1)
+    bits = 0
+    sub = free
+    while True:
+        bits |= 1 << (value | sub)
+        if not sub:
+            return bits
+        sub = (sub - 1) & free
 
 
-def _greedy_cover(primes, minterms):
-    """Pick implicants until every qualifying outcome is covered."""
-    remaining = set(minterms)
+def _greedy_cover(primes, coverage, remaining):
+    """Pick implicants until every qualifying outcome is covered.
+
+    `coverage` maps each prime to its bitmap, worked out once; each step is then
+    a popcount of an AND per prime rather than a pass over every outcome.
+    """
     chosen = []
     while remaining:
         best = max(
             primes,
-            key=lambda p: (len(_outcomes_matching(p, minterms) & remaining), -p[1]),
+            key=lambda p: ((coverage[p] & remaining).bit_count(), -p[1]),
         )
-        covered = _outcomes_matching(best, minterms)
-        if not covered & remaining:  # defensive: cannot happen for prime implicants
+        if not coverage[best] & remaining:  # defensive: cannot happen for prime implicants
             break
         chosen.append(best)
-        remaining -= covered
+        remaining &= ~coverage[best]
     return chosen
 
 
-def minimal_dnf(minterms, num_vars):
+def _cost(cover):
+    """Alternatives first, then conditions across them: what a reader wades through."""
+    return len(cover), sum(care.bit_count() for _, care in cover)
+
+
+def _exact_cover(primes, coverage, remaining, bound, budget=EXACT_COVER_NODES):
+    """The cheapest cover (see _cost) of `remaining`, or `bound` if none beats it.
+
+    Branch and bound: the lowest outcome not yet covered must be covered by one
+    of the primes that contain it, so each is tried in turn, most coverage first,
+    and a branch stops as soon as it cannot come in under the best cover so far.
+    `bound` -- the greedy cover -- is that best to begin with, so the answer is
+    never worse than greedy, and is greedy's own cover when nothing is better.
+    """
+    best = [list(bound), _cost(bound)]
+    nodes = [0]
+
+    def extend(chosen, literals, remaining):
+        if not remaining:
+            if (len(chosen), literals) < best[1]:
+                best[:] = [list(chosen), (len(chosen), literals)]
+            return
+        if (len(chosen) + 1, literals) >= best[1] or nodes[0] >= budget:
+            return
+        nodes[0] += 1
+        lowest = remaining & -remaining
+        options = [p for p in primes if coverage[p] & lowest]
+        options.sort(key=lambda p: (-(coverage[p] & remaining).bit_count(), -p[1]))
+        for prime in options:
+            chosen.append(prime)
+            extend(chosen, literals + prime[1].bit_count(), remaining & ~coverage[prime])
+            chosen.pop()
+
+    extend([], 0, remaining)
+    return best[0]
+
+
+def minimal_dnf(minterms, num_vars, exact=True):
     """Describe `minterms` exactly as a list of implicants.
 
     `minterms` is a set of ints, each a bitmask over `num_vars` variables.
@@ -81,6 +146,13 @@ def minimal_dnf(minterms, num_vars):
     - `[]`            -- the set is empty; this never happens
     - `[{}]`          -- every outcome qualifies; unconditional
     - anything else   -- alternatives, any one of which suffices
+
+    The alternatives are a greedy cover of the prime implicants, shortened by an
+    exact search when there are at most EXACT_COVER_PRIMES of them; `exact=False`
+    keeps the greedy cover as it is. The search stops after EXACT_COVER_NODES
+    nodes with the best cover found so far, so even `exact=True` is only certain
+    to be the shortest cover when it finishes within that. The description is
+    exact either way; only its length may not be the least possible.
     """
     minterms = set(minterms)
     if not minterms:
@@ -89,8 +161,15 @@ def minimal_dnf(minterms, num_vars):
         return [{}]
 
     primes = _prime_implicants(minterms, num_vars)
+    coverage = {p: _coverage(p, num_vars) for p in primes}
+    remaining = 0
+    for m in minterms:
+        remaining |= 1 << m
+    cover = _greedy_cover(primes, coverage, remaining)
+    if exact and len(primes) <= EXACT_COVER_PRIMES:
+        cover = _exact_cover(primes, coverage, remaining, cover)
     implicants = []
-    for value, care in _greedy_cover(primes, minterms):
+    for value, care in cover:
         implicants.append(
             {bit: (value >> bit) & 1 for bit in range(num_vars) if care >> bit & 1}
         )
@@ -52,3 +52,16 @@ def espn_s2():
 
 def swid():
     return _default_str("SWID", "SWID")
+
+
+# Where verdicts are kept between runs (see verdict_cache). Unset means no cache:
+# every run settles every verdict, as it always has.
+def cache_dir():
+    return _default_str("SCENARIO_CACHE", "CACHE_DIR")
+
+
+# Where `--wire compact` puts the blobs it moves out of a payload (see wire). They
+# are named by content, so a shared directory only ever holds one of each. Unset
+# means each run keeps its blobs in a private directory, removed once read.
+def blob_dir():
+    return _default_str("SCENARIO_BLOBS", "BLOB_DIR")
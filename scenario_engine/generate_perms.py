@@ -1,12 +1,20 @@
+import argparse
 import sys
 import json
 import itertools
 
+import wire
 
-def gen_perms(league_data):
+
+def iter_perms(league_data):
+    """Every outcome of next week as a tuple of winners, one at a time."""
     matchups = league_data["next_week_matchups"]
     possible_outcomes = [(matchup["team1"], matchup["team2"]) for matchup in matchups]
-    return list(itertools.product(*possible_outcomes))
+    return itertools.product(*possible_outcomes)
+
+
+def gen_perms(league_data):
+    return list(iter_perms(league_data))
 
 
 def generate_matchup_permutations(league_data):
@@ -18,13 +26,76 @@ def generate_matchup_permutations(league_data):
     return gen_perms(league_data)
 
 
-if __name__ == "__main__":
-    league_data = json.load(sys.stdin)
-    permutations = generate_matchup_permutations(league_data)
-    # Package and send output as JSON for next script to use
-    output_payload = {
+def outcome_count(league_data):
+    """How many outcomes next week has: two per matchup, every combination."""
+    return 1 << len(league_data["next_week_matchups"])
+
+
+def compact_payload(league_data):
+    """The stage-3 payload that counts next week's outcomes instead of listing them.
+
+    Outcome i is the integer whose bit k is set when matchup k goes to its team2.
+    Listing every permutation by winner names grows as 2^k games x k names -- tens
+    of megabytes at 10 matchups -- for what one number says.
+    """
+    return {
         "base_league_data": league_data,
-        "permutations": [list(p) for p in permutations]  # convert tuples to lists
+        "outcome_count": outcome_count(league_data),
     }
 
-    print(json.dumps(output_payload, indent=2))
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="generate_perms.py",
+        description="Stage 3: enumerate every outcome of next week's matchups.",
+    )
+    form = parser.add_mutually_exclusive_group()
+    form.add_argument(
+        "--compact",
+        action="store_true",
+        help="emit only the number of outcomes; stage 4 counts through them itself",
+    )
+    form.add_argument(
+        "--stream",
+        action="store_true",
+        help="emit NDJSON: a header line with the league, then one permutation "
+        "per line, written as they are generated",
+    )
+    wire.add_argument(parser)
+    return parser.parse_args(argv)
+
+
+def stream_perms(league_data, out, wire_format="pretty"):
+    """Write the streamed form of the stage-3 payload to `out`.
+
+    The header line carries the base league; each line after it is one
+    permutation. Nothing is held but the permutation being written, so memory
+    stays flat however many matchups there are, and stage 4 -- which reads the
+    lines as they come -- starts deciding outcomes before this has finished.
+    """
+    header = {"base_league_data": league_data}
+    if wire_format == "compact":
+        out.write(wire.dumps(header, wire_format) + "\n")
+    else:
+        out.write(json.dumps(header) + "\n")
+    for permutation in iter_perms(league_data):
+        out.write(json.dumps(list(permutation)) + "\n")
+
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    league_data = json.load(sys.stdin)
+    if args.stream:
+        stream_perms(league_data, sys.stdout, args.wire)
+    else:
+        if args.compact:
+            output_payload = compact_payload(league_data)
+        else:
+            permutations = generate_matchup_permutations(league_data)
+            # Package and send output as JSON for next script to use
+            output_payload = {
+                "base_league_data": league_data,
+                "permutations": [list(p) for p in permutations]  # convert tuples to lists
+            }
+
+        print(wire.dumps(output_payload, args.wire))
@@ -6,6 +6,7 @@ from collections import Counter
 import config
 import logo
 import projections
+import wire
 
 
 def load_league_data(file_path):
@@ -411,15 +412,17 @@ def parse_args(argv):
         action="store_true",
         help="fetch and inline team logos (needs Pillow; adds weight to the report)",
     )
+    wire.add_argument(parser)
     return parser.parse_args(argv), parser
 
 
-def main(argv=None):
-    args, parser = parse_args(sys.argv[1:] if argv is None else argv)
+def payload_for(args, parser):
+    """The stage-1 payload `args` ask for: replayed from a file, or from ESPN.
 
+    Anything wrong with the request ends in `parser.error`, as on the command line.
+    """
     if args.test:
-        print(json.dumps(load_league_data(args.test), indent=2))
-        return 0
+        return load_league_data(args.test)
 
     if args.week is None:
         parser.error("give a week number, or --test <path_to_file.json>")
@@ -472,7 +475,12 @@ def main(argv=None):
             f"cannot build standings through week {args.week}"
         )
 
-    print(json.dumps(build_payload(league, args.week, inline_logos=args.logos), indent=2))
+    return build_payload(league, args.week, inline_logos=args.logos)
+
+
+def main(argv=None):
+    args, parser = parse_args(sys.argv[1:] if argv is None else argv)
+    print(wire.dumps(payload_for(args, parser), args.wire))
     return 0
 
 
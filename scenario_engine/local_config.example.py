@@ -17,3 +17,11 @@ YEAR = 2024
 # the ESPN_S2 / SWID env vars instead). SWID keeps its surrounding braces {...}.
 # ESPN_S2 = "AEB...long-value..."
 # SWID = "{XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX}"
+
+# Optional: a directory to keep settled verdicts in, so re-running the same week
+# skips the engine (or set the SCENARIO_CACHE env var, or pass --cache).
+# CACHE_DIR = "~/.cache/fantasy-scenarios"
+
+# Optional: a directory to keep `--wire compact` side files in between runs (or set
+# the SCENARIO_BLOBS env var). Unset, each run uses a private temp directory.
+# BLOB_DIR = "~/.cache/fantasy-scenarios/blobs"
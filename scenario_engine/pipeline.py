@@ -0,0 +1,196 @@
+"""Every stage of the scenario pipeline in one process.
+
+run_scenarios.sh used to pipe five interpreters together: each paid for its own
+startup and imports, and each wrote the whole payload out with
+json.dumps(indent=2) for the next to parse straight back in. Early in a season
+that cost more than the math. Here the stages are the same functions the stage
+scripts call, handed each other's dicts in memory; the flags are the script's,
+and so are the bytes that come out.
+
+The JSON between stages survives only as a debugging aid: --dump-stage N prints
+what stage N would have written down the pipe, exactly, and stops there.
+
+    python3 scenario_engine/pipeline.py --test scenario_engine_tests/week13.json
+    python3 scenario_engine/pipeline.py --irl 13 --workers 4 --html report.html
+    python3 scenario_engine/pipeline.py --test week13.json --dump-stage 2 > s2.json
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+import generate_perms
+import league_data
+import pretty_print
+import refine_current_week
+import refine_hypothetical
+import to_html
+import verdict_cache
+
+# Each of these takes a value, as in run_scenarios.sh.
+VALUE_OPTIONS = (
+    "--html", "--league-id", "--year", "--dump", "--workers", "--deadline",
+    "--dump-stage", "--cache",
+)
+STAGES = (1, 2, 3, 4)
+
+
+def usage(prog):
+    print("Usage:")
+    print(f"  {prog} --irl <week_number>  [league options] [display flags]")
+    print(f"  {prog} --test <path.json>   [display flags]")
+    print()
+    print("League options select which league to download (--irl only):")
+    print("  --league-id <id> ESPN league id (default: the author's)")
+    print("  --year <year>    season to read")
+    print("  --logos          fetch and inline team logos (needs Pillow)")
+    print("  --dump <path>    also save the downloaded data, replayable with --test")
+    print()
+    print("Engine options apply to either mode:")
+    print("  --workers <n>    settle the teams, and next week's outcomes, in n processes")
+    print("                   (default: 1)")
+    print("  --deadline <s>   stop searching after s seconds; unsettled teams read 'alive'")
+    print("  --cache <dir>    keep verdicts here; an unchanged league skips the engine")
+    print("  --dump-stage <n> print the JSON stage n (1-4) would pipe on, and stop")
+    print()
+    print("Display flags are passed to the report and are all optional:")
+    print("  --html <path>    write an HTML report instead of printing to the terminal")
+    print("  --no-header      hide the summary line")
+    print("  --no-standings   hide the standings table")
+    print("  --no-matchups    hide next week's matchups")
+    print("  --no-stats       hide the season-review tables (HTML only)")
+    return 1
+
+
+def fail(message):
+    print(f"Error: {message}", file=sys.stderr)
+    return 1
+
+
+def dump(payload, file=sys.stdout):
+    """A payload as its stage script prints it."""
+    file.write(json.dumps(payload, indent=2) + "\n")
+
+
+def main(argv=None, prog=None):
+    argv = sys.argv[1:] if argv is None else argv
+    prog = prog or os.path.basename(sys.argv[0])
+    if len(argv) < 2:
+        return usage(prog)
+    mode, arg, rest = argv[0], argv[1], list(argv[2:])
+
+    # Sorted by the stage that understands them, as run_scenarios.sh does.
+    display_flags = []
+    league_flags = []
+    engine_flags = []
+    outcome_flags = []
+    html_out = None
+    dump_out = None
+    dump_stage = None
+    while rest:
+        option = rest.pop(0)
+        if option in VALUE_OPTIONS:
+            if not rest:
+                return fail(f"{option} needs a value")
+            value = rest.pop(0)
+            if value.startswith("-"):
+                return fail(f"{option} needs a value, got '{value}'")
+            if option == "--html":
+                html_out = value
+            elif option == "--dump":
+                dump_out = value
+            elif option == "--dump-stage":
+                if value not in {str(n) for n in STAGES}:
+                    return fail(f"--dump-stage takes a stage from 1 to 4, got '{value}'")
+                dump_stage = int(value)
+            elif option in ("--workers", "--cache"):
+                engine_flags += [option, value]
+                outcome_flags += [option, value]
+            elif option == "--deadline":
+                engine_flags += [option, value]
+            else:
+                league_flags += [option, value]
+        elif option == "--logos":
+            league_flags.append(option)
+        else:
+            display_flags.append(option)
+
+    if mode != "--irl":
+        if league_flags:
+            return fail("--league-id, --year and --logos only apply to --irl")
+        if dump_out:
+            return fail(f"--dump only applies to --irl; {arg} is already a saved payload")
+
+    if mode == "--irl":
+        if not re.fullmatch(r"[0-9]+", arg):
+            return fail(
+                f"week_number must be a whole number of weeks already played, got '{arg}'"
+            )
+        stage1_args = [arg, *league_flags]
+    elif mode == "--test":
+        if not os.path.isfile(arg):
+            return fail(f"no such file: {arg}")
+        stage1_args = ["--test", arg]
+    else:
+        return usage(prog)
+
+    # Every stage's flags are read up front, by that stage's own parser, so a
+    # bad one is reported in the stage's words before any work is done.
+    engine = refine_current_week.parse_args(engine_flags)
+    outcomes = refine_hypothetical.parse_args(outcome_flags)
+    if html_out:
+        display = to_html.parse_args(["-o", html_out, *display_flags])
+    else:
+        display = pretty_print.parse_args(display_flags)
+
+    args, parser = league_data.parse_args(stage1_args)
+    try:
+        payload = league_data.payload_for(args, parser)
+    except SystemExit:
+        return 1
+    if dump_out:
+        with open(dump_out, "w") as file:
+            dump(payload, file)
+    if dump_stage == 1:
+        dump(payload)
+        return 0
+
+    deadline = (
+        time.monotonic() + engine.deadline if engine.deadline is not None else None
+    )
+    settled = refine_current_week.settle_league(
+        payload,
+        workers=engine.workers,
+        deadline=deadline,
+        cache=verdict_cache.open_cache(engine.cache),
+    )
+    if dump_stage == 2:
+        dump(settled)
+        return 0
+
+    counted = generate_perms.compact_payload(settled)
+    if dump_stage == 3:
+        dump(counted)
+        return 0
+
+    scenarios = refine_hypothetical.scenarios_payload(
+        counted["base_league_data"],
+        refine_hypothetical.outcomes_in(counted),
+        workers=outcomes.workers,
+        cache=verdict_cache.open_cache(outcomes.cache),
+    )
+    if dump_stage == 4:
+        dump(scenarios)
+        return 0
+
+    if html_out:
+        to_html.publish(to_html.render(scenarios, to_html.sections(display)), display.output)
+    else:
+        pretty_print.report(scenarios, display)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
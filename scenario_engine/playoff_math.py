@@ -22,6 +22,11 @@ Two facts keep that search small.
    winner is seeded above every non-winner whatever its record -- so the bound
    there allows one extra promotion per division.
 
+Before any of that, a question is offered to a flow argument -- the classic
+baseball-elimination network -- which settles most of them in polynomial time in
+a league without divisions, and is exact when a single seat is at stake. Only
+what it cannot settle is searched; see `_flow_counterexample`.
+
 Seeding follows ESPN's playoffSeedingRule = TOTAL_POINTS_SCORED: order by wins,
 then by total points scored. In a league with divisions, **every division winner
 is seeded ahead of every team that did not win one**, each group ordered by that
@@ -34,34 +39,328 @@ team never falling as games are decided. That holds under divisional seeding too
 because the team's own record is frozen and a team losing a division title is
 replaced above by whoever took it; `tests/test_divisions.py` property-tests it
 rather than trusting the argument.
+
+The search also remembers where it has been. Two different orders of deciding
+games often land the rivals on the same win totals, and everything below such a
+position depends only on those totals and on which games are still open -- so a
+position once shown to hold no counterexample is recorded in a bounded table and
+never searched again, by this search or by any later one asking the same
+question of the same league; see `TranspositionTable`.
+
+What it decides first is a choice too. By default the games between rivals
+nearest the cut line go first, each with the result likeliest to produce the
+counterexample tried first; see `BRANCHING`.
 """
 
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
 
 class SearchBudgetExceeded(Exception):
-    """Raised rather than returning a guess when the search grows too large."""
+    """Raised rather than returning a guess when the search grows too large.
+
+    Or runs past its deadline. Either way it carries what is needed to pick the
+    search up again: `continuations`, one per question left open (see
+    `resume_from`), and `ruled_out`, the verdicts already disproved on the way --
+    a team shown able to miss is not clinched, whatever else is still open.
+    """
+
+    def __init__(self, message, continuations=(), ruled_out=()):
+        super().__init__(message)
+        self.continuations = list(continuations)
+        self.ruled_out = list(ruled_out)
+
 
+# Part of every verdict_cache key. Bump it with any change that could alter a
+# verdict, a tiebreak margin, or which games are relevant, so nothing computed
+# by an older engine is read back as this one's answer.
+ENGINE_VERSION = 4
 
 DEFAULT_NODE_BUDGET = 2_000_000
+DEFAULT_TABLE_SIZE = 500_000
+DEFAULT_FRONTIER_SIZE = 1024
+
+
+class TranspositionTable:
+    """Positions already searched and found to hold no counterexample.
+
+    Keyed first on the question -- which team, which direction, and the league it
+    is asked of -- and then on the position within it: how many games have been
+    decided, plus the win totals of the rivals those decisions can still move.
+    Only dead ends are stored. A position that does hold a counterexample ends the
+    search the moment it is found, so there is nothing to look up later.
+
+    Bounded by the total number of positions held. When it fills, whole questions
+    are dropped, least recently asked first, so a long stage-4 run cannot grow it
+    without limit. `hits` and `misses` count lookups, for seeing it earn its keep.
+    """
+
+    def __init__(self, maxsize=DEFAULT_TABLE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._questions = OrderedDict()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def positions(self, question):
+        """The set of dead positions recorded for one question, created if new."""
+        dead = self._questions.get(question)
+        if dead is None:
+            dead = self._questions[question] = set()
+        else:
+            self._questions.move_to_end(question)
+        return dead
+
+    def record(self, dead, position):
+        """Remember `position` as a dead end, evicting old questions if full."""
+        if self._size >= self.maxsize:
+            self._evict(keep=dead)
+            if self._size >= self.maxsize:
+                return  # this question alone fills the table; stop growing it
+        dead.add(position)
+        self._size += 1
+
+    def _evict(self, keep):
+        while self._size >= self.maxsize and len(self._questions) > 1:
+            question, dead = next(iter(self._questions.items()))
+            if dead is keep:
+                self._questions.move_to_end(question)
+                continue
+            del self._questions[question]
+            self._size -= len(dead)
+
+    def clear(self):
+        self._questions.clear()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "positions": self._size}
+
+
+# Shared by every search in the process, so repeated questions -- the same team
+# asked again under a different tiebreak probe, or the same later weeks under a
+# different stage-4 permutation -- start from what earlier searches learned.
+TRANSPOSITIONS = TranspositionTable()
+
+
+def transposition_stats():
+    """Hit/miss counts of the shared table since it was last cleared."""
+    return TRANSPOSITIONS.stats()
+
+
+# How often a question was answered from what an earlier run already knew rather
+# than asked afresh: teams whose verdict was handed down (`inherited`), and
+# witness-pool lookups that found a completion or came up empty.
+REUSE_COUNTS = ("inherited", "hits", "misses")
+_REUSE = dict.fromkeys(REUSE_COUNTS, 0)
+
+
+def reuse_stats():
+    """Reuse counts since the process started or `reset_reuse_stats` was called.
+
+    `hit_rate` is the share of pool lookups answered without a search; each
+    inherited verdict saved a team's questions outright.
+    """
+    looked = _REUSE["hits"] + _REUSE["misses"]
+    return {**_REUSE, "hit_rate": _REUSE["hits"] / looked if looked else 0.0}
+
+
+def reset_reuse_stats():
+    for key in REUSE_COUNTS:
+        _REUSE[key] = 0
+
+
+def add_reuse_stats(counts):
+    """Fold in counts gathered elsewhere -- in a worker process, say."""
+    for key in REUSE_COUNTS:
+        _REUSE[key] += counts.get(key, 0)
+
+
+# Where each search that ran out stopped, by question and league, to be carried on
+# from there the next time the same league is asked the same question. Filled by
+# _search as it gives up, or from a saved payload by resume_from.
+_FRONTIERS = {}
+
+
+def resume_from(continuations):
+    """Have the next searches of these questions carry on where they stopped.
+
+    `continuations` are the JSON-ready dicts a SearchBudgetExceeded carries, as
+    saved in a payload. Each resumes exactly one question, once: the question
+    it names, asked of the same league, the same way.
+    """
+    for continuation in continuations:
+        _FRONTIERS[_frozen(continuation["question"])] = continuation
+
+
+def _frozen(value):
+    """JSON's lists back into the tuples a question key is made of."""
+    if isinstance(value, list):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+def _thawed(value):
+    if isinstance(value, tuple):
+        return [_thawed(v) for v in value]
+    return value
+
+
+DEFAULT_POOL_SIZE = 256
+
+
+class WitnessPool:
+    """Completions already found for one league, kept to answer later questions.
+
+    Every answer the engine finds is a whole season: a completion in which some
+    team gets in, or misses. That same season usually answers other questions
+    too -- somebody else misses in it, somebody else gets in -- and checking it
+    costs one seeding, where a search costs thousands of nodes. So each
+    completion found is kept here, and a question is put to the pool before it
+    is searched.
+
+    A completion fixes every result, so it stays a valid season for any question
+    about the same records and games: a different number of seats, or the
+    tiebreak probes' moved points, only change who it puts in, which is
+    re-checked each time. Completions are kept by their final records, since two
+    with the same records answer every question alike.
+    """
+
+    def __init__(self, state, maxsize=DEFAULT_POOL_SIZE):
+        self.wins = state.wins
+        self.games = state.games
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._finals = {}
+        # Each kept completion's `places_above` per team, per (points, divisions)
+        # it was seeded under, so a completion is seeded once per scoring rather
+        # than once per lookup. Filled only as far as lookups have scanned.
+        self._seats = {}
+
+    def __len__(self):
+        return len(self._finals)
+
+    def covers(self, state):
+        """True if the pool's completions are seasons of `state`'s league."""
+        return state.wins == self.wins and state.games == self.games
+
+    def add(self, completion):
+        if completion is None or len(self._finals) >= self.maxsize:
+            return
+        wins = list(self.wins)
+        for _, winner in completion:
+            wins[winner] += 1
+        self._finals.setdefault(tuple(wins), completion)
+
+    def add_outcome(self, outcome):
+        """Keep a completion written as by `outcomes`, if it fits this league."""
+        if len(outcome) != len(self.games) or set(outcome) - {"0", "1"}:
+            return
+        self.add(
+            [
+                (k, pair[bit == "1"])
+                for k, (pair, bit) in enumerate(zip(self.games, outcome))
+            ]
+        )
+
+    def outcomes(self):
+        """Every kept completion, one '0'/'1' per game: '1' when the second team wins.
+
+        The form completions travel in between stages. Games are in `games` order,
+        so a string only means anything next to the schedule it was found on.
+        """
+        return [
+            "".join("01"[winner == self.games[k][1]] for k, winner in sorted(completion))
+            for completion in self._finals.values()
+        ]
+
+    def find(self, state, team, want_in):
+        """A kept completion where `team` does / does not get in, or None."""
+        seats = self._seats.setdefault((state.score, state.divisions), [])
+        for k, (wins, completion) in enumerate(self._finals.items()):
+            if k == len(seats):
+                seats.append(places_above(wins, state.score, state.divisions))
+            if (seats[k][team] < state.playoff_spots) == want_in:
+                self.hits += 1
+                return completion
+        self.misses += 1
+        return None
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "completions": len(self)}
 
 
 class LeagueState:
     """Snapshot of a league plus the games it has left to play.
 
-    wins/losses/points are parallel lists indexed by team. `games` is a flat
-    list of (i, j) pairs -- week boundaries do not affect who finishes where,
+    wins/losses/points are parallel tuples indexed by team. `games` is a flat
+    tuple of (i, j) pairs -- week boundaries do not affect who finishes where,
     only how conditions get worded, so they are flattened here.
+
+    Every field is immutable, so the probes built from a state -- fewer seats,
+    moved points, games played -- share whatever they do not change rather than
+    copying it; stage 4 builds thousands of them per run. `score` is `points` in
+    integer hundredths, which is all the precision fantasy scoring has, and is
+    what every comparison in the search uses. `points` stays as given, for the
+    gaps reported to readers.
     """
 
+    __slots__ = (
+        "names",
+        "wins",
+        "losses",
+        "points",
+        "score",
+        "games",
+        "playoff_spots",
+        "divisions",
+    )
+
     def __init__(self, names, wins, losses, points, games, playoff_spots, divisions=None):
-        self.names = list(names)
-        self.wins = list(wins)
-        self.losses = list(losses)
-        self.points = list(points)
-        self.games = list(games)
+        self.names = tuple(names)
+        self.wins = tuple(wins)
+        self.losses = tuple(losses)
+        self.points = tuple(points)
+        self.score = _hundredths(self.points)
+        self.games = tuple((i, j) for i, j in games)
         self.playoff_spots = playoff_spots
         # One division id per team, or None for a league without divisions. Only
         # two or more distinct ids change anything.
-        self.divisions = list(divisions) if divisions else None
+        self.divisions = tuple(divisions) if divisions else None
+
+    def _derive(self, **changes):
+        """A copy with `changes` applied, sharing every other field as it is.
+
+        Changed fields must already be in stored form: tuples, with `score`
+        given alongside `points`.
+        """
+        state = object.__new__(LeagueState)
+        for field in LeagueState.__slots__:
+            setattr(state, field, changes.get(field, getattr(self, field)))
+        return state
+
+    def __reduce__(self):
+        # Pickled as its constructor arguments alone, which is all a worker
+        # process needs to rebuild it.
+        return (
+            LeagueState,
+            (
+                self.names,
+                self.wins,
+                self.losses,
+                self.points,
+                self.games,
+                self.playoff_spots,
+                self.divisions,
+            ),
+        )
 
     @property
     def is_divisional(self):
@@ -92,13 +391,18 @@ class LeagueState:
             wins[winner] += 1
             losses[loser] += 1
             played.add(game_index)
-        games = [g for k, g in enumerate(self.games) if k not in played]
-        return LeagueState(
-            self.names, wins, losses, self.points, games, self.playoff_spots,
-            self.divisions,
+        return self._derive(
+            wins=tuple(wins),
+            losses=tuple(losses),
+            games=tuple(g for k, g in enumerate(self.games) if k not in played),
         )
 
 
+def _hundredths(points):
+    """Scores as whole hundredths, so comparing them is exact integer work."""
+    return tuple(round(p * 100) for p in points)
+
+
 def beats(a, b, wins, points):
     """True if team a outranks team b under (wins, then total points)."""
     if wins[a] != wins[b]:
@@ -128,7 +432,9 @@ def seed_order(wins, points, divisions=None):
         min((t for t in range(count) if divisions[t] == division), key=rank)
         for division in set(divisions)
     }
-    return sorted(winners, key=rank) + sorted(
+    # Sorted by index first, so that winners level on record and points keep
+    # index order as everyone else does, rather than the set's iteration order.
+    return sorted(sorted(winners), key=rank) + sorted(
         (t for t in range(count) if t not in winners), key=rank
     )
 
@@ -153,18 +459,204 @@ def makes_playoffs(team, wins, points, num_teams, playoff_spots, divisions=None)
     return strictly_above(team, wins, points, num_teams, divisions) < playoff_spots
 
 
-def _search(state, team, want_in, budget):
+def places_above(wins, points, divisions=None):
+    """`strictly_above` for every team at once: one sort instead of one per team.
+
+    For the walks that ask about many teams at a single completion. Without
+    divisions a team is behind only the teams that beat it, so teams level on
+    wins and points all share the best place among them, exactly as the pairwise
+    count has it. Using seed_order's seats there would break that tie by index
+    and leave one of them out.
+    """
+    order = seed_order(wins, points, divisions)
+    places = [0] * len(wins)
+    if divisions is None or len(set(divisions)) < 2:
+        for place, u in enumerate(order):
+            v = order[place - 1] if place else None
+            level = v is not None and wins[v] == wins[u] and points[v] == points[u]
+            places[u] = places[v] if level else place
+        return places
+    for place, u in enumerate(order):
+        places[u] = place
+    return places
+
+
+class _SeedTracker:
+    """How many teams a divisional seed order puts ahead of one team, kept current.
+
+    `strictly_above` answers that by naming every division winner and sorting the
+    whole league, which is what a search node cannot afford. But the search only
+    ever moves one rival's record by one win at a time, with the team's own frozen,
+    so the answer can be maintained instead: each division's leader, and how many
+    teams rank ahead of the team on (wins, points, index) -- the order the sort
+    itself breaks ties in. The count is then
+
+        team leads its division:   other leaders ranked ahead of it
+        otherwise:                 every leader, plus the non-leaders ahead of it
+
+    and the second is (divisions) + (all teams ahead) - (leaders ahead), since its
+    own division's leader is always ahead of it. A win costs O(1), reading the
+    count O(divisions).
+
+    `wins` is the caller's list, shared: call `won` just after adding a win and
+    `unwon` just after taking it back, in strict last-in-first-out order.
+    """
+
+    def __init__(self, team, wins, points, divisions):
+        self.team = team
+        self.wins = wins
+        self.points = points
+        self.divisions = divisions
+        self.division = divisions[team]
+        self.leader = {}
+        for u in range(len(wins)):
+            d = divisions[u]
+            if d not in self.leader or self._rank(u) < self._rank(self.leader[d]):
+                self.leader[d] = u
+        mark = self._rank(team)
+        self.ahead = sum(1 for u in range(len(wins)) if u != team and self._rank(u) < mark)
+        self.undo = []
+
+    def _rank(self, u):
+        return (-self.wins[u], -self.points[u], u)
+
+    def won(self, u):
+        mark = self._rank(self.team)
+        self.wins[u] -= 1
+        was_ahead = self._rank(u) < mark
+        self.wins[u] += 1
+        if not was_ahead and self._rank(u) < mark:
+            self.ahead += 1
+        d = self.divisions[u]
+        previous = self.leader[d]
+        if previous != u and self._rank(u) < self._rank(previous):
+            self.leader[d] = u
+            self.undo.append(previous)
+        else:
+            self.undo.append(None)
+
+    def unwon(self, u):
+        mark = self._rank(self.team)
+        self.wins[u] += 1
+        was_ahead = self._rank(u) < mark
+        self.wins[u] -= 1
+        if was_ahead and not self._rank(u) < mark:
+            self.ahead -= 1
+        previous = self.undo.pop()
+        if previous is not None:
+            self.leader[self.divisions[u]] = previous
+
+    def above(self):
+        mark = self._rank(self.team)
+        leaders_ahead = sum(
+            1 for u in self.leader.values() if u != self.team and self._rank(u) < mark
+        )
+        if self.leader[self.division] == self.team:
+            return leaders_ahead
+        return len(self.leader) + self.ahead - leaders_ahead
+
+
+def _schedule_order(state, team, want_in, open_games, wins):
+    """The games as the schedule lists them, team1 tried first."""
+    return [(k, *state.games[k]) for k in open_games]
+
+
+def _constrained_order(state, team, want_in, open_games, wins):
+    """Games between rivals nearest the cut line first, likeliest result first.
+
+    A rival's `need` is the wins it still needs to finish above the team on
+    record. One already above, or unable to get there even winning out, is
+    settled: no result of its games changes whether it passes. So a game
+    between two unsettled rivals is decided first, and among those the rivals
+    with the least to do -- they are where a counterexample is won or lost, and
+    deciding them early lets the bounds cut everything else. Games between
+    settled teams go last, where the bounds usually never reach them.
+
+    The result tried first is the one that helps the hunt. Hunting for a way
+    in, the win goes to whichever team it does least harm with: a settled one,
+    else the one with the most room below the line. Hunting for a way to miss,
+    it goes to the unsettled rival closest to passing.
+    """
+    points = state.score
+    line = wins[team]
+    upside = [0] * state.num_teams
+    for k in open_games:
+        i, j = state.games[k]
+        upside[i] += 1
+        upside[j] += 1
+
+    def need(u):
+        return line - wins[u] + (0 if points[u] > points[team] else 1)
+
+    def settled(u):
+        return need(u) <= 0 or need(u) > upside[u]
+
+    def urgency(k):
+        i, j = state.games[k]
+        open_sides = [need(u) for u in (i, j) if not settled(u)]
+        return (-len(open_sides), min(open_sides, default=0))
+
+    def preference(u):
+        if want_in:
+            return (not settled(u), -need(u))
+        return (settled(u), need(u))
+
+    ordered = []
+    for k in sorted(open_games, key=urgency):
+        i, j = state.games[k]
+        first, second = (j, i) if preference(j) < preference(i) else (i, j)
+        ordered.append((k, first, second))
+    return ordered
+
+
+# How `_search` orders its branching, by name. Each takes the state, the team,
+# the direction, the open game indices and the records with the team's own games
+# already fixed, and returns [(game_index, winner_tried_first, other)] in the
+# order to decide them. Any order gives the same answers; only the node count
+# differs, by orders of magnitude -- `tools/branching_benchmark.py` measures it.
+BRANCHING = {
+    "schedule": _schedule_order,
+    "constrained": _constrained_order,
+}
+DEFAULT_BRANCHING = "constrained"
+
+ABOVE = object()  # a position's "this rival is past the team for good"
+
+
+def _search(
+    state,
+    team,
+    want_in,
+    budget,
+    table=TRANSPOSITIONS,
+    nodes=None,
+    branching=DEFAULT_BRANCHING,
+    deadline=None,
+):
     """Look for one completion where `team` does / does not make the playoffs.
 
-    Returns the winning assignment as a list of (game_index, winner), or None if
-    no such completion exists. `team`'s own games are fixed by the dominance
+    Returns the winning assignment as a list of (game_index, winner) covering
+    every game, or None if no such completion exists. `team`'s own games are fixed by the dominance
     argument in the module docstring: it wins out when we are hunting for a way
     in, and loses out when hunting for a way to miss.
+
+    Positions already known to be dead ends are skipped using `table`; pass None
+    to search without one. `nodes`, a one-element list, lets several searches
+    draw on a single budget. `branching` names the game and result order, one of
+    `BRANCHING`. `deadline`, a `time.monotonic()` value, stops it like the budget
+    does.
+
+    Running out raises SearchBudgetExceeded with a continuation: the path to the
+    node it stopped at, one bit per decided game for whether its second result
+    is still to come. That is the whole frontier of a depth-first search, so the
+    next search of the same question -- in this process, or in another given the
+    continuation through `resume_from` -- replays the path and carries on, with
+    a fresh budget, rather than starting over.
     """
     n = state.num_teams
     wins = list(state.wins)
     losses = list(state.losses)
-    points = state.points
+    points = state.score
     spots = state.playoff_spots
     divisions = state.divisions
 
@@ -180,6 +672,8 @@ def _search(state, team, want_in, budget):
             fixed.append((k, winner))
         else:
             open_games.append(k)
+    ordered = BRANCHING[branching](state, team, want_in, open_games, wins)
+    open_games = [k for k, _, _ in ordered]
 
     # Remaining games each rival could still win, for bounds pruning.
     upside = [0] * n
@@ -188,22 +682,166 @@ def _search(state, team, want_in, budget):
         upside[i] += 1
         upside[j] += 1
 
-    nodes = [0]
+    # Which teams still have an open game once the first `pos` are decided.
+    live_at = []
+    still_open = set()
+    for pos in range(len(open_games), -1, -1):
+        if pos < len(open_games):
+            still_open.update(state.games[open_games[pos]])
+        live_at.append(frozenset(still_open))
+    live_at.reverse()
+
+    # What is being asked, of which league: the key for both the dead ends and
+    # any frontier left by an earlier search that ran out.
+    question = (
+        team,
+        want_in,
+        wins[team],  # frozen for the whole search, and every comparison is with it
+        # Positions are numbered in the order games are decided, and a frontier's
+        # path in the order results are tried. The order is kept itself, not the
+        # name of its rule: "constrained" reads the rivals' records, so the same
+        # rule orders the same games differently under another set of them.
+        tuple(ordered),
+        spots,
+        points,
+        state.games,
+        divisions,
+    )
+    # A frontier is a path through one league's tree: the nodes it skips were
+    # only ever proven dead under that league's records. Dead positions carry
+    # the rivals' records in their keys and may be shared; a frontier may not,
+    # so it is keyed on the whole league it was left in.
+    frontier = (question, state.wins, state.losses)
+    dead = None
+    if table is not None:
+        dead = table.positions(question)
+        members = (
+            [
+                [t for t in range(n) if divisions[t] == division]
+                for division in sorted(set(divisions))
+            ]
+            if divisions is not None
+            else None
+        )
+
+    def position(pos):
+        """This position, with everything that can no longer matter folded away.
+
+        Without divisions every comparison is with `team`, so a rival already
+        above it stays above whatever else happens, and one that cannot pass it
+        never will: both reduce to a marker, and only the records of rivals
+        still in between are kept. That is what lets two orders of the same
+        results be recognised as one position. Every rival keeps its own slot,
+        marker or record: dropping the ones above would shift the rest along,
+        and two positions with different rivals in between would share a key.
+
+        With divisions, a rival's record also decides who leads its division, so
+        records are kept -- except in a division whose members have all finished
+        playing, which reduces to its leader and how many members are above, in
+        seed_order's sense: level on wins and points, the lower index is above.
+        """
+        live = live_at[pos]
+        if divisions is None:
+            between = []
+            for u in range(n):
+                if u == team:
+                    continue
+                if beats(u, team, wins, points):
+                    between.append(ABOVE)
+                elif u in live and could_still_pass(u):
+                    between.append(wins[u])
+                else:
+                    between.append(None)
+            return pos, tuple(between)
+
+        key = [pos]
+        for group in members:
+            if any(u in live for u in group):
+                key.append(tuple(wins[u] for u in group))
+            else:
+                rank = lambda u: (-wins[u], -points[u], u)
+                leader = min(group, key=rank)
+                key.append(
+                    (leader, sum(1 for u in group if rank(u) < rank(team)))
+                )
+        return tuple(key)
+
+    if nodes is None:
+        nodes = [0]
     chosen = []
+    # Divisional seeding is a whole-league sort; keep the team's place in it up
+    # to date game by game rather than sort at every node.
+    tracker = (
+        _SeedTracker(team, wins, points, divisions) if state.is_divisional else None
+    )
 
     def could_still_pass(u):
-        """Could u finish above `team`, given u's best case from here?"""
+        """Could u finish above `team`, given u's best case from here?
+
+        With divisions, finishing level on wins and points is enough for a rival
+        with the lower index: seed_order breaks that tie by index.
+        """
         best = wins[u] + upside[u]
         if best != wins[team]:
             return best > wins[team]
-        return points[u] > points[team]
-
-    def recurse(pos):
+        if points[u] != points[team]:
+            return points[u] > points[team]
+        return state.is_divisional and u < team
+
+    # Both counts the bounds read, kept current game by game rather than
+    # recounted at every node. A rival's best case only falls when it loses, so
+    # `reachable` only moves then; and with the team's record frozen, `above`
+    # only moves when a rival's win carries it past the team.
+    reachable = sum(1 for u in range(n) if u != team and could_still_pass(u))
+    # could_still_pass only knows about records, and a team can finish above
+    # this one by winning its division on a WORSE record -- exactly how an 8-6
+    # team was seeded above a 9-5 team in 2024. At most one team per division is
+    # promoted that way, so allowing for one each keeps the bound an
+    # over-estimate, which is what makes it safe.
+    if divisions is not None:
+        reachable += state.num_divisions
+    above = strictly_above(team, wins, points, n, divisions)
+
+    def decide(winner, loser):
+        nonlocal above, reachable
+        passed = tracker is None and beats(winner, team, wins, points)
+        could = could_still_pass(loser)
+        wins[winner] += 1
+        losses[loser] += 1
+        upside[winner] -= 1
+        upside[loser] -= 1
+        if tracker is not None:
+            tracker.won(winner)
+        elif not passed and beats(winner, team, wins, points):
+            above += 1
+        if could and not could_still_pass(loser):
+            reachable -= 1
+
+    def undo(winner, loser):
+        nonlocal above, reachable
+        passed = tracker is None and beats(winner, team, wins, points)
+        could = could_still_pass(loser)
+        wins[winner] -= 1
+        losses[loser] -= 1
+        upside[winner] += 1
+        upside[loser] += 1
+        if tracker is not None:
+            tracker.unwon(winner)
+        elif passed and not beats(winner, team, wins, points):
+            above -= 1
+        if not could and could_still_pass(loser):
+            reachable += 1
+
+    def settle(pos):
+        """True/False if this node is answered without branching, else its key.
+
+        A key of None means branch without consulting the table.
+        """
         nodes[0] += 1
         if nodes[0] > budget:
-            raise SearchBudgetExceeded(
-                f"exceeded {budget} nodes deciding {state.names[team]!r}"
-            )
+            stop(f"exceeded {budget} nodes deciding {state.names[team]!r}")
+        if deadline is not None and nodes[0] % 1024 == 1 and time.monotonic() > deadline:
+            stop(f"ran out of time deciding {state.names[team]!r}")
 
         # Both exits below rely on this count never falling as the remaining games
         # are decided, which holds because `team`'s own record is frozen at an
@@ -212,7 +850,7 @@ def _search(state, team, want_in, budget):
         # (divisions) + (better non-winners), the first term fixed and the second
         # only growing; and a team losing its own division title can only push it
         # further down. Checked over 20,000 random divisional leagues.
-        above_now = strictly_above(team, wins, points, n, divisions)
+        above_now = tracker.above() if tracker is not None else above
         if want_in:
             # Hunting for a way IN: give up this branch once enough rivals are
             # already locked above the team.
@@ -222,83 +860,597 @@ def _search(state, team, want_in, budget):
             # Hunting for a way to MISS: success as soon as enough are above.
             if above_now >= spots:
                 return True
-            reachable = above_now + sum(
-                1
-                for u in range(n)
-                if u != team
-                and not beats(u, team, wins, points)
-                and could_still_pass(u)
-            )
-            # could_still_pass only knows about records, and a team can finish
-            # above this one by winning its division on a WORSE record -- exactly
-            # how an 8-6 team was seeded above a 9-5 team in 2024. At most one
-            # team per division is promoted that way, so allowing for one each
-            # keeps the bound an over-estimate, which is what makes it safe.
-            if divisions is not None:
-                reachable += state.num_divisions
+            # Every rival that could still finish above on record, whether or
+            # not it is above right now. Counting today's seed position instead
+            # misses a rival with a better record sitting BELOW the team only
+            # because the team currently leads its division -- it goes above the
+            # moment that lead is lost, and leaving it out once called a team
+            # clinched that brute force showed could miss.
             if reachable < spots:
                 return False
 
         if pos == len(open_games):
-            return makes_playoffs(team, wins, points, n, spots, divisions) == want_in
-
-        k = open_games[pos]
-        i, j = state.games[k]
-        for winner, loser in ((i, j), (j, i)):
-            wins[winner] += 1
-            losses[loser] += 1
-            upside[i] -= 1
-            upside[j] -= 1
+            return (above_now < spots) == want_in
+
+        if dead is None:
+            return None
+        key = position(pos)
+        if key in dead:
+            table.hits += 1
+            return False
+        table.misses += 1
+        return key
+
+    # Depth-first over the open games with an explicit stack rather than the
+    # call stack, so a season of any length fits: one frame per decided game,
+    # holding the game's next result to try and the position to record as dead
+    # once both have failed. `chosen` is the path down to the current node.
+    frames = []
+    pos = 0
+    spent = 0
+    start = nodes[0]
+
+    def stop(message):
+        path = [0 if frame[0] else 1 for frame in frames]
+        continuation = {
+            "question": _thawed(frontier),
+            "path": path,
+            # Not counting this node, which stopped before doing anything.
+            "nodes": spent + nodes[0] - start - 1,
+        }
+        if len(_FRONTIERS) < DEFAULT_FRONTIER_SIZE:
+            _FRONTIERS[frontier] = continuation
+        raise SearchBudgetExceeded(message, continuations=[continuation])
+
+    resumed = _FRONTIERS.pop(frontier, None)
+    if resumed is not None:
+        # Walk back down to where the last search stopped. Every node on the way
+        # branched then, so it would branch now; none of them is counted again.
+        spent = resumed["nodes"]
+        for bit in resumed["path"]:
+            k, first, second = ordered[pos]
+            winner, loser = (second, first) if bit else (first, second)
+            frames.append([0 if bit else 1, None])
+            decide(winner, loser)
             chosen.append((k, winner))
+            pos += 1
+
+    while True:
+        found = settle(pos)
+        if found is not True and found is not False:
+            k, first, second = ordered[pos]
+            frames.append([1, found])
+            decide(first, second)
+            chosen.append((k, first))
+            pos += 1
+            continue
+        if found:
+            # An early exit leaves games undecided, and any result of them keeps
+            # the answer (the count above only grows). Fill them in: callers
+            # replay a completion as a whole season, and the witness pool reads
+            # final records from it.
+            rest = [(k, state.games[k][0]) for k in open_games[pos:]]
+            return fixed + chosen + rest
+
+        # A dead end: back up to the deepest game with a result left to try.
+        while frames:
+            frame = frames[-1]
+            pos -= 1
+            k, first, second = ordered[pos]
+            _, winner = chosen.pop()
+            undo(winner, second if winner == first else first)
+            if frame[0]:
+                frame[0] = 0
+                decide(second, first)
+                chosen.append((k, second))
+                pos += 1
+                break
+            frames.pop()
+            if frame[1] is not None:
+                table.record(dead, frame[1])
+        else:
+            return None
 
-            found = recurse(pos + 1)
 
-            if not found:
-                chosen.pop()
-                upside[i] += 1
-                upside[j] += 1
-                wins[winner] -= 1
-                losses[loser] -= 1
-            if found:
+UNDECIDED = object()  # a prefilter's "no answer, search instead"
+
+
+def _assign_games(games, capacity):
+    """Hand each game to one of its two teams, within each team's capacity.
+
+    `games` is [(game_index, i, j)], `capacity` {team: wins it may still take}.
+    Places as many games as possible -- a bipartite max flow from games to teams,
+    grown one augmenting path at a time -- and returns {game_index: winner} for
+    the ones placed. Small by construction: one week of a league is a handful of
+    games, and a season's remainder a few dozen.
+    """
+    load = {team: 0 for team in capacity}
+    holder = {}
+    held = {team: [] for team in capacity}
+
+    def place(game, visited):
+        k, i, j = game
+        for team in (i, j):
+            if team in visited:
+                continue
+            visited.add(team)
+            if load[team] < capacity[team]:
+                load[team] += 1
+                holder[k] = team
+                held[team].append(game)
                 return True
+            # Full: try moving one of its games to that game's other team.
+            for other in list(held[team]):
+                if place(other, visited):
+                    held[team].remove(other)
+                    holder[k] = team
+                    held[team].append(game)
+                    return True
         return False
 
-    if recurse(0):
-        return fixed + list(chosen)
-    return None
+    for game in games:
+        place(game, set())
+    return holder
+
+
+def _flow_counterexample(state, team, want_in):
+    """Settle a question by counting wins rather than searching, when that works.
+
+    The classic baseball-elimination argument: with every record but the
+    remaining games fixed, whether the rivals can be kept below (or pushed above)
+    a line is a flow problem -- games are supply, the room each rival has under
+    or over the line is capacity -- and a flow problem is polynomial where the
+    search is exponential. Points are frozen, so the tiebreak is just a line one
+    win higher or lower per rival, and costs nothing.
+
+    With one seat that is exact. With more it no longer is, because which rivals
+    are allowed over the line becomes a choice, so only the two easy answers are
+    taken: a completion the flow actually builds, and an impossibility the flow
+    deficit proves whichever rivals are chosen. Anything else is UNDECIDED and
+    left to `_search`. Divisional seeding is not a line at all, so a divisional
+    league is always UNDECIDED.
+
+    Returns a completion as [(game_index, winner)], None if none exists, or
+    UNDECIDED.
+    """
+    if state.is_divisional:
+        return UNDECIDED
+
+    n = state.num_teams
+    spots = state.playoff_spots
+    points = state.score
+    wins = list(state.wins)
+    fixed = {}
+    open_games = []
+    for k, (i, j) in enumerate(state.games):
+        if team in (i, j):
+            other = j if i == team else i
+            fixed[k] = team if want_in else other
+            wins[fixed[k]] += 1
+        else:
+            open_games.append((k, i, j))
+    line = wins[team]
+    rivals = [u for u in range(n) if u != team]
+
+    if want_in:
+        # Room each rival has before it finishes above the team. Negative room
+        # means it already has: it is locked above, and can absorb any game.
+        room = {
+            u: (line if points[u] <= points[team] else line - 1) - wins[u]
+            for u in rivals
+        }
+        locked = {u for u in rivals if room[u] < 0}
+        if len(locked) >= spots:
+            return None
+        completion = dict(fixed)
+        contested = []
+        for game in open_games:
+            k, i, j = game
+            if i in locked or j in locked:
+                completion[k] = i if i in locked else j
+            else:
+                contested.append(game)
+        capacity = {u: room[u] for u in rivals if u not in locked}
+        placed = _assign_games(contested, capacity)
+        deficit = len(contested) - len(placed)
+        if deficit == 0:
+            completion.update(placed)
+            return _checked(state, team, want_in, completion, open_games)
+
+        # `allowed` more rivals may still pass. Each one that does can take at
+        # most its remaining games beyond its room, so if even the most
+        # accommodating `allowed` of them cannot soak up the deficit, no choice
+        # of rivals can: the team cannot get in.
+        allowed = spots - 1 - len(locked)
+        scheduled = {u: 0 for u in capacity}
+        for _, i, j in contested:
+            scheduled[i] += 1
+            scheduled[j] += 1
+        excess = sorted(
+            (max(0, scheduled[u] - capacity[u]) for u in capacity), reverse=True
+        )
+        if deficit > sum(excess[:allowed]):
+            return None
+        if allowed:
+            # Let the most accommodating rivals through and see if that is enough.
+            passing = sorted(
+                capacity, key=lambda u: (capacity[u] - scheduled[u], u)
+            )[:allowed]
+            for u in passing:
+                capacity[u] = scheduled[u]
+            placed = _assign_games(contested, capacity)
+            if len(placed) == len(contested):
+                completion.update(placed)
+                return _checked(state, team, want_in, completion, open_games)
+        return UNDECIDED
+
+    # Hunting for a way to miss: the team loses out, and `short` more rivals
+    # must finish above it. Wins each rival still needs to get there:
+    need = {
+        u: line - wins[u] + (0 if points[u] > points[team] else 1) for u in rivals
+    }
+    above = [u for u in rivals if need[u] <= 0]
+    if len(above) >= spots:
+        completion = dict(fixed)
+        completion.update({k: i for k, i, _ in open_games})
+        return _checked(state, team, want_in, completion, open_games)
+
+    scheduled = {u: 0 for u in rivals}
+    for _, i, j in open_games:
+        scheduled[i] += 1
+        scheduled[j] += 1
+    candidates = [u for u in rivals if 0 < need[u] <= scheduled[u]]
+    short = spots - len(above)
+    if len(candidates) < short:
+        return None  # not enough rivals can even individually get past
+
+    # Try the rivals with the least to do. A game against anyone outside that
+    # group goes to the group member; games inside it are the flow.
+    passing = set(sorted(candidates, key=lambda u: (need[u], -scheduled[u], u))[:short])
+    completion = dict(fixed)
+    still_needed = dict((u, need[u]) for u in passing)
+    internal = []
+    for game in open_games:
+        k, i, j = game
+        if i in passing and j in passing:
+            internal.append(game)
+        elif i in passing or j in passing:
+            winner = i if i in passing else j
+            completion[k] = winner
+            still_needed[winner] -= 1
+        else:
+            completion[k] = i
+    capacity = {u: max(0, still_needed[u]) for u in passing}
+    placed = _assign_games(internal, capacity)
+    if len(placed) < sum(capacity.values()):
+        return UNDECIDED
+    for k, i, j in internal:
+        completion[k] = placed.get(k, i)
+    return _checked(state, team, want_in, completion, open_games)
+
+
+def _checked(state, team, want_in, completion, open_games):
+    """`completion` as a list, if it really answers the question; else UNDECIDED.
+
+    The flow arguments say it must. Replaying it costs one pass over the games,
+    and turns a mistake in them into a slower answer rather than a wrong one.
+    """
+    wins = list(state.wins)
+    for k, winner in completion.items():
+        wins[winner] += 1
+    made = makes_playoffs(
+        team, wins, state.score, state.num_teams, state.playoff_spots, state.divisions
+    )
+    if made != want_in or len(completion) != len(state.games):
+        return UNDECIDED
+    return sorted(completion.items())
+
+
+def _counterexample(state, team, want_in, budget, pool=None, deadline=None):
+    """One completion where `team` does / does not get in, or None.
+
+    Asks `pool` first, then the flow prefilter, and searches only when neither
+    has an answer. Whatever is found goes back into the pool.
+    """
+    pooled = pool is not None and pool.covers(state)
+    if pooled:
+        found = pool.find(state, team, want_in)
+        if found is not None:
+            return found
+    found = _flow_counterexample(state, team, want_in)
+    if found is UNDECIDED:
+        found = _search(state, team, want_in, budget, deadline=deadline)
+    if pooled:
+        pool.add(found)
+    return found
+
+
+def _answer_all(state, budget, pool=None, deadline=None, teams=None):
+    """Every team's two questions, answered together in one walk.
+
+    Returns {(team, want_in): completion or None}, the same answers
+    `_counterexample` gives one question at a time. Questions `pool` already
+    answers are not walked for, and everything found is added to it. `teams`
+    limits the questions to those teams'; by default every team is asked.
+
+    Asked separately, the questions cover the same completions over and over, so
+    here the completions are walked once, carrying down the questions still open.
+    A question is dropped from a branch once bounds show it has no answer there
+    (see `possible`), and retired for good the moment any leaf answers it; the
+    walk ends when nothing is left open. The dominance argument still applies per
+    question: a team's game is branched both ways, but its "can it miss" question
+    only follows the branch where it loses, and "can it get in" the one where it
+    wins, so each question sees the tree `_search` would give it, less its early
+    exits.
+
+    A position -- games decided, and the records they produced -- is walked at
+    most once. Which questions reach a position depends only on the records
+    there, so whatever is open on a second visit was open on the first, and that
+    visit found no answer below.
+    """
+    n = state.num_teams
+    spots = state.playoff_spots
+    points = state.score
+    divisions = state.divisions
+    divisional = state.is_divisional
+    allowance = state.num_divisions if divisional else 0
+    games = state.games
+    wins = list(state.wins)
+    upside = [0] * n
+    for i, j in games:
+        upside[i] += 1
+        upside[j] += 1
+
+    pooled = pool is not None and pool.covers(state)
+    answers = {}
+    unresolved = set()
+    for team in range(n) if teams is None else teams:
+        for want_in in (False, True):
+            found = pool.find(state, team, want_in) if pooled else None
+            if found is None:
+                found = _flow_counterexample(state, team, want_in)
+            if found is UNDECIDED:
+                unresolved.add((team, want_in))
+            else:
+                answers[(team, want_in)] = found
+                if pooled:
+                    pool.add(found)
+    if not unresolved:
+        return answers
+
+    # The per-question budget the callers have always had, pooled.
+    limit = budget * len(unresolved)
+    nodes = [0]
+    chosen = []
+    walked = set()
+
+    def possible(team, want_in):
+        """Could a completion below here still answer this question?
+
+        Both bounds hold with the team's own games still open. To get in, the
+        team is capped at winning out, and a rival already past that cap stays
+        past it -- though with divisions only if it shares the team's division,
+        since the team could otherwise still be seeded above it on a division
+        title. To miss, the team has at least today's wins, so only a rival that
+        could still pass that counts, plus one division winner per division as in
+        `_search` -- and with divisions, a rival with a lower index that could
+        finish level on wins and points, since seed_order puts it above.
+        """
+        if want_in:
+            top = wins[team] + upside[team]
+            locked = 0
+            blocked = not divisional
+            for u in range(n):
+                if u != team and (
+                    wins[u] > top or (wins[u] == top and points[u] > points[team])
+                ):
+                    locked += 1
+                    if divisional and divisions[u] == divisions[team]:
+                        blocked = True
+            return not (blocked and locked >= spots)
+        low = wins[team]
+        reach = allowance
+        for u in range(n):
+            if u == team:
+                continue
+            best = wins[u] + upside[u]
+            if best > low or (
+                best == low
+                and (
+                    points[u] > points[team]
+                    or (divisional and points[u] == points[team] and u < team)
+                )
+            ):
+                reach += 1
+        return reach >= spots
+
+    def enter(pos, carried):
+        """The questions to branch on here, or None once nothing below can help.
+
+        A leaf answers what it can on the spot, and so always returns None.
+        """
+        nodes[0] += 1
+        if nodes[0] > limit:
+            raise SearchBudgetExceeded(
+                f"exceeded {limit} nodes deciding {len(unresolved)} open questions"
+            )
+        if deadline is not None and nodes[0] % 1024 == 1 and time.monotonic() > deadline:
+            raise SearchBudgetExceeded(
+                f"ran out of time deciding {len(unresolved)} open questions"
+            )
+        live = [q for q in carried if q in unresolved and possible(*q)]
+        if not live:
+            return None
+        key = (pos, tuple(wins))
+        if key in walked:
+            return None
+        if len(walked) < DEFAULT_TABLE_SIZE:
+            walked.add(key)
+
+        if pos == len(games):
+            # One seed order serves every question at this leaf.
+            above = places_above(wins, points, divisions)
+            for team, want_in in live:
+                made = above[team] < spots
+                if made == want_in:
+                    unresolved.discard((team, want_in))
+                    answers[(team, want_in)] = list(enumerate(chosen))
+            if pooled:
+                pool.add(list(enumerate(chosen)))
+            return None
+        return live
+
+    def results(pos, live):
+        """Game `pos`'s two results, the one that helps the first open question first."""
+        i, j = games[pos]
+        team, want_in = live[0]
+        first = i
+        if team in (i, j):
+            first = team if want_in else (j if team == i else i)
+        return [first, j if first == i else i]
+
+    # Depth-first with an explicit stack, as in `_search`: one frame per game
+    # being branched on, holding the questions open there and the results still
+    # to try. `chosen` holds the result in play at each frame, once one is.
+    frames = []
+    live = enter(0, sorted(unresolved))
+    if live is not None:
+        frames.append((live, results(0, live)))
+    while frames and unresolved:
+        live, left = frames[-1]
+        pos = len(frames) - 1
+        i, j = games[pos]
+        if len(chosen) > pos:
+            winner = chosen.pop()
+            wins[winner] -= 1
+            upside[i] += 1
+            upside[j] += 1
+        if not left:
+            frames.pop()
+            continue
+        winner = left.pop(0)
+        wins[winner] += 1
+        upside[i] -= 1
+        upside[j] -= 1
+        chosen.append(winner)
+        # Dominance, as in `_search`: a team's own win never helps it miss,
+        # nor a loss help it in, so each question follows only its own team's
+        # worst (or best) result and the other branch skips it.
+        loser = j if winner == i else i
+        below = enter(
+            pos + 1,
+            [q for q in live if q != (winner, False) and q != (loser, True)],
+        )
+        if below is not None:
+            frames.append((below, results(pos + 1, below)))
+    for question in unresolved:
+        answers[question] = None
+    return answers
 
 
-def status_of(state, team, budget=DEFAULT_NODE_BUDGET):
+def status_of(state, team, budget=DEFAULT_NODE_BUDGET, pool=None, deadline=None):
     """Return 'clinched', 'eliminated', or 'alive' for one team.
 
     'clinched' means the team is in a playoff seat in every completion of the
-    remaining schedule; 'eliminated' means in none.
+    remaining schedule; 'eliminated' means in none. `pool` is an optional
+    WitnessPool to consult and extend.
+
+    If either question runs out of budget or time, the other is still asked, since
+    it may settle the verdict alone; SearchBudgetExceeded is raised only when it
+    does not, carrying what was proven in `ruled_out`.
     """
     if not state.games:
         made = makes_playoffs(
             team,
             state.wins,
-            state.points,
+            state.score,
             state.num_teams,
             state.playoff_spots,
             state.divisions,
         )
         return "clinched" if made else "eliminated"
 
-    if _search(state, team, want_in=False, budget=budget) is None:
+    try:
+        miss = _counterexample(state, team, False, budget, pool, deadline)
+    except SearchBudgetExceeded as exceeded:
+        try:
+            make = _counterexample(state, team, True, budget, pool, deadline)
+        except SearchBudgetExceeded as also:
+            raise SearchBudgetExceeded(
+                str(exceeded), exceeded.continuations + also.continuations
+            ) from None
+        if make is None:
+            return "eliminated"
+        raise SearchBudgetExceeded(
+            str(exceeded), exceeded.continuations, ruled_out=["eliminated"]
+        ) from None
+    if miss is None:
         return "clinched"  # no completion where the team misses
-    if _search(state, team, want_in=True, budget=budget) is None:
+    try:
+        make = _counterexample(state, team, True, budget, pool, deadline)
+    except SearchBudgetExceeded as exceeded:
+        raise SearchBudgetExceeded(
+            str(exceeded), exceeded.continuations, ruled_out=["clinched"]
+        ) from None
+    if make is None:
         return "eliminated"  # no completion where the team makes it
     return "alive"
 
 
-def classify(state, budget=DEFAULT_NODE_BUDGET):
-    """Status for every team, keyed by team name."""
-    return {
-        state.names[t]: status_of(state, t, budget=budget)
-        for t in range(state.num_teams)
+def classify(
+    state,
+    budget=DEFAULT_NODE_BUDGET,
+    pool=None,
+    workers=None,
+    deadline=None,
+    known=None,
+    teams=None,
+):
+    """Status for every team, keyed by team name.
+
+    The same verdicts as `status_of` per team, but every team's questions share
+    one walk of the completions; see `_answer_all`. `workers` above 1 instead
+    asks `status_of` for each team in its own process. `teams`, a list of team
+    indices, limits the answer to those teams.
+
+    `known` maps team names to verdicts already proven of this league, or of one
+    it was reached from by deciding games; those teams are not asked again. Only
+    'clinched' and 'eliminated' carry over that way: deciding games can close a
+    team's last path in or out, never open one.
+    """
+    known = {
+        name: verdict
+        for name, verdict in (known or {}).items()
+        if verdict in ("clinched", "eliminated")
     }
+    teams = range(state.num_teams) if teams is None else teams
+    asked = [t for t in teams if state.names[t] not in known]
+    _REUSE["inherited"] += len(teams) - len(asked)
+    if workers and workers > 1:
+        statuses = _in_parallel(
+            state,
+            _status_in_worker,
+            [(team, budget, deadline) for team in asked],
+            workers,
+        )
+        return {**known, **dict(zip((state.names[t] for t in asked), statuses))}
+    answers = _answer_all(state, budget, pool, deadline, teams=asked)
+    statuses = {}
+    for t in teams:
+        if state.names[t] in known:
+            statuses[state.names[t]] = known[state.names[t]]
+        elif answers[(t, False)] is None:
+            statuses[state.names[t]] = "clinched"
+        elif answers[(t, True)] is None:
+            statuses[state.names[t]] = "eliminated"
+        else:
+            statuses[state.names[t]] = "alive"
+    return statuses
+
 
+# What can be asked of a team, as named in `team_verdicts` and in the fields
+# `apply_verdicts` writes.
+QUESTIONS = ("verdict", "bye", "top_seed", "division_winner")
 
 STATUS_TOP_SEED = "Clinched the #1 overall seed"
 STATUS_BYE = "Clinched a first-round bye"
@@ -351,10 +1503,54 @@ def with_seats(state, seats):
     hunt, the dominance argument, the bounds pruning and the tiebreak probes all
     carry over untouched.
     """
-    return LeagueState(
-        state.names, state.wins, state.losses, state.points, state.games, seats,
-        state.divisions,
-    )
+    return state._derive(playoff_spots=seats)
+
+
+def relevant_games(state, team, games=None):
+    """Which of `games` (indices into state.games; all by default) can change
+    `team`'s verdict, in order.
+
+    A game matters to a team only through the two records it moves. A rival whose
+    wins range -- today's, up to today's plus every game it has left -- lies
+    wholly above or wholly below the team's own range finishes on the same side
+    of the team in every completion, however its games go; wins alone decide
+    that, so no points tiebreak, frozen or probed, can reach it either. With
+    divisions it must also lie wholly above or below each of its division's
+    rivals, or its result could still hand the title, and the seeding that comes
+    with it, to someone else. A game between two such rivals cannot move the team
+    in any completion, so its verdict -- and whether that verdict rests on the
+    tiebreak -- reads the same whichever way it goes.
+
+    This is a bound, not an answer: a game it keeps may still turn out not to
+    matter. The team's own games are always kept.
+    """
+    n = state.num_teams
+    low = state.wins
+    high = list(state.wins)
+    for i, j in state.games:
+        high[i] += 1
+        high[j] += 1
+
+    def apart(u, v):
+        return low[u] > high[v] or high[u] < low[v]
+
+    def inert(u):
+        if not apart(u, team):
+            return False
+        if state.is_divisional:
+            return all(
+                apart(u, m)
+                for m in range(n)
+                if m != u and state.divisions[m] == state.divisions[u]
+            )
+        return True
+
+    relevant = []
+    for k in range(len(state.games)) if games is None else games:
+        i, j = state.games[k]
+        if team in (i, j) or not (inert(i) and inert(j)):
+            relevant.append(k)
+    return relevant
 
 
 def points_margins(state, team, contested=None):
@@ -395,7 +1591,15 @@ def points_margins(state, team, contested=None):
     return margins
 
 
-def seed_verdict(state, team, seats, swing_envelope=None, budget=DEFAULT_NODE_BUDGET):
+def seed_verdict(
+    state,
+    team,
+    seats,
+    swing_envelope=None,
+    budget=DEFAULT_NODE_BUDGET,
+    pool=None,
+    deadline=None,
+):
     """Has `team` locked up a finish inside the top `seats`?
 
     The same question as clinching a playoff place, asked of a smaller number of
@@ -407,17 +1611,27 @@ def seed_verdict(state, team, seats, swing_envelope=None, budget=DEFAULT_NODE_BU
     Returns 'clinched', 'eliminated' or 'alive'.
     """
     narrowed = with_seats(state, seats)
-    verdict = status_of(narrowed, team, budget=budget)
+    verdict = status_of(narrowed, team, budget=budget, pool=pool, deadline=deadline)
     if verdict == "clinched" and swing_envelope is not None:
-        dependency = clinch_dependency(narrowed, team, budget=budget)
+        dependency = clinch_dependency(
+            narrowed, team, budget=budget, pool=pool, deadline=deadline
+        )
         if dependency and dependency[1] <= swing_envelope:
             return "alive"
     return verdict
 
 
-def bye_verdict(state, team, bye_spots, swing_envelope=None, budget=DEFAULT_NODE_BUDGET):
+def bye_verdict(
+    state,
+    team,
+    bye_spots,
+    swing_envelope=None,
+    budget=DEFAULT_NODE_BUDGET,
+    pool=None,
+    deadline=None,
+):
     """Has `team` locked up one of the `bye_spots` first-round byes?"""
-    return seed_verdict(state, team, bye_spots, swing_envelope, budget)
+    return seed_verdict(state, team, bye_spots, swing_envelope, budget, pool, deadline)
 
 
 UNREACHABLE = -1_000_000  # a phantom's record: it can never contend for a seat
@@ -462,7 +1676,9 @@ def _division_substate(state, team):
     )
 
 
-def division_verdict(state, team, swing_envelope=None, budget=DEFAULT_NODE_BUDGET):
+def division_verdict(
+    state, team, swing_envelope=None, budget=DEFAULT_NODE_BUDGET, deadline=None
+):
     """'clinched'/'alive'/'eliminated' for finishing top of your own division.
 
     Reduced to a top-1 finish in the division sub-league (see _division_substate),
@@ -473,14 +1689,395 @@ def division_verdict(state, team, swing_envelope=None, budget=DEFAULT_NODE_BUDGE
     if not state.is_divisional:
         return None
     sub, sub_team = _division_substate(state, team)
-    verdict = status_of(sub, sub_team, budget=budget)
+    verdict = status_of(sub, sub_team, budget=budget, deadline=deadline)
     if verdict == "clinched" and swing_envelope is not None:
-        dependency = clinch_dependency(sub, sub_team, budget=budget)
+        dependency = clinch_dependency(sub, sub_team, budget=budget, deadline=deadline)
         if dependency and dependency[1] <= swing_envelope:
             return "alive"
     return verdict
 
 
+def _settle(
+    state,
+    index,
+    verdict,
+    pool,
+    swing_envelope,
+    budget,
+    bye_spots,
+    with_division_winner,
+    anytime=False,
+    deadline=None,
+    questions=None,
+    kept=None,
+):
+    """Everything `apply_verdicts` records about one team, given its verdict.
+
+    A verdict of None is asked here. Returned as a dict in the order the fields
+    have always been written, so the payload reads the same whichever path
+    produced it. `kept`, a list, gets the team's `_witnesses_of` appended once
+    its verdict is proven.
+
+    `questions` narrows that to the named fields of QUESTIONS, for `team_verdicts`;
+    the readable `status` summarises them all, so it is only written when
+    everything is asked.
+
+    `anytime` turns a question that runs out of budget or time into 'alive' -- the
+    one verdict that claims nothing -- and lists it under `undetermined` with what
+    was proven and where its search stopped. The key is only written when that
+    happens, so a payload that settled everything is unchanged.
+    """
+    fields = {}
+    unsettled = []
+    asked = set(QUESTIONS if questions is None else questions)
+
+    def attempt(question, ask, fallback="alive"):
+        if not anytime:
+            return ask()
+        try:
+            return ask()
+        except SearchBudgetExceeded as exceeded:
+            unsettled.append(
+                {
+                    "question": question,
+                    "ruled_out": exceeded.ruled_out,
+                    "continuations": exceeded.continuations,
+                }
+            )
+            return fallback
+
+    if "verdict" in asked:
+        fields["tiebreak"] = None
+        proven = verdict
+        if verdict is None:
+            verdict = attempt(
+                "verdict",
+                lambda: status_of(
+                    state, index, budget=budget, pool=pool, deadline=deadline
+                ),
+            )
+            proven = None if unsettled else verdict
+        verdict = _settled_verdict(
+            state, index, verdict, pool, swing_envelope, budget, deadline, fields, attempt
+        )
+        fields["verdict"] = verdict
+        if kept is not None and proven is not None:
+            kept.extend(_witnesses_of(state, index, proven, budget, deadline))
+
+    # Asked of every team, not just the ones already through. Skipping the
+    # rest and calling them 'alive' was a shortcut that produced wrong data:
+    # a team eliminated from the playoffs is certainly out of bye contention,
+    # and one still alive for a place can already be out of bye contention.
+    if "bye" in asked:
+        fields["bye"] = (
+            attempt(
+                "bye",
+                lambda: seed_verdict(
+                    state,
+                    index,
+                    bye_spots,
+                    swing_envelope=swing_envelope,
+                    budget=budget,
+                    pool=pool,
+                    deadline=deadline,
+                ),
+            )
+            if bye_spots
+            else None
+        )
+    # The #1 overall seed is asked of every league, byes or not: finishing top
+    # of the table is worth saying whatever the bracket looks like.
+    if "top_seed" in asked:
+        fields["top_seed"] = attempt(
+            "top_seed",
+            lambda: seed_verdict(
+                state,
+                index,
+                1,
+                swing_envelope=swing_envelope,
+                budget=budget,
+                pool=pool,
+                deadline=deadline,
+            ),
+        )
+
+    # Whether the team has won / can still win its own division -- for the
+    # division-title race. Only the standings shown to the reader need it, so
+    # it is off by default and never paid for per permutation. None without
+    # divisions, or when the caller does not ask.
+    if "division_winner" in asked:
+        fields["division_winner"] = (
+            attempt(
+                "division_winner",
+                lambda: division_verdict(
+                    state,
+                    index,
+                    swing_envelope=swing_envelope,
+                    budget=budget,
+                    deadline=deadline,
+                ),
+            )
+            if with_division_winner
+            else None
+        )
+
+    # Derived from the verdict, every time, so the readable form cannot
+    # disagree with the decision. A second writer of this field once left a
+    # downgraded team saying "Clinched Playoff Spot", and two places believed
+    # the text over the verdict.
+    if questions is None:
+        fields["status"] = (
+            STATUS_TOP_SEED
+            if fields["top_seed"] == "clinched"
+            else STATUS_BYE
+            if fields["bye"] == "clinched"
+            else {
+                "clinched": STATUS_CLINCHED,
+                "eliminated": STATUS_ELIMINATED,
+                "alive": STATUS_ALIVE,
+            }[verdict]
+        )
+    if unsettled:
+        fields["undetermined"] = unsettled
+    return fields
+
+
+def _settled_verdict(
+    state, index, verdict, pool, swing_envelope, budget, deadline, fields, attempt
+):
+    """The playoff verdict `_settle` reports, writing `tiebreak` into `fields`.
+
+    `verdict` is the one proven; one resting on a tiebreak gap the scoring could
+    plausibly close comes back downgraded to 'alive'.
+    """
+    dependency = None
+    if verdict in ("clinched", "eliminated"):
+        depends = clinch_dependency if verdict == "clinched" else elimination_dependency
+        dependency = attempt(
+            "tiebreak",
+            lambda: depends(state, index, budget=budget, pool=pool, deadline=deadline),
+            fallback=UNDECIDED,
+        )
+        if dependency is UNDECIDED:
+            # Whether it rests on the tiebreak is unknown, so it may.
+            dependency = None
+            if swing_envelope is not None:
+                verdict = "alive"
+
+    if dependency:
+        rival, gap = dependency
+        fields["tiebreak"] = {"rival": rival, "gap": gap}
+        if swing_envelope is not None and gap <= swing_envelope:
+            # Decided only if the scoring holds, and it plausibly might not.
+            verdict = "alive"
+
+    return verdict
+
+
+def _witnesses_of(state, team, verdict, budget, deadline=None):
+    """One completion per result `verdict` leaves `team`: getting in, then missing.
+
+    These are what a run hands down to the next as its witnesses. The pool a run
+    settles with holds whatever seasons its searches happened to meet first,
+    which differs with the number of processes and the order they finish in.
+    These are asked afresh, without it, so each is the first answer of a fixed
+    search and the same in every run. Neither search repeats a proof: a result
+    the verdict rules out is not asked, and the other always has an answer, most
+    often one the flow prefilter finds without searching.
+    """
+    found = []
+    for want_in in (True, False):
+        if verdict == ("eliminated" if want_in else "clinched"):
+            continue
+        try:
+            completion = _counterexample(state, team, want_in, budget, deadline=deadline)
+        except SearchBudgetExceeded:
+            continue
+        if completion is not None:
+            found.append(completion)
+    return found
+
+
+# The league a worker process was started with, and the completions it has found
+# in it. Set once per process by _adopt, so a task ships only a team index.
+_WORKER = {}
+
+
+def _adopt(state, frontiers, witnesses=()):
+    _WORKER["state"] = state
+    _WORKER["pool"] = WitnessPool(state)
+    for outcome in witnesses:
+        _WORKER["pool"].add_outcome(outcome)
+    _FRONTIERS.update(frontiers)
+
+
+def _in_parallel(state, task, items, workers, witnesses=()):
+    """`task` over `items` in a pool of processes that each hold `state`.
+
+    Each also gets the frontiers this process holds, so a resumed search carries
+    on wherever its question lands, and starts its witness pool from `witnesses`.
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_adopt,
+        initargs=(state, dict(_FRONTIERS), list(witnesses)),
+    ) as executor:
+        return list(executor.map(task, items))
+
+
+def _status_in_worker(item):
+    team, budget, deadline = item
+    return status_of(
+        _WORKER["state"], team, budget=budget, pool=_WORKER["pool"], deadline=deadline
+    )
+
+
+def _settle_in_worker(item):
+    index, verdict, options, keep = item
+    pool = _WORKER["pool"]
+    hits, misses = pool.hits, pool.misses
+    kept = [] if keep else None
+    fields = _settle(_WORKER["state"], index, verdict, pool, *options, kept=kept)
+    # The pool lives on across this process's tasks, so only this task's lookups.
+    counts = {"hits": pool.hits - hits, "misses": pool.misses - misses}
+    return fields, kept, counts
+
+
+def _settle_teams(
+    state, teams, options, workers=None, witnesses=None, known=None, kept=None
+):
+    """`_settle` for each of `teams` (indices), in that order; see apply_verdicts."""
+    _, budget, _, _, anytime, deadline, questions = options
+    inherited = list(witnesses or ())
+    known = {
+        name: verdict
+        for name, verdict in (known or {}).items()
+        if verdict in ("clinched", "eliminated")
+    }
+    if workers and workers > 1:
+        # One task per team, each asking everything about that team. The answers
+        # are exact, so which process finds them -- and in what order -- cannot
+        # change them; they are put back in standings order regardless.
+        _REUSE["inherited"] += sum(state.names[index] in known for index in teams)
+        answered = _in_parallel(
+            state,
+            _settle_in_worker,
+            [
+                (index, known.get(state.names[index]), options, kept is not None)
+                for index in teams
+            ],
+            workers,
+            inherited,
+        )
+        results = [fields for fields, _, _ in answered]
+        found = [completions for _, completions, _ in answered]
+        for _, _, counts in answered:
+            add_reuse_stats(counts)
+    else:
+        # Every completion found below is kept and tried on later questions
+        # first: most 'alive' answers are a season some earlier answer built.
+        pool = WitnessPool(state)
+        for outcome in inherited:
+            pool.add_outcome(outcome)
+        verdicts = {}
+        if questions is None or "verdict" in questions:
+            try:
+                verdicts = classify(
+                    state,
+                    budget=budget,
+                    pool=pool,
+                    deadline=deadline,
+                    known=known,
+                    teams=list(teams),
+                )
+            except SearchBudgetExceeded:
+                if not anytime:
+                    raise
+                # The shared walk gives up on every team at once. One team at a
+                # time, each gets as far as it can, and leaves a frontier to
+                # resume from.
+                verdicts = dict(known)
+        results = []
+        found = []
+        for index in teams:
+            completions = [] if kept is not None else None
+            results.append(
+                _settle(
+                    state,
+                    index,
+                    verdicts.get(state.names[index]),
+                    pool,
+                    *options,
+                    kept=completions,
+                )
+            )
+            found.append(completions)
+        _REUSE["hits"] += pool.hits
+        _REUSE["misses"] += pool.misses
+    if kept is not None:
+        # In standings order, whichever process settled each team, so the list
+        # comes out the same however the run was split.
+        handed_down = WitnessPool(state)
+        for completions in found:
+            for completion in completions:
+                handed_down.add(completion)
+        kept[:] = handed_down.outcomes()
+    return results
+
+
+def team_verdicts(
+    standings,
+    remaining_matchups,
+    playoff_spots,
+    teams=None,
+    questions=("verdict",),
+    swing_envelope=None,
+    budget=DEFAULT_NODE_BUDGET,
+    bye_spots=0,
+    divisions=None,
+    workers=None,
+    anytime=False,
+    deadline=None,
+    witnesses=None,
+):
+    """Only the answers asked for, for only the teams asked about.
+
+    Returns {team_name: fields} for the names in `teams` (every team by default),
+    each holding just the QUESTIONS named in `questions` -- 'verdict' brings its
+    `tiebreak` with it -- with the same values `apply_verdicts` would write.
+    Nothing is written to `standings`, and no margins are worked out.
+
+    `apply_verdicts` answers everything about everyone, which the report needs
+    once. Stage 4 asks again for every outcome of next week, and reads only the
+    playoff verdict of the teams still alive; asking it the rest -- byes, the top
+    seed, and the tiebreak probes behind each, for teams already settled -- was
+    most of what a permutation cost. The other arguments are as for
+    `apply_verdicts`.
+    """
+    state = state_from_standings(
+        standings, remaining_matchups, playoff_spots, divisions
+    )
+    unknown = set(questions) - set(QUESTIONS)
+    if unknown:
+        raise ValueError(f"no such question: {', '.join(sorted(unknown))}")
+    indices = [
+        index
+        for index, team in enumerate(standings)
+        if teams is None or team["team_name"] in teams
+    ]
+    options = (
+        swing_envelope,
+        budget,
+        bye_spots,
+        "division_winner" in questions,
+        anytime,
+        deadline,
+        tuple(questions),
+    )
+    results = _settle_teams(state, indices, options, workers, witnesses)
+    return {state.names[index]: fields for index, fields in zip(indices, results)}
+
+
 def apply_verdicts(
     standings,
     remaining_matchups,
@@ -490,6 +2087,12 @@ def apply_verdicts(
     bye_spots=0,
     divisions=None,
     with_division_winner=False,
+    workers=None,
+    anytime=False,
+    deadline=None,
+    witnesses=None,
+    known=None,
+    kept=None,
 ):
     """Set each team's status from the exact full-season verdict, in place.
 
@@ -524,75 +2127,54 @@ def apply_verdicts(
     three-way playoff answer, because a team with a bye has also clinched a
     playoff spot, and widening `verdict` would make every existing
     `== "clinched"` test silently miss them.
+
+    `workers` above 1 spreads the teams over that many processes. Every team's
+    questions are independent of every other's, and every answer is exact, so
+    the result is identical to the serial one; only the wall-clock time differs.
+
+    `deadline`, a `time.monotonic()` value, bounds the run the way `budget`
+    bounds each search. Either one running out raises SearchBudgetExceeded,
+    unless `anytime` is set: then every question that ran out reads 'alive' and
+    is listed in the team's `undetermined`, and the run completes. Passing those
+    entries' continuations to `resume_from` makes the next run carry each search
+    on from where it stopped.
+
+    `witnesses` and `known` carry over what an earlier run learned. `witnesses` is
+    a list of completions of these remaining games, as `WitnessPool.outcomes`
+    writes them; they are tried before any search. `known` maps team names to
+    verdicts proven of a league this one was reached from by deciding games, and
+    those teams' questions are not asked again; see `classify`. Neither can change
+    a result, only how much searching it takes. `kept`, a list, is filled in the
+    same form with completions for the next run: a getting-in and a missing season
+    for each team its verdict allows, in standings order (see `_witnesses_of`),
+    the same whether or not the run used `workers`.
+
+    Everything is asked of everyone here; `team_verdicts` asks only some questions
+    of some teams, for callers that read no more than that.
     """
     state = state_from_standings(
         standings, remaining_matchups, playoff_spots, divisions
     )
-    verdicts = classify(state, budget=budget)
+    options = (
+        swing_envelope,
+        budget,
+        bye_spots,
+        with_division_winner,
+        anytime,
+        deadline,
+        None,
+    )
+    results = _settle_teams(
+        state, range(len(standings)), options, workers, witnesses, known, kept
+    )
 
     settled = {}
-    for index, team in enumerate(standings):
-        verdict = verdicts[team["team_name"]]
-        team["tiebreak"] = None
-
-        dependency = None
-        if verdict == "clinched":
-            dependency = clinch_dependency(state, index, budget=budget)
-        elif verdict == "eliminated":
-            dependency = elimination_dependency(state, index, budget=budget)
-
-        if dependency:
-            rival, gap = dependency
-            team["tiebreak"] = {"rival": rival, "gap": gap}
-            if swing_envelope is not None and gap <= swing_envelope:
-                # Decided only if the scoring holds, and it plausibly might not.
-                verdict = "alive"
-
-        settled[index] = verdict
-        team["verdict"] = verdict
-
-        # Asked of every team, not just the ones already through. Skipping the
-        # rest and calling them 'alive' was a shortcut that produced wrong data:
-        # a team eliminated from the playoffs is certainly out of bye contention,
-        # and one still alive for a place can already be out of bye contention.
-        team["bye"] = (
-            seed_verdict(
-                state, index, bye_spots, swing_envelope=swing_envelope, budget=budget
-            )
-            if bye_spots
-            else None
-        )
-        # The #1 overall seed is asked of every league, byes or not: finishing top
-        # of the table is worth saying whatever the bracket looks like.
-        team["top_seed"] = seed_verdict(
-            state, index, 1, swing_envelope=swing_envelope, budget=budget
-        )
-
-        # Whether the team has won / can still win its own division -- for the
-        # division-title race. Only the standings shown to the reader need it, so
-        # it is off by default and never paid for per permutation. None without
-        # divisions, or when the caller does not ask.
-        team["division_winner"] = (
-            division_verdict(state, index, swing_envelope=swing_envelope, budget=budget)
-            if with_division_winner
-            else None
-        )
-
-        # Derived from the verdict, every time, so the readable form cannot
-        # disagree with the decision. A second writer of this field once left a
-        # downgraded team saying "Clinched Playoff Spot", and two places believed
-        # the text over the verdict.
-        team["status"] = (
-            STATUS_TOP_SEED
-            if team["top_seed"] == "clinched"
-            else STATUS_BYE
-            if team["bye"] == "clinched"
-            else {
-                "clinched": STATUS_CLINCHED,
-                "eliminated": STATUS_ELIMINATED,
-                "alive": STATUS_ALIVE,
-            }[verdict]
-        )
+    for index, (team, fields) in enumerate(zip(standings, results)):
+        # Left from an earlier run of the same standings, and not true of this one
+        # unless written again.
+        team.pop("undetermined", None)
+        team.update(fields)
+        settled[index] = fields["verdict"]
 
     # Margins need the FINAL verdicts, including any downgrades, so they are
     # filled in only once every team is settled.
@@ -612,13 +2194,16 @@ POINTS_EPSILON = 0.01  # fantasy scores carry at most two decimals
 def _with_points_override(state, team, value):
     points = list(state.points)
     points[team] = value
-    return LeagueState(
-        state.names, state.wins, state.losses, points, state.games,
-        state.playoff_spots, state.divisions,
-    )
+    return _with_points(state, points)
 
 
-def clinch_dependency(state, team, budget=DEFAULT_NODE_BUDGET):
+def _with_points(state, points):
+    """`state` with its points replaced, sharing everything else."""
+    points = tuple(points)
+    return state._derive(points=points, score=_hundredths(points))
+
+
+def clinch_dependency(state, team, budget=DEFAULT_NODE_BUDGET, pool=None, deadline=None):
     """Which rival overtaking on total points would cost `team` its clinch.
 
     Verdicts freeze total points at today's values, so a clinch that rests on
@@ -648,21 +2233,15 @@ def clinch_dependency(state, team, budget=DEFAULT_NODE_BUDGET):
         for other_gap, u in behind:
             if other_gap <= gap:
                 points[u] = state.points[team] + POINTS_EPSILON
-        probe = LeagueState(
-            state.names,
-            state.wins,
-            state.losses,
-            points,
-            state.games,
-            state.playoff_spots,
-            state.divisions,
-        )
-        if status_of(probe, team, budget=budget) != "clinched":
+        probe = _with_points(state, points)
+        if status_of(probe, team, budget=budget, pool=pool, deadline=deadline) != "clinched":
             return state.names[binding], round(gap, 2)
     return None
 
 
-def elimination_dependency(state, team, budget=DEFAULT_NODE_BUDGET):
+def elimination_dependency(
+    state, team, budget=DEFAULT_NODE_BUDGET, pool=None, deadline=None
+):
     """Which rival `team` would have to overtake on points to still have a shot.
 
     The mirror of clinch_dependency: an elimination that rests on the
@@ -678,8 +2257,6 @@ def elimination_dependency(state, team, budget=DEFAULT_NODE_BUDGET):
     for u in rivals:
         gap = state.points[u] - state.points[team]
         probe = _with_points_override(state, team, state.points[u] + POINTS_EPSILON)
-        if status_of(probe, team, budget=budget) != "eliminated":
+        if status_of(probe, team, budget=budget, pool=pool, deadline=deadline) != "eliminated":
             return state.names[u], round(gap, 2)
     return None
-
-
@@ -3,6 +3,7 @@ import json
 import sys
 
 import margins
+import wire
 
 GREEN = "\033[92m"
 RED = "\033[91m"
@@ -52,8 +53,15 @@ def display_status(team):
 
 
 def status_label(team):
-    """How that level reads."""
-    return STATUS_LABEL[display_status(team)]
+    """How that level reads.
+
+    Marked when a search ran out before settling something about the team: the
+    level shown is then only what was proven, and more may be true.
+    """
+    label = STATUS_LABEL[display_status(team)]
+    if team.get("undetermined"):
+        label += " (unproven)"
+    return label
 
 
 def rule(title=""):
@@ -235,6 +243,32 @@ def print_matchups(matchups, league):
         print(f"  {matchup['team1']:<{width}}  vs  {matchup['team2']}")
 
 
+def print_team(answer):
+    """One team's sections on their own, as a live update re-prints them.
+
+    `answer` is a what-if answer (see server.ScenarioSession.conditions): the
+    team's verdict, and its "clinch" and "elim" alternatives while it is alive.
+    """
+    name = answer["team"]
+    if answer["verdict"] == "clinched":
+        print(f"====== {GREEN}{name}{RESET} Clinched Playoff Spot ======")
+        return
+    if answer["verdict"] == "eliminated":
+        print(f"====== {RED}{name}{RESET} Eliminated from playoffs ======")
+        return
+    printed = False
+    for key, colour, heading in (
+        ("clinch", GREEN, "Clinches a playoff spot with:"),
+        ("elim", RED, "Eliminated from playoffs with:"),
+    ):
+        if answer.get(key):
+            print(f"====== {colour}{name}{RESET} {heading} ======")
+            emit(describe(answer[key]))
+            printed = True
+    if not printed:
+        print(f"====== {name} Nothing left this week settles it ======")
+
+
 def parse_args(argv):
     parser = argparse.ArgumentParser(
         prog="pretty_print.py",
@@ -254,8 +288,11 @@ def parse_args(argv):
 
 def main(argv=None):
     args = parse_args(sys.argv[1:] if argv is None else argv)
+    report(wire.resolve(json.load(sys.stdin)), args)
+
 
-    data = json.load(sys.stdin)
+def report(data, args):
+    """Print the stage-4 payload `data` as English, with the sections `args` keep."""
     base = data["base_league_data"]
     standings = base["standings"]
     scenarios = data["scenarios"]
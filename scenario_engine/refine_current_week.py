@@ -1,8 +1,13 @@
+import argparse
 import json
 import sys
+import time
 
+import config
 import margins
 import playoff_math
+import verdict_cache
+import wire
 
 
 def build_remaining_matchups(teams, remaining_weeks):
@@ -101,9 +106,63 @@ def order_by_seed(standings, divisions):
     ]
 
 
-if __name__ == "__main__":
-    league_data = json.load(sys.stdin)
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="refine_current_week.py",
+        description="Settle every team's verdict from the stage-1 payload on stdin.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes to spread the teams over (default: 1, no pool)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="stop searching after this long; what is unsettled reads 'alive'",
+    )
+    parser.add_argument(
+        "--resume",
+        default=None,
+        metavar="PATH",
+        help="an earlier stage-2 output whose unfinished searches to carry on",
+    )
+    parser.add_argument(
+        "--cache",
+        default=config.cache_dir(),
+        metavar="DIR",
+        help="keep settled verdicts here and reuse them for an unchanged league "
+        "(falls back to SCENARIO_CACHE, then local_config.py; default: none)",
+    )
+    wire.add_argument(parser)
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error("--deadline must be a positive number of seconds")
+    return args
+
+
+def unfinished_searches(payload):
+    """Every continuation an earlier run left in its standings."""
+    return [
+        continuation
+        for team in payload.get("standings", [])
+        for entry in team.get("undetermined", [])
+        for continuation in entry["continuations"]
+    ]
+
 
+def settle_league(league_data, workers=1, deadline=None, cache=None):
+    """The stage-2 payload for a stage-1 one: standings, verdicts, the weeks left.
+
+    `deadline` is a time.monotonic() instant after which searching stops. With a
+    `cache` (a verdict_cache.VerdictCache), a league settled before is read back
+    rather than settled again.
+    """
     playoff_spots = league_data["league_settings"]["playoff_spots"]
     # 0 when the league has no byes, or when the bracket order cannot be derived
     bye_spots = league_data["league_settings"].get("bye_spots", 0)
@@ -128,20 +187,50 @@ if __name__ == "__main__":
     # this league has produced over the weeks that remain.
     envelope = margins.swing_envelope(remaining_weeks, margins.load_thresholds())
     divisions = league_data.get("divisions")
-    expanded_data = playoff_math.apply_verdicts(
-        expanded_data,
-        remaining_matchups,
-        playoff_spots,
-        swing_envelope=envelope,
+    division_order = divisions_in_order(expanded_data, divisions)
+    key = verdict_cache.cache_key(
+        "settled",
+        standings=expanded_data,
+        remaining_matchups=remaining_matchups,
+        playoff_spots=playoff_spots,
         bye_spots=bye_spots,
-        divisions=divisions_in_order(expanded_data, divisions),
-        with_division_winner=True,
+        divisions=division_order,
+        swing_envelope=envelope,
     )
+    cached = cache.get(key) if cache else None
+    if cached:
+        expanded_data, witnesses = cached["standings"], cached["witnesses"]
+    else:
+        witnesses = []
+        expanded_data = playoff_math.apply_verdicts(
+            expanded_data,
+            remaining_matchups,
+            playoff_spots,
+            swing_envelope=envelope,
+            bye_spots=bye_spots,
+            divisions=division_order,
+            with_division_winner=True,
+            workers=workers,
+            # A live report must not die on one hard question: whatever runs out of
+            # budget or time reads 'alive', and says so in `undetermined`.
+            anytime=True,
+            deadline=deadline,
+            kept=witnesses,
+        )
+        # Only what was settled outright is kept: an answer cut short by the
+        # budget or the deadline could come out differently next time.
+        if cache and not any(team.get("undetermined") for team in expanded_data):
+            cache.put(key, {"standings": expanded_data, "witnesses": witnesses})
     combined = {
         "league_data": metadata[0],
         "next_week_matchups": next_week_matchups[0],
         "remaining_matchups": remaining_matchups,
         "standings": expanded_data,
+        # Completions of remaining_matchups, a way in and a way out for each team
+        # that has one, one '0'/'1' per game in order ('1': team2 wins). Stage 4
+        # tries them on each permutation before searching; optional, since they
+        # only save time.
+        "witnesses": witnesses,
         # Passed straight through for the season-review tables in stage 5. Absent
         # from older saved payloads, so it stays optional the whole way down.
         "weekly_scores": league_data.get("weekly_scores", []),
@@ -157,8 +246,26 @@ if __name__ == "__main__":
         # projection-based SOS the renderer shows before any game is played.
         "projected_ppg": league_data.get("projected_ppg", {}),
     }
-    print(json.dumps(combined, indent=2))
+    return combined
+
 
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    league_data = json.load(sys.stdin)
+    deadline = (
+        time.monotonic() + args.deadline if args.deadline is not None else None
+    )
+    if args.resume:
+        with open(args.resume) as file:
+            playoff_math.resume_from(unfinished_searches(json.load(file)))
+
+    combined = settle_league(
+        league_data,
+        workers=args.workers,
+        deadline=deadline,
+        cache=verdict_cache.open_cache(args.cache),
+    )
+    print(wire.dumps(combined, args.wire))
 
 
 # Reads the stage-1 payload on stdin, e.g.:
@@ -1,75 +1,475 @@
+import argparse
 import json
 import sys
-import copy
+from concurrent.futures import ProcessPoolExecutor
 
 import conditions
+import config
 import margins
 import refine_current_week
 import playoff_math
+import verdict_cache
+import wire
 
 
 # === Apply permutation and recalculate standings ===
-def apply_permutation(base_data, permutation):
-    data = copy.deepcopy(base_data)
-    data["league_data"]["remaining_weeks"] -= 1
-    matchups = data["next_week_matchups"]
-
-    for matchup, winner in zip(matchups, permutation):
-        t1, t2 = matchup["team1"], matchup["team2"]
-        for team in data["standings"]:
-            if team["team_name"] == winner:
-                team["wins"] += 1
-            elif team["team_name"] in (t1, t2):
-                team["losses"] += 1
-
-    # Re-seed on the updated records, divisionally where that applies
-    standings = refine_current_week.order_by_seed(
-        sorted(
-            data["standings"],
-            key=lambda t: (-t["wins"], t["losses"], -t["points_for"]),
-        ),
-        base_data.get("divisions"),
-    )
+class PermutationEvaluator:
+    """Standings after each outcome of next week, without copying the payload.
+
+    A permutation only moves win and loss counts, so everything that does not
+    depend on it -- who plays whom as team indices, the weeks after this one, the
+    swing envelope -- is worked out once here. Each permutation then costs two
+    small integer lists and one shallow dict per team, where a deep copy of the
+    whole payload (weekly scores, logos, the schedule) used to be made and
+    thrown away. The base payload is never written to.
+    """
+
+    def __init__(self, base_data):
+        self.base = base_data["standings"]
+        self.index = {team["team_name"]: k for k, team in enumerate(self.base)}
+        self.wins = [team["wins"] for team in self.base]
+        self.losses = [team["losses"] for team in self.base]
+        self.matchups = base_data["next_week_matchups"]
+        self.games = [
+            (self.index[m["team1"]], self.index[m["team2"]]) for m in self.matchups
+        ]
+        self.playoff_spots = base_data["league_data"]["playoff_spots"]
+        self.later_weeks = base_data.get("remaining_matchups", [])[1:]
+        # +1 for next week itself: its win/loss has been applied, but its POINTS
+        # have not -- those scores do not exist yet. Sizing the envelope on
+        # later_weeks alone treated next week's scoring as already known, so a
+        # seat resting on a 30-point gap came back as clinched whatever the result.
+        self.envelope = margins.swing_envelope(
+            len(self.later_weeks) + 1, margins.load_thresholds()
+        )
+        self.divisions = base_data.get("divisions")
+
+        # What stage 2 already proved of the base league, handed down to every
+        # permutation. A verdict decided before next week is played stays decided
+        # whatever next week does, which spares `standings_for` its questions
+        # about those teams; stage 4 itself asks only about the teams stage 2 left
+        # alive, so `walked_verdicts` has nothing to inherit. A stage-2 witness is
+        # a whole season: next week's results, then a completion of the weeks
+        # after. Where those results are the permutation's, the rest answers its
+        # questions before a search is run. The pool re-checks each one, so it can
+        # only save work.
+        self.known = {team["team_name"]: team.get("verdict") for team in self.base}
+        remaining = base_data.get("remaining_matchups", [])
+        played = len(remaining[0]) if remaining else 0
+        self.witnesses = []
+        for outcome in base_data.get("witnesses", []):
+            winners = frozenset(
+                m["team2" if bit == "1" else "team1"]
+                for m, bit in zip(remaining[0], outcome)
+            )
+            self.witnesses.append((winners, outcome[played:]))
+
+        # The outcome walked to so far by `flip`: every game's first-named team
+        # winning, to begin with. Only the records are carried from one outcome
+        # to the next; see `decide_outcomes` for what is not.
+        self.outcome = 0
+        self.walk_wins = list(self.wins)
+        self.walk_losses = list(self.losses)
+        for i, j in self.games:
+            self.walk_wins[i] += 1
+            self.walk_losses[j] += 1
+
+    def flip(self, k):
+        """Hand game `k` to the other team, in the walked outcome.
+
+        Moves one win and one loss between the game's two teams, and nothing
+        else: the seeding, the league state and the verdicts for the outcome are
+        still built afresh when `walked_verdicts` asks for them.
+        """
+        i, j = self.games[k]
+        winner, loser = (j, i) if self.outcome >> k & 1 else (i, j)
+        self.walk_wins[winner] -= 1
+        self.walk_losses[loser] -= 1
+        self.walk_wins[loser] += 1
+        self.walk_losses[winner] += 1
+        self.outcome ^= 1 << k
+
+    def walk_to(self, mask):
+        """Flip every game whose result differs between the walked outcome and `mask`."""
+        diff = self.outcome ^ mask
+        while diff:
+            k = (diff & -diff).bit_length() - 1
+            self.flip(k)
+            diff &= diff - 1
+
+    def standings_for(self, permutation):
+        return self._decide(*self._applied(permutation))
+
+    def walked_verdicts(self, teams):
+        """{name: verdict} of `teams` alone, for the outcome `flip` has walked to.
+
+        The playoff verdicts `standings_for` would give those teams, without the
+        byes, top seeds and margins -- nor anything about the other teams -- that
+        it works out on the way.
+        """
+        return self._verdicts(*self._walked(), teams)
+
+    def verdicts_for(self, permutation, teams):
+        return self._verdicts(*self._applied(permutation), teams)
+
+    def relevance(self, teams):
+        """{name: mask of the next-week games that can change its verdict}.
+
+        Bit k stands for game k of next week, as in `outcome_mask`; see
+        `playoff_math.relevant_games` for what can be ruled out, and why that is
+        safe. Asked of the league as it stands, with next week still to play.
+        """
+        weeks = [self.matchups] + self.later_weeks
+        state = playoff_math.state_from_standings(
+            self.base,
+            weeks,
+            self.playoff_spots,
+            refine_current_week.divisions_in_order(self.base, self.divisions),
+        )
+        return {
+            name: sum(
+                1 << k
+                for k in playoff_math.relevant_games(
+                    state, self.index[name], range(len(self.games))
+                )
+            )
+            for name in teams
+        }
+
+    def seeded_names(self, permutation):
+        """Team names in the order the standings after `permutation` list them."""
+        wins, losses, _ = self._applied(permutation)
+        return [team["team_name"] for team in self._seeded(wins, losses)]
+
+    def _walked(self):
+        winners = [
+            self.base[j if self.outcome >> k & 1 else i]["team_name"]
+            for k, (i, j) in enumerate(self.games)
+        ]
+        return self.walk_wins, self.walk_losses, winners
+
+    def _applied(self, permutation):
+        if isinstance(permutation, int):
+            permutation = outcome_winners(permutation, self.matchups)
+        wins = list(self.wins)
+        losses = list(self.losses)
+        for (i, j), winner in zip(self.games, permutation):
+            winner = self.index[winner]
+            wins[winner] += 1
+            losses[j if winner == i else i] += 1
+        return wins, losses, permutation
+
+    def _witnesses_for(self, winners):
+        """The later-week parts of the stage-2 witnesses this outcome agrees with.
+
+        Those are seasons of this permutation's own league, found answering the
+        same questions, so they answer many of them again. The rest are valid
+        completions too, but rarely useful ones, and every miss costs a seeding of
+        each completion tried -- measured, handing them all down made stage 4
+        slower, not faster.
+        """
+        winners = set(winners)
+        return [later for played, later in self.witnesses if played <= winners]
+
+    def _seeded(self, wins, losses):
+        # Fresh team dicts, so the verdicts written below land on this view and
+        # not on the base standings every other permutation starts from.
+        view = [
+            {**team, "wins": wins[k], "losses": losses[k]}
+            for k, team in enumerate(self.base)
+        ]
+        # Re-seed on the updated records, divisionally where that applies
+        return refine_current_week.order_by_seed(
+            sorted(view, key=lambda t: (-t["wins"], t["losses"], -t["points_for"])),
+            self.divisions,
+        )
+
+    def _decide(self, wins, losses, winners):
+        standings = self._seeded(wins, losses)
+        # Every team's fate is then decided exactly, over every completion of the
+        # weeks still left after this one.
+        return playoff_math.apply_verdicts(
+            standings,
+            self.later_weeks,
+            self.playoff_spots,
+            swing_envelope=self.envelope,
+            divisions=refine_current_week.divisions_in_order(
+                standings, self.divisions
+            ),
+            anytime=True,
+            witnesses=self._witnesses_for(winners),
+            known=self.known,
+        )
+
+    def _verdicts(self, wins, losses, winners, teams):
+        standings = self._seeded(wins, losses)
+        answers = playoff_math.team_verdicts(
+            standings,
+            self.later_weeks,
+            self.playoff_spots,
+            teams=teams,
+            swing_envelope=self.envelope,
+            divisions=refine_current_week.divisions_in_order(
+                standings, self.divisions
+            ),
+            anytime=True,
+            witnesses=self._witnesses_for(winners),
+        )
+        return {name: fields["verdict"] for name, fields in answers.items()}
+
 
-    # Every team's fate is then decided exactly, over every completion of the
-    # weeks still left after this one.
-    playoff_spots = data["league_data"]["playoff_spots"]
-    later_weeks = base_data.get("remaining_matchups", [])[1:]
-    # +1 for next week itself: its win/loss has been applied, but its POINTS
-    # have not -- those scores do not exist yet. Sizing the envelope on
-    # later_weeks alone treated next week's scoring as already known, so a seat
-    # resting on a 30-point gap came back as clinched whatever the result.
-    envelope = margins.swing_envelope(len(later_weeks) + 1, margins.load_thresholds())
-    divisions = base_data.get("divisions")
-    standings = playoff_math.apply_verdicts(
-        standings,
-        later_weeks,
-        playoff_spots,
-        swing_envelope=envelope,
-        divisions=refine_current_week.divisions_in_order(standings, divisions),
+def outcome_mask(permutation, matchups):
+    """The outcome as an integer: bit k set when game k goes to its team2.
+
+    A compact stage-3 payload lists no permutations, only how many outcomes
+    there are, and each outcome is then already that integer.
+    """
+    if isinstance(permutation, int):
+        return permutation
+    return sum(
+        1 << k
+        for k, winner in enumerate(permutation)
+        if winner == matchups[k]["team2"]
     )
-    return standings
 
-def build_team_scenarios(base_data, permutations):
+
+def outcome_winners(mask, matchups):
+    """The permutation an outcome integer stands for: each game's winner."""
+    return [m["team2" if mask >> k & 1 else "team1"] for k, m in enumerate(matchups)]
+
+
+def outcomes_in(payload):
+    """The outcomes a stage-3 payload asks about, in its order.
+
+    Listed out in full, or -- from `generate_perms.py --compact` -- every integer
+    below `outcome_count`, generated as they are needed.
+    """
+    if "permutations" in payload:
+        return payload["permutations"]
+    return range(payload["outcome_count"])
+
+
+class OutcomeStream:
+    """Outcomes arriving one NDJSON line at a time from `generate_perms.py --stream`.
+
+    Iterated once, as the lines come in; each is kept only as its outcome
+    integer, so `describe_scenario` can look it up by index afterwards.
+    """
+
+    def __init__(self, lines, matchups):
+        self.lines = lines
+        self.matchups = matchups
+        self.seen = []
+
+    def __iter__(self):
+        for line in self.lines:
+            if line.strip():
+                mask = outcome_mask(json.loads(line), self.matchups)
+                self.seen.append(mask)
+                yield mask
+
+    def __getitem__(self, i):
+        return self.seen[i]
+
+    def __len__(self):
+        return len(self.seen)
+
+
+def read_stage3(stream):
+    """(base league data, outcomes) from whatever stage 3 wrote to `stream`.
+
+    A streamed payload is a header line holding the base league, then one
+    permutation per line; its outcomes are an OutcomeStream, read only as stage 4
+    gets to them. Anything else is one JSON document, read whole.
+    """
+    first = stream.readline()
+    try:
+        header = json.loads(first)
+    except json.JSONDecodeError:
+        header = json.loads(first + stream.read())
+    if "permutations" in header or "outcome_count" in header:
+        return header["base_league_data"], outcomes_in(header)
+    base_data = header["base_league_data"]
+    return base_data, OutcomeStream(stream, base_data["next_week_matchups"])
+
+
+def apply_permutation(base_data, permutation):
+    """Standings after one outcome of next week; see PermutationEvaluator."""
+    return PermutationEvaluator(base_data).standings_for(permutation)
+
+
+def gray_rank(mask):
+    """Where `mask` falls in the Gray code: the inverse of step ^ (step >> 1).
+
+    Sorted by it, every outcome of n games is one result away from the last.
+    """
+    rank = mask
+    while mask:
+        mask >>= 1
+        rank ^= mask
+    return rank
+
+
+def decide_outcomes(evaluator, masks, tracked_teams):
+    """{mask: {name: verdict}} of the tracked teams, for each outcome given.
+
+    Walked in Gray-code order, so each outcome is mostly the last with one
+    result flipped, and only two teams' records move to get there. The rest of an
+    outcome is still made from scratch: its seeding, its LeagueState, and the
+    engine's verdicts over the weeks after. Carrying the first two over was
+    measured and not worth it: on the fixtures they are about 0.2% of an
+    outcome's cost, and the verdicts -- which one flipped result can change for
+    any team -- are the rest. Only the tracked teams' playoff verdicts are read,
+    so only they are asked.
+    """
+    decided = {}
+    for mask in sorted(set(masks), key=gray_rank):
+        evaluator.walk_to(mask)
+        decided[mask] = evaluator.walked_verdicts(tracked_teams)
+    return decided
+
+
+# How many outcomes stage 4 decides at once, in this process or a worker's.
+# Outcomes arrive one at a time and are started on as they come, so this cannot
+# be sized from a total; it is enough to walk a stretch of outcomes in Gray order
+# and keep a worker busy between hand-offs, and small enough that the stragglers
+# spread out.
+OUTCOMES_PER_TASK = 64
+
+# What a stage-4 worker process needs, set once by _adopt so that a task is only
+# a list of outcome integers and the teams to ask about them.
+_WORKER = {}
+
+
+def _adopt(base_data):
+    _WORKER["evaluator"] = PermutationEvaluator(base_data)
+
+
+def _decide_chunk(task):
+    masks, teams = task
+    before = playoff_math.reuse_stats()
+    decided = decide_outcomes(_WORKER["evaluator"], masks, teams)
+    after = playoff_math.reuse_stats()
+    return decided, {key: after[key] - before[key] for key in playoff_math.REUSE_COUNTS}
+
+
+def build_team_scenarios(base_data, permutations, workers=None, cache=None):
+    """Which permutations clinch, eliminate, or leave alive each team not yet settled.
+
+    Only the games that can change a team's verdict (see
+    `PermutationEvaluator.relevance`) are enumerated for it: one permutation is
+    decided per combination of their results, and every permutation differing
+    only in the other games reads the same verdict. Teams that turn on the same
+    games are decided together. The map still lists every permutation, so the
+    rest of the games stay don't-cares for `conditions.minimal_dnf` to drop.
+
+    `permutations` is read once, front to back, and may be a generator. They are
+    decided as they arrive, in batches of OUTCOMES_PER_TASK each walked in Gray
+    order (see `decide_outcomes`) -- here, or with `workers` above 1 in a pool of
+    processes -- so stage 4 is at work while stage 3 is still streaming. Nothing
+    is kept per permutation but its outcome integer. Every verdict is exact and
+    each is put back by its outcome, so the map is the same either way.
+
+    With a `cache` (a verdict_cache.VerdictCache), a map made before for the same
+    league and outcomes is read back instead. A streamed `permutations` is not
+    looked up: it would have to be read to the end first just to name the key.
+    """
     scenario_map = {}
 
     # Filter out teams that are already clinched/eliminated
-    tracked_teams = {
+    tracked_teams = [
         team["team_name"]
         for team in base_data["standings"]
         if team.get("verdict", "alive") == "alive"
-    }
+    ]
+    if not tracked_teams:
+        return scenario_map
+
+    matchups = base_data["next_week_matchups"]
+    evaluator = PermutationEvaluator(base_data)
+    key = None
+    if cache and isinstance(permutations, (list, range)):
+        key = verdict_cache.cache_key(
+            "scenarios",
+            standings=evaluator.base,
+            matchups=matchups,
+            later_weeks=evaluator.later_weeks,
+            playoff_spots=evaluator.playoff_spots,
+            divisions=evaluator.divisions,
+            swing_envelope=evaluator.envelope,
+            outcomes=(
+                {"count": len(permutations)}
+                if isinstance(permutations, range)
+                else [outcome_mask(p, matchups) for p in permutations]
+            ),
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    relevant = evaluator.relevance(tracked_teams)
+    # {games that matter, as a mask: the teams they matter to}
+    groups = {}
+    for name, games in relevant.items():
+        groups.setdefault(games, []).append(name)
+    # {games: {their result: the teams' verdicts}}, filled as results first appear
+    decided = {games: {} for games in groups}
+    pending = {games: [] for games in groups}
+
+    executor = None
+    if workers and workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_adopt, initargs=(base_data,)
+        )
+    futures = []
+
+    def file(games, answers):
+        for mask, verdicts in answers.items():
+            decided[games][mask & games] = verdicts
 
-    for i, perm in enumerate(permutations):
-        standings = apply_permutation(base_data, perm)
+    def settle(games, batch):
+        if executor is None:
+            file(games, decide_outcomes(evaluator, batch, groups[games]))
+        else:
+            task = (batch, groups[games])
+            futures.append((games, executor.submit(_decide_chunk, task)))
 
-        for team in standings:
-            name = team["team_name"]
-            verdict = team["verdict"]
-            # print(f"{name}'s status = {status}, i = {i}")
+    masks = []
+    first = None
+    try:
+        for permutation in permutations:
+            mask = outcome_mask(permutation, matchups)
+            if first is None:
+                first = permutation
+            masks.append(mask)
+            for games in groups:
+                if mask & games in decided[games]:
+                    continue
+                # Claimed now, answered when its batch is decided.
+                decided[games][mask & games] = None
+                pending[games].append(mask)
+                if len(pending[games]) == OUTCOMES_PER_TASK:
+                    settle(games, pending[games])
+                    pending[games] = []
+        for games, batch in pending.items():
+            if batch:
+                settle(games, batch)
+        for games, future in futures:
+            answers, counts = future.result()
+            file(games, answers)
+            playoff_math.add_reuse_stats(counts)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    if first is None:
+        return scenario_map
 
-            if name not in tracked_teams:
-                continue  # Skip teams already decided
+    # Read back in the permutations' own order, however they were decided; the
+    # teams in the order the first permutation seeds them, as it always has.
+    order = [name for name in evaluator.seeded_names(first) if name in relevant]
+    for i, mask in enumerate(masks):
+        for name in order:
+            games = relevant[name]
+            verdict = decided[games][mask & games][name]
 
             if name not in scenario_map:
                 scenario_map[name] = {
@@ -85,6 +485,8 @@ def build_team_scenarios(base_data, permutations):
             else:
                 scenario_map[name]["still_alive_in"].append(i)
 
+    if key:
+        cache.put(key, scenario_map)
     return scenario_map
 
 def own_matchup_index(matchups, team):
@@ -112,14 +514,7 @@ def describe_scenario(indices, permutations, matchups, team):
     own = own_matchup_index(matchups, team)
     count = len(matchups)
 
-    selected = set()
-    for i in indices:
-        permutation = permutations[i]
-        outcome = 0
-        for k in range(count):
-            if permutation[k] == matchups[k]["team2"]:
-                outcome |= 1 << k
-        selected.add(outcome)
+    selected = {outcome_mask(permutations[i], matchups) for i in indices}
 
     alternatives = []
     for implicant in conditions.minimal_dnf(selected, count):
@@ -150,12 +545,11 @@ def output_scenarios(team, clinched_idx, eliminated_idx, permutations, matchups)
     return result
 
 
-if __name__ == "__main__":
-    payload = json.load(sys.stdin)
-    base_data = payload["base_league_data"]
-    permutations = payload["permutations"]
-
-    team_results = build_team_scenarios(base_data, permutations)
+def scenarios_payload(base_data, permutations, workers=None, cache=None):
+    """The stage-4 payload: the base league, and what each open team needs."""
+    team_results = build_team_scenarios(
+        base_data, permutations, workers=workers, cache=cache
+    )
     matchups = base_data["next_week_matchups"]
 
     scenarios = []
@@ -168,12 +562,65 @@ if __name__ == "__main__":
             matchups,
         )
         scenarios.append({"team": team, **scenario})
-    output_payload = {
+    return {
         "base_league_data": base_data,
         "scenarios": scenarios
     }
 
-    print(json.dumps(output_payload, indent=2))
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="refine_hypothetical.py",
+        description="Stage 4: decide every outcome of next week, and summarise "
+        "what each team needs. Reads the stage-3 payload on stdin.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes to spread next week's outcomes over (default: 1, no pool)",
+    )
+    parser.add_argument(
+        "--cache",
+        default=config.cache_dir(),
+        metavar="DIR",
+        help="keep each team's outcome table here and reuse it for an unchanged "
+        "league (falls back to SCENARIO_CACHE, then local_config.py; default: none)",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="report on stderr how many questions stage 2's answers settled "
+        "without a search",
+    )
+    wire.add_argument(parser)
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+
+def report_reuse(stats, file=sys.stderr):
+    print(
+        f"witness pool: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%} answered without a search)",
+        file=file,
+    )
+
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    base_data, permutations = read_stage3(sys.stdin)
+
+    output_payload = scenarios_payload(
+        base_data,
+        permutations,
+        workers=args.workers,
+        cache=verdict_cache.open_cache(args.cache),
+    )
+    print(wire.dumps(output_payload, args.wire))
+    if args.stats:
+        report_reuse(playoff_math.reuse_stats())
 
 # Run the whole pipeline with:
 #   ./run_scenarios.sh --test scenario_engine_tests/week13.json
@@ -0,0 +1,331 @@
+"""A local what-if server: one league, settled once, asked as often as you like.
+
+Every other entry point is a cold batch run -- settle the league, decide every
+outcome of next week, describe them, exit -- which is right for a weekly report
+and far too slow behind a button clicked during Sunday's games. This does that
+work once, when it starts, and keeps the results in memory: the settled
+standings, and for every team still open the table of which outcomes of next
+week clinch or eliminate it. A question is then a filter over that table, not a
+search. "What if these games go this way" keeps the outcomes where they do;
+"what does team X need" describes the ones left, over the games not yet fixed.
+
+It reads a stage-1 payload, as `--test` does -- save a live league with
+`./run_scenarios.sh --irl 13 --dump week13.json` and serve that:
+
+    python3 scenario_engine/server.py week13.json --port 8765
+
+    GET /standings                         the settled standings, as stage 2 has them
+    GET /verdicts?win=TeamA&win=TeamC      every team's verdict, given those winners
+    GET /conditions?team=TeamB&win=TeamA   what TeamB still needs, given those winners
+    POST /final?win=TeamA                  TeamA's game is over: the answers it changed
+
+Winners are next week's; a game not named stays open. A final result is kept:
+the outcomes it rules out are dropped, and every later question is asked of the
+rest. Only the teams whose verdict can turn on that game are described again,
+so an update costs what it changes rather than a new pass over every outcome.
+`--live` does the same without HTTP, reading one winner per line on stdin and
+re-printing only the sections that changed -- for following a game day in a
+terminal. Answers are JSON, and a
+question naming a team that is not in the league, or not playing, or both sides
+of one game (final or not), is a 400 that says which.
+
+It listens on localhost only unless told otherwise: there is no authentication,
+only questions about one league.
+"""
+
+import argparse
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import config
+import generate_perms
+import league_data
+import pretty_print
+import refine_current_week
+import refine_hypothetical
+import verdict_cache
+
+
+class ScenarioSession:
+    """A league settled once, and every outcome of next week decided once.
+
+    Outcome m is the integer whose bit k is set when next week's game k goes to
+    its team2, as everywhere in stage 4; the outcomes decided are every integer
+    below 2^games, so an outcome is also its own index in the table.
+    """
+
+    def __init__(self, league, workers=1, cache=None):
+        self.settled = refine_current_week.settle_league(
+            league, workers=workers, cache=cache
+        )
+        self.standings = self.settled["standings"]
+        self.matchups = self.settled["next_week_matchups"]
+        self.count = generate_perms.outcome_count(self.settled)
+        table = refine_hypothetical.build_team_scenarios(
+            self.settled, range(self.count), workers=workers, cache=cache
+        )
+        self.verdicts_now = {
+            team["team_name"]: team.get("verdict", "alive") for team in self.standings
+        }
+        # {name: (outcomes clinching, outcomes eliminating)} for every open team
+        self.open = {
+            name: (set(entry["clinched_in"]), set(entry["eliminated_in"]))
+            for name, entry in table.items()
+        }
+        # {name: the games its verdict can turn on, as a mask}; see finalise
+        self.relevant = refine_hypothetical.PermutationEvaluator(
+            self.settled
+        ).relevance(list(self.open))
+        # Next week's games already played out, as (care, value) masks, and the
+        # outcomes they leave; every question is asked of those alone.
+        self.final_care = self.final_value = 0
+        self.live = list(range(self.count))
+        self.answers = {name: self.conditions(name) for name in self.open}
+
+    def fixed(self, winners):
+        """(care, value) masks pinning the games `winners` decide, and those final.
+
+        Raises ValueError naming the first winner that cannot be: not a team in
+        the league, not playing next week, or the other side of a game already
+        given to its opponent.
+        """
+        care, value = self.final_care, self.final_value
+        for name in winners:
+            if name not in self.verdicts_now:
+                raise ValueError(f"no such team: {name}")
+            k = refine_hypothetical.own_matchup_index(self.matchups, name)
+            if k is None:
+                raise ValueError(f"{name} has no game next week")
+            bit = int(self.matchups[k]["team2"] == name) << k
+            if care >> k & 1 and (value & (1 << k)) != bit:
+                raise ValueError(f"{name} and their opponent cannot both win")
+            care |= 1 << k
+            value |= bit
+        return care, value
+
+    def outcomes(self, winners=()):
+        """The outcomes of next week in which every one of `winners` wins."""
+        care, value = self.fixed(winners)
+        return [m for m in self.live if m & care == value]
+
+    def finalise(self, winner):
+        """Record `winner`'s game as final: {name: new answer} for what it changed.
+
+        The outcomes it rules out are dropped for good, and only the teams whose
+        verdict can turn on that game are described again -- for everyone else
+        it was a don't-care, so their answer cannot have moved. Of those, only
+        the answers that did change are returned, for a live report to re-print.
+        """
+        care, value = self.fixed([winner])
+        settled_now = care & ~self.final_care
+        if not settled_now:
+            return {}
+        self.final_care, self.final_value = care, value
+        self.live = [m for m in self.live if m & care == value]
+        changed = {}
+        for name in self.open:
+            if not self.relevant.get(name, settled_now) & settled_now:
+                continue
+            answer = self.conditions(name)
+            if answer != self.answers[name]:
+                self.answers[name] = changed[name] = answer
+        return changed
+
+    def verdicts(self, winners=()):
+        """{name: verdict} for every team, in standings order, given `winners`.
+
+        A team settled already stays so. An open team is clinched (eliminated)
+        if it is in every outcome still possible, and alive otherwise.
+        """
+        possible = self.outcomes(winners)
+        result = {}
+        for name, verdict in self.verdicts_now.items():
+            if name in self.open:
+                clinched, eliminated = self.open[name]
+                if all(m in clinched for m in possible):
+                    verdict = "clinched"
+                elif all(m in eliminated for m in possible):
+                    verdict = "eliminated"
+            result[name] = verdict
+        return result
+
+    def conditions(self, team, winners=()):
+        """What `team` needs from the games `winners` leave open, as stage 4 says it.
+
+        The alternatives are worked out over the open games alone, so a game
+        already fixed is never restated as a condition; each "matchup" is still
+        the game's index in next week's list.
+        """
+        if team not in self.verdicts_now:
+            raise ValueError(f"no such team: {team}")
+        care, _ = self.fixed(winners)
+        verdict = self.verdicts(winners)[team]
+        answer = {"team": team, "verdict": verdict}
+        if team not in self.open or verdict != "alive":
+            return answer
+
+        free = [k for k in range(len(self.matchups)) if not care >> k & 1]
+        # Outcomes are kept whole, with the final games in them; only the open
+        # games' bits are described.
+
+        def project(m):
+            return sum((m >> k & 1) << j for j, k in enumerate(free))
+
+        clinched, eliminated = self.open[team]
+        possible = self.outcomes(winners)
+        described = refine_hypothetical.output_scenarios(
+            team,
+            [project(m) for m in possible if m in clinched],
+            [project(m) for m in possible if m in eliminated],
+            range(1 << len(free)),
+            [self.matchups[k] for k in free],
+        )
+        for alternatives in described.values():
+            for alternative in alternatives:
+                for condition in alternative["conditions"]:
+                    condition["matchup"] = free[condition["matchup"]]
+        answer.update(described)
+        return answer
+
+
+class ScenarioHandler(BaseHTTPRequestHandler):
+    """JSON answers from the server's ScenarioSession, one at a time."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        winners = query.get("win", [])
+        session = self.server.session
+        try:
+            with self.server.lock:
+                if url.path == "/standings":
+                    body = session.standings
+                elif url.path == "/verdicts":
+                    body = session.verdicts(winners)
+                elif url.path == "/conditions":
+                    teams = query.get("team", [])
+                    if len(teams) != 1:
+                        raise ValueError("name one team: ?team=<name>")
+                    body = session.conditions(teams[0], winners)
+                else:
+                    return self.answer(404, {"error": f"no such question: {url.path}"})
+        except ValueError as error:
+            return self.answer(400, {"error": str(error)})
+        return self.answer(200, body)
+
+    def do_POST(self):
+        """POST /final?win=W: W's game is over; answers the teams it changed."""
+        url = urlparse(self.path)
+        winners = parse_qs(url.query).get("win", [])
+        if url.path != "/final":
+            return self.answer(404, {"error": f"no such update: {url.path}"})
+        changed = {}
+        try:
+            with self.server.lock:
+                for winner in winners:
+                    changed.update(self.server.session.finalise(winner))
+        except ValueError as error:
+            return self.answer(400, {"error": str(error)})
+        return self.answer(200, {"changed": changed})
+
+    def answer(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def make_server(session, host="127.0.0.1", port=0):
+    """An HTTP server answering from `session`; port 0 picks a free one."""
+    server = ThreadingHTTPServer((host, port), ScenarioHandler)
+    server.session = session
+    # A final result changes the session under every other question.
+    server.lock = threading.Lock()
+    return server
+
+
+def follow(session, lines):
+    """Live game-day mode: each line names a winner whose game just went final.
+
+    Only the sections of teams that result changed are printed, in the report's
+    own words; a line that cannot be a result says why and is skipped.
+    """
+    for line in lines:
+        winner = line.strip()
+        if not winner:
+            continue
+        try:
+            changed = session.finalise(winner)
+        except ValueError as error:
+            print(f"Error: {error}", file=sys.stderr)
+            continue
+        print(f"\n{pretty_print.rule(f'FINAL: {winner} WIN')}")
+        if not changed:
+            print("  no scenario changes")
+        for answer in changed.values():
+            pretty_print.print_team(answer)
+        sys.stdout.flush()
+    return 0
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="server.py",
+        description="Serve what-if questions about one league from memory.",
+    )
+    parser.add_argument("payload", help="a stage-1 payload, e.g. saved with --dump")
+    parser.add_argument("--host", default="127.0.0.1", help="default: localhost only")
+    parser.add_argument("--port", type=int, default=8765, help="default: 8765")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="processes to settle the league in at start-up (default: 1, no pool)",
+    )
+    parser.add_argument(
+        "--cache",
+        default=config.cache_dir(),
+        metavar="DIR",
+        help="verdict cache to start from (falls back to SCENARIO_CACHE, then "
+        "local_config.py; default: none)",
+    )
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="serve no HTTP; read one winner per line on stdin as each game goes "
+        "final, and print the sections of the teams it changed",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    session = ScenarioSession(
+        league_data.load_league_data(args.payload),
+        workers=args.workers,
+        cache=verdict_cache.open_cache(args.cache),
+    )
+    if args.live:
+        return follow(session, sys.stdin)
+    server = make_server(session, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"Serving {args.payload} on http://{host}:{port}/", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
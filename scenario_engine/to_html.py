@@ -23,6 +23,8 @@ import league_stats
 import margins
 import pretty_print
 import strength
+import wire
+
 
 def esc(value):
     """Escape for HTML. Team names really do contain apostrophes and quotes."""
@@ -1139,15 +1141,18 @@ def sections(args):
 
 def main(argv=None):
     args = parse_args(sys.argv[1:] if argv is None else argv)
-    document = render(json.load(sys.stdin), sections(args))
+    publish(render(wire.resolve(json.load(sys.stdin)), sections(args)), args.output)
+    return 0
 
-    if args.output:
-        with open(args.output, "w") as handle:
+
+def publish(document, output=None):
+    """Write `document` to the file `output`, or to stdout without one."""
+    if output:
+        with open(output, "w") as handle:
             handle.write(document)
-        print(f"Wrote {args.output}", file=sys.stderr)
+        print(f"Wrote {output}", file=sys.stderr)
     else:
         sys.stdout.write(document)
-    return 0
 
 
 if __name__ == "__main__":
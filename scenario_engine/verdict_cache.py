@@ -0,0 +1,107 @@
+"""Verdicts already worked out for a league, kept on disk between runs.
+
+The same week's report is made many times over -- re-rendered, written once for
+the terminal and once as HTML, run again after a wording fix -- and every run
+used to decide every verdict from scratch, though nothing they depend on had
+moved. Stage 2 stores its settled standings here, and stage 4 its table of
+which outcomes clinch or eliminate whom, each under a hash of everything that
+decides them: the standings, the games left, the seats, the divisions, the
+swing envelope, and `playoff_math.ENGINE_VERSION`. An unchanged league finds
+both and never starts the engine; a changed one hashes to a new key, so a stale
+entry is never read, only aged out.
+
+Entries are plain JSON files named by their key. Reading one marks it used, and
+writing one evicts the least recently used until the directory is back under its
+byte limit. A cache that cannot be read or written is simply a miss: a report is
+never lost to it.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import playoff_math
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+SUFFIX = ".json"
+
+
+def cache_key(kind, **inputs):
+    """The hex digest naming what `inputs` decide for the `kind` of entry.
+
+    The inputs are hashed as canonical JSON, so a payload read back from disk
+    and the one it was written from give the same key.
+    """
+    text = json.dumps(
+        [kind, playoff_math.ENGINE_VERSION, inputs],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class VerdictCache:
+    """A directory of cached results, at most `max_bytes` of them."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        """The value stored under `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path) as file:
+                value = json.load(file)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return value
+
+    def put(self, key, value):
+        """Store `value` under `key`, then evict down to the byte limit."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Written whole and renamed into place, so a reader never sees half
+            # an entry, even with two runs sharing the directory.
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(handle, "w") as file:
+                json.dump(value, file)
+            os.replace(temporary, self._path(key))
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self):
+        """Drop the least recently used entries until the rest fit the limit."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(SUFFIX):
+                continue
+            try:
+                info = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((info.st_mtime, name, info.st_size))
+        total = sum(size for _, _, size in entries)
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+
+
+def open_cache(directory):
+    """A VerdictCache on `directory`, or None when no directory is given."""
+    return VerdictCache(directory) if directory else None
@@ -0,0 +1,155 @@
+"""How one stage's payload is written down the pipe for the next.
+
+By default, as it always has been: the whole payload as indented JSON. That is
+easy to read, and expensive to pass along. Every stage after the first re-emits
+the league it was given, and the biggest parts of it are ones no engine stage
+reads: the week-by-week scores and the projected points, which only the report
+draws on, and with --logos every team's badge as a base64 data URI -- hundreds
+of kilobytes that stages 2, 3 and 4 used to parse and re-serialise untouched.
+
+The compact form is minified, and moves each of those BLOBS out of the payload
+into a side file, leaving {"$blob": path} in its place. The file is named by a
+hash of its content, so a blob already written is not written again, and the
+reference itself passes through every later stage as a few bytes. The report
+calls `resolve` to read the blobs back; nothing before it needs to.
+
+Where the files go: the directory SCENARIO_BLOBS (or BLOB_DIR in local_config.py)
+names, kept between runs and shared by them. Without one, each run gets a
+private directory of its own -- made by the first stage to write a blob, found
+by the later ones from the references they are handed -- and the report removes
+it once it has read the blobs back, so a compact payload is for piping, not for
+keeping. Either way a file is only taken as a blob if its content still hashes to
+its name: one left stale, or put there by someone else, is rewritten when a blob
+is written and refused when one is read.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import config
+
+BLOBS = ("weekly_scores", "logos", "projected_ppg")
+FORMATS = ("pretty", "compact")
+REFERENCE = "$blob"
+RUN_PREFIX = "scenario-blobs-"  # a run's own directory, when none is configured
+
+
+def _is_reference(value):
+    return isinstance(value, dict) and set(value) == {REFERENCE}
+
+
+def _levels(payload):
+    """The payload itself, and the league a stage-3 or stage-4 payload carries."""
+    yield payload
+    base = payload.get("base_league_data")
+    if isinstance(base, dict):
+        yield base
+
+
+def _references(payload):
+    """Every blob path `payload` refers to, in order."""
+    return [
+        level[key][REFERENCE]
+        for level in _levels(payload)
+        for key in BLOBS
+        if _is_reference(level.get(key))
+    ]
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _read(path):
+    """A blob file's text, or None if it is missing or not the blob its name says."""
+    try:
+        with open(path) as file:
+            text = file.read()
+    except OSError:
+        return None
+    if _digest(text) + ".json" != os.path.basename(path):
+        return None
+    return text
+
+
+def _externalise(payload, blob_dir):
+    """A shallow copy of `payload` with every blob written out and referenced.
+
+    With no `blob_dir`, the run's own: the directory the payload's references
+    are already in, or a new private one if it has none.
+    """
+    payload = dict(payload)
+    if isinstance(payload.get("base_league_data"), dict):
+        payload["base_league_data"] = dict(payload["base_league_data"])
+    if blob_dir is None:
+        existing = _references(payload)
+        blob_dir = (
+            os.path.dirname(existing[0])
+            if existing
+            else tempfile.mkdtemp(prefix=RUN_PREFIX)
+        )
+    for level in _levels(payload):
+        for key in BLOBS:
+            if key not in level or _is_reference(level[key]):
+                continue
+            text = json.dumps(level[key], separators=(",", ":"))
+            path = os.path.join(blob_dir, _digest(text) + ".json")
+            if _read(path) != text:
+                os.makedirs(blob_dir, exist_ok=True)
+                descriptor, temporary = tempfile.mkstemp(dir=blob_dir, suffix=".tmp")
+                with os.fdopen(descriptor, "w") as file:
+                    file.write(text)
+                os.replace(temporary, path)
+            level[key] = {REFERENCE: path}
+    return payload
+
+
+def dumps(payload, wire="pretty", blob_dir=None):
+    """`payload` as text in the `wire` format, writing out blobs if compact."""
+    if wire == "pretty":
+        return json.dumps(payload, indent=2)
+    blob_dir = blob_dir or config.blob_dir()
+    payload = _externalise(payload, blob_dir and os.path.expanduser(blob_dir))
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def resolve(payload):
+    """Read every blob reference in `payload` back in, in place; returns it.
+
+    Raises ValueError for a blob whose file is gone or no longer holds it. The
+    blobs of a run's own directory are read once, here, so the directory is
+    removed once they have been.
+    """
+    paths = _references(payload)
+    for level in _levels(payload):
+        for key in BLOBS:
+            if _is_reference(level.get(key)):
+                path = level[key][REFERENCE]
+                text = _read(path)
+                if text is None:
+                    raise ValueError(f"blob {path} is missing or has changed")
+                level[key] = json.loads(text)
+    if not config.blob_dir():
+        for directory in {os.path.dirname(path) for path in paths}:
+            if os.path.basename(directory).startswith(RUN_PREFIX):
+                for path in paths:
+                    if os.path.dirname(path) == directory and os.path.exists(path):
+                        os.remove(path)
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass  # something else is in it; not ours to remove
+    return payload
+
+
+def add_argument(parser):
+    """The --wire option every stage that writes a payload takes."""
+    parser.add_argument(
+        "--wire",
+        choices=FORMATS,
+        default="pretty",
+        help="how to write the payload: indented JSON (default), or compact -- "
+        "minified, with scores, projections and logos moved to side files",
+    )
@@ -0,0 +1,213 @@
+"""A search that runs out must leave the report standing, and be resumable.
+
+Out of budget or time, a question reads 'alive' -- the one verdict that claims
+nothing -- and its search leaves a continuation behind. These tests hold the
+continuation to its promise: resumed as often as it takes, in this process or
+from its JSON in a fresh one, a search ends with the answer it would have given
+uninterrupted.
+"""
+
+import copy
+import json
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import playoff_math
+import pretty_print
+import refine_current_week as stage2
+from playoff_math import DEFAULT_NODE_BUDGET, SearchBudgetExceeded
+from test_divisions import divisional_state
+from test_playoff_math import random_state
+
+
+@pytest.fixture(autouse=True)
+def no_leftover_frontiers():
+    playoff_math._FRONTIERS.clear()
+    yield
+    playoff_math._FRONTIERS.clear()
+
+
+def search_in_slices(state, team, want_in, budget, through_json=False):
+    """Run the search `budget` nodes at a time until it answers."""
+    slices = 0
+    while True:
+        try:
+            return playoff_math._search(state, team, want_in, budget, table=None), slices
+        except SearchBudgetExceeded as exceeded:
+            slices += 1
+            if through_json:
+                saved = json.dumps(exceeded.continuations)
+                playoff_math._FRONTIERS.clear()
+                playoff_math.resume_from(json.loads(saved))
+
+
+@pytest.mark.parametrize("through_json", [False, True])
+@pytest.mark.parametrize("seed", range(8))
+def test_a_resumed_search_ends_where_an_uninterrupted_one_does(seed, through_json):
+    rng = random.Random(seed)
+    state = (
+        divisional_state(rng, n=8, weeks=3, spots=4)
+        if seed % 2
+        else random_state(rng, n=8, weeks=3, spots=4)
+    )
+    resumed_any = False
+    for team in range(state.num_teams):
+        for want_in in (True, False):
+            whole = playoff_math._search(
+                state, team, want_in, DEFAULT_NODE_BUDGET, table=None
+            )
+            sliced, slices = search_in_slices(state, team, want_in, 7, through_json)
+            assert sliced == whole
+            resumed_any = resumed_any or slices > 0
+    assert resumed_any, "the budget should have been small enough to stop a search"
+
+
+def test_a_continuation_records_the_nodes_it_has_spent():
+    state = random_state(random.Random(3), n=8, weeks=3, spots=4)
+    with pytest.raises(SearchBudgetExceeded) as first:
+        playoff_math._search(state, 0, True, 5, table=None)
+    [continuation] = first.value.continuations
+    assert continuation["nodes"] == 5
+    assert all(bit in (0, 1) for bit in continuation["path"])
+
+
+@pytest.mark.parametrize("table", [False, True])
+def test_a_frontier_is_only_resumed_in_the_league_it_was_left_in(table):
+    """Two leagues alike but for two rivals' records: A's search stops in the first.
+
+    Its frontier once resumed in the second, skipping subtrees proven dead only
+    under the first league's records, and found no way in for A where there is
+    one.
+    """
+
+    def league(wins):
+        return playoff_math.LeagueState(
+            list("ABCDEF"),
+            wins,
+            [8 - w for w in wins],
+            [1009, 1002, 1007, 1010, 1006, 1006],
+            [(3, 5), (0, 2), (4, 1), (4, 5), (3, 2), (0, 1)],
+            2,
+        )
+
+    first, second = league([4, 5, 6, 5, 6, 6]), league([4, 4, 6, 5, 5, 6])
+    shared = playoff_math.TranspositionTable() if table else None
+    with pytest.raises(SearchBudgetExceeded):
+        playoff_math._search(first, 0, True, 3, table=shared)
+
+    found = playoff_math._search(second, 0, True, DEFAULT_NODE_BUDGET, table=shared)
+
+    assert found is not None
+    assert playoff_math.status_of(second, 0) == "alive"
+
+
+def test_status_of_reports_what_it_proved_before_running_out():
+    rng = random.Random(11)
+    state = random_state(rng, n=10, weeks=3, spots=5)
+    for team in range(state.num_teams):
+        truth = playoff_math.status_of(state, team)
+        playoff_math._FRONTIERS.clear()
+        try:
+            got = playoff_math.status_of(state, team, budget=3)
+        except SearchBudgetExceeded as exceeded:
+            assert truth not in exceeded.ruled_out
+        else:
+            assert got == truth
+
+
+def hard_standings(seed):
+    rng = random.Random(seed)
+    state = random_state(rng, n=10, weeks=3, spots=5)
+    standings = [
+        {"team_name": name, "wins": w, "losses": l, "points_for": p}
+        for name, w, l, p in zip(state.names, state.wins, state.losses, state.points)
+    ]
+    remaining = [
+        [{"team1": state.names[i], "team2": state.names[j]} for i, j in state.games]
+    ]
+    return standings, remaining
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_an_anytime_run_never_claims_more_than_the_full_one(seed):
+    standings, remaining = hard_standings(seed)
+    full = playoff_math.apply_verdicts(copy.deepcopy(standings), remaining, 5, bye_spots=2)
+    quick = playoff_math.apply_verdicts(
+        copy.deepcopy(standings), remaining, 5, bye_spots=2, budget=4, anytime=True
+    )
+    for settled, rushed in zip(full, quick):
+        for field in ("verdict", "bye", "top_seed"):
+            if rushed[field] != "alive":
+                assert rushed[field] == settled[field]
+        for entry in rushed.get("undetermined", []):
+            if entry["question"] == "verdict":
+                assert settled["verdict"] not in entry["ruled_out"]
+
+
+def test_without_anytime_running_out_still_raises():
+    standings, remaining = hard_standings(0)
+    with pytest.raises(SearchBudgetExceeded):
+        playoff_math.apply_verdicts(
+            standings, remaining, 5, deadline=time.monotonic() - 1
+        )
+
+
+def test_a_passed_deadline_leaves_a_complete_report_that_says_so():
+    standings, remaining = hard_standings(0)
+    rushed = playoff_math.apply_verdicts(
+        copy.deepcopy(standings),
+        remaining,
+        5,
+        anytime=True,
+        deadline=time.monotonic() - 1,
+    )
+    unsettled = [team for team in rushed if team.get("undetermined")]
+    assert unsettled, "every search should have stopped at once"
+    for team in unsettled:
+        assert team["verdict"] == "alive"
+        assert pretty_print.status_label(team).endswith("(unproven)")
+    json.dumps(rushed)  # the continuations travel in the payload
+
+    # A second run of the same standings, with time, settles what the first
+    # could not, and drops the note.
+    playoff_math.resume_from(
+        continuation
+        for team in rushed
+        for entry in team.get("undetermined", [])
+        for continuation in entry["continuations"]
+    )
+    settled = playoff_math.apply_verdicts(rushed, remaining, 5, anytime=True)
+    assert not any(team.get("undetermined") for team in settled)
+    assert settled == playoff_math.apply_verdicts(
+        copy.deepcopy(standings), remaining, 5
+    )
+
+
+def test_stage2_takes_a_deadline_and_an_earlier_run_to_resume(tmp_path, stage1_json):
+    root = Path(__file__).resolve().parent.parent
+    payload = stage1_json("week12.json")
+
+    def run(*flags):
+        return subprocess.run(
+            [sys.executable, "scenario_engine/refine_current_week.py", *flags],
+            input=payload,
+            capture_output=True,
+            text=True,
+            cwd=root,
+            check=True,
+        ).stdout
+
+    plain = run()
+    earlier = tmp_path / "stage2.json"
+    earlier.write_text(plain)
+    assert run("--deadline", "60", "--resume", str(earlier)) == plain
+
+
+def test_stage2_refuses_a_deadline_that_is_not_in_the_future():
+    with pytest.raises(SystemExit):
+        stage2.parse_args(["--deadline", "0"])
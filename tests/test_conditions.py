@@ -75,3 +75,70 @@ def test_simplest_alternative_comes_first():
     implicants = conditions.minimal_dnf({0b00, 0b01, 0b10}, 2)
 
     assert len(implicants[0]) <= len(implicants[-1])
+
+
+@pytest.mark.parametrize("num_vars", [1, 3, 5, 7])
+@pytest.mark.parametrize("seed", range(6))
+def test_primes_are_every_maximal_implicant_and_nothing_else(num_vars, seed):
+    """Checked against the definition, not against another merging scheme."""
+    rng = random.Random(seed * 100 + num_vars)
+    universe = range(1 << num_vars)
+    minterms = {m for m in universe if rng.random() < 0.6} or {0}
+
+    def inside(value, care):
+        return all(m in minterms for m in universe if m & care == value)
+
+    expected = set()
+    for care in universe:
+        for value in universe:
+            if value & ~care or not inside(value, care):
+                continue
+            # maximal: freeing any pinned variable leaves the set
+            if all(
+                not inside(value & ~(1 << bit), care & ~(1 << bit))
+                for bit in range(num_vars)
+                if care >> bit & 1
+            ):
+                expected.add((value, care))
+
+    assert conditions._prime_implicants(minterms, num_vars) == expected
+
+
+@pytest.mark.parametrize("num_vars", [2, 3, 4])
+@pytest.mark.parametrize("seed", range(10))
+def test_the_exact_cover_is_the_shortest_there_is(num_vars, seed):
+    rng = random.Random(seed * 100 + num_vars)
+    minterms = {m for m in range(1 << num_vars) if rng.random() < 0.5} or {1}
+    primes = sorted(conditions._prime_implicants(minterms, num_vars))
+
+    def cost(implicants):
+        return len(implicants), sum(len(i) for i in implicants)
+
+    shortest = None
+    for size in range(1, len(primes) + 1):
+        for combo in itertools.combinations(primes, size):
+            as_dicts = [
+                {bit: value >> bit & 1 for bit in range(num_vars) if care >> bit & 1}
+                for value, care in combo
+            ]
+            if conditions.describes_exactly(as_dicts, minterms, num_vars):
+                shortest = min(cost(as_dicts), shortest or cost(as_dicts))
+        if shortest:
+            break
+
+    exact = conditions.minimal_dnf(minterms, num_vars)
+    greedy = conditions.minimal_dnf(minterms, num_vars, exact=False)
+    assert conditions.describes_exactly(exact, minterms, num_vars)
+    assert cost(exact) == shortest
+    assert cost(exact) <= cost(greedy)
+
+
+def test_the_exact_cover_drops_what_greedy_keeps():
+    # A cycle of six outcomes, each prime an edge of it: every prime covers two,
+    # so greedy's picks can leave four, where three edges cover the cycle.
+    minterms = {0b000, 0b001, 0b011, 0b111, 0b110, 0b100}
+    greedy = conditions.minimal_dnf(minterms, 3, exact=False)
+    exact = conditions.minimal_dnf(minterms, 3)
+    assert conditions.describes_exactly(exact, minterms, 3)
+    assert len(greedy) == 4
+    assert len(exact) == 3
@@ -153,6 +153,39 @@ def test_the_count_of_teams_above_never_falls_while_a_team_is_frozen(seed):
         )
 
 
+@pytest.mark.parametrize("seed", range(20))
+def test_the_seed_tracker_follows_the_full_sort_through_wins_and_undos(seed):
+    """The search keeps the count incrementally; it must always equal the sort.
+
+    Points are drawn from a handful of values so that ties on record and points
+    -- broken by index, as the sort's stability breaks them -- come up often.
+    """
+    rng = random.Random(seed)
+    for _ in range(50):
+        n = rng.randrange(4, 11)
+        divisions = [k % rng.choice([2, 3]) for k in range(n)]
+        rng.shuffle(divisions)
+        wins = [rng.randrange(0, 4) for _ in range(n)]
+        points = [rng.choice([100.0, 110.0, 120.0]) for _ in range(n)]
+        team = rng.randrange(n)
+        tracker = playoff_math._SeedTracker(team, wins, points, divisions)
+
+        history = []
+        for _ in range(30):
+            if history and rng.random() < 0.4:
+                u = history.pop()
+                wins[u] -= 1
+                tracker.unwon(u)
+            else:
+                u = rng.choice([t for t in range(n) if t != team])
+                wins[u] += 1
+                tracker.won(u)
+                history.append(u)
+            assert tracker.above() == playoff_math.strictly_above(
+                team, wins, points, n, divisions
+            ), f"team={team} divisions={divisions} wins={wins} points={points}"
+
+
 # --- cross-checked against exhaustive enumeration -----------------------------
 
 
@@ -200,6 +233,43 @@ def test_the_widened_pruning_bound_never_hides_a_way_to_miss(seed):
             assert truth[name] == "eliminated", f"{name} over-eliminated"
 
 
+def test_a_better_record_below_a_division_leader_still_counts_against_it():
+    """The case that once over-clinched T2.
+
+    T2 (6-4) led division 0 on points, so it was seeded second and only one team
+    sat above it -- yet T8, T1 and T5 all had better records in the other
+    division. Losing out hands the division to T6, drops T2 among the
+    non-winners, and puts all of them above it: sixth, out of five seats. The
+    search's bound counted only the teams above it *now*, and missed them.
+    """
+    state = LeagueState(
+        [f"T{i}" for i in range(10)],
+        [3, 6, 6, 3, 4, 6, 5, 7, 6, 2],
+        [7, 4, 4, 7, 6, 4, 5, 3, 4, 8],
+        [1763.36, 1945.29, 1681.54, 1730.47, 1515.05,
+         1830.29, 1724.58, 1729.78, 1638.28, 1916.61],
+        [(9, 4), (8, 1), (7, 0), (5, 6), (2, 3),
+         (8, 2), (1, 5), (6, 7), (3, 9), (0, 4)],
+        5,
+        [0, 1, 0, 0, 1, 1, 0, 1, 1, 0],
+    )
+
+    assert brute_force_statuses(state)["T2"] == "alive"
+    assert status_of(state, 2) == "alive"
+    assert classify(state)["T2"] == "alive"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_one_team_at_a_time_agrees_with_the_shared_walk(seed):
+    """status_of searches per team; classify walks every team at once."""
+    rng = random.Random(5000 + seed)
+    state = divisional_state(rng, n=8, weeks=2, spots=4, divisions=2)
+
+    assert classify(state) == {
+        state.names[t]: status_of(state, t) for t in range(state.num_teams)
+    }
+
+
 @pytest.mark.parametrize("seed", range(15))
 def test_never_more_clinched_than_seats_with_divisions(seed):
     rng = random.Random(4000 + seed)
@@ -537,3 +607,21 @@ def test_an_outside_game_still_counts_toward_the_division_race():
     )
     assert playoff_math.division_verdict(state, 0) == "alive"
     assert playoff_math.division_verdict(state, 1) == "alive"
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("divisions", [2, 4])
+def test_a_game_ruled_irrelevant_never_changes_a_divisional_verdict(seed, divisions):
+    """Nor can it hand a division title, and the seeding with it, to anyone."""
+    state = divisional_state(
+        random.Random(4100 + seed), n=8, weeks=2, spots=4, divisions=divisions, played=12
+    )
+    next_week = range(4)
+    for team in range(state.num_teams):
+        relevant = playoff_math.relevant_games(state, team, next_week)
+        for k in set(next_week) - set(relevant):
+            verdicts = {
+                classify(state.with_results([(k, winner)]))[state.names[team]]
+                for winner in state.games[k]
+            }
+            assert len(verdicts) == 1
@@ -64,3 +64,16 @@ def test_no_matchups_leaves_a_single_empty_permutation():
     data = league_with({"A": "Clinched Playoff Spot", "B": "Eliminated"}, [])
 
     assert stage3.generate_matchup_permutations(data) == [()]
+
+
+def test_the_compact_payload_counts_the_outcomes_it_would_have_listed():
+    data = league_with(
+        {f"T{i}": "In contention" for i in range(6)},
+        [
+            {"team1": "T0", "team2": "T1"},
+            {"team1": "T2", "team2": "T3"},
+            {"team1": "T4", "team2": "T5"},
+        ],
+    )
+    assert stage3.outcome_count(data) == len(stage3.generate_matchup_permutations(data))
+    assert stage3.outcome_count(league_with({}, [])) == 1
@@ -0,0 +1,170 @@
+"""Spreading the verdicts over processes must not change a single one.
+
+Every answer the engine gives is exact, so which process finds it, and in what
+order, is not supposed to matter. These tests hold it to that: the parallel
+path is compared field by field against the serial one, on the fixtures and on
+random leagues, flat and divisional.
+"""
+
+import copy
+import json
+import pickle
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import playoff_math
+import refine_current_week as stage2
+import refine_hypothetical as stage4
+from playoff_math import LeagueState, classify
+from test_divisions import divisional_state
+from test_playoff_math import random_state, standings_and_weeks
+from test_refine_current_week import standings_for
+from test_refine_hypothetical import spread_league
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_parallel_classify_agrees_with_the_shared_walk(seed):
+    rng = random.Random(seed)
+    state = random_state(rng, n=8, weeks=3, spots=4)
+    assert classify(state, workers=2) == classify(state)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_parallel_classify_agrees_on_divisional_leagues(seed):
+    rng = random.Random(seed)
+    state = divisional_state(rng, n=8, weeks=2, spots=4)
+    assert classify(state, workers=2) == classify(state)
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+def test_parallel_apply_verdicts_is_identical_to_serial(load_fixture, name):
+    fixture = load_fixture(name)
+    settings = fixture["league_settings"]
+    remaining_weeks = settings["weeks_in_season"] - settings["current_week"]
+    remaining = stage2.build_remaining_matchups(fixture["teams"], remaining_weeks)
+    standings = standings_for(fixture)
+    options = dict(
+        swing_envelope=5.0,
+        bye_spots=settings.get("bye_spots", 0),
+        divisions=stage2.divisions_in_order(standings, fixture.get("divisions")),
+        with_division_winner=True,
+    )
+
+    serial = playoff_math.apply_verdicts(
+        copy.deepcopy(standings), remaining, settings["playoff_spots"], **options
+    )
+    parallel = playoff_math.apply_verdicts(
+        copy.deepcopy(standings),
+        remaining,
+        settings["playoff_spots"],
+        workers=2,
+        **options,
+    )
+    # Compared as the bytes stage 2 writes, so even the field order must match.
+    assert json.dumps(parallel, indent=2) == json.dumps(serial, indent=2)
+
+
+def test_a_league_state_pickles_as_its_constructor_arguments():
+    state = LeagueState(
+        ["A", "B", "C"], [3, 2, 1], [1, 2, 3], [100.5, 90.0, 80.25],
+        [(0, 1), (1, 2)], 2, divisions=[0, 1, 0],
+    )
+    clone = pickle.loads(pickle.dumps(state))
+    assert classify(clone) == classify(state)
+    assert (clone.names, clone.wins, clone.games, clone.divisions) == (
+        state.names, state.wins, state.games, state.divisions,
+    )
+
+
+def test_stage2_accepts_a_worker_count(stage1_json):
+    payload = stage1_json("week12.json")
+    outputs = [
+        subprocess.run(
+            [sys.executable, "scenario_engine/refine_current_week.py", *flags],
+            input=payload,
+            capture_output=True,
+            text=True,
+            cwd=REPO_ROOT,
+            check=True,
+        ).stdout
+        for flags in ([], ["--workers", "2"])
+    ]
+    # The whole payload, witnesses included: they are asked afresh per team
+    # rather than taken from whichever seasons each process met first.
+    assert outputs[0] == outputs[1]
+    assert json.loads(outputs[0])["witnesses"]
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+def test_parallel_stage2_writes_the_serial_payload(load_fixture, name):
+    serial, parallel = (
+        stage2.settle_league(load_fixture(name), workers=workers) for workers in (1, 2)
+    )
+    assert json.dumps(parallel, indent=2) == json.dumps(serial, indent=2)
+
+
+def test_the_workers_pool_lookups_are_counted():
+    state = random_state(random.Random(14), n=8, weeks=3, spots=4, played=8)
+    standings, weeks = standings_and_weeks(state)
+
+    playoff_math.reset_reuse_stats()
+    playoff_math.apply_verdicts(standings, weeks, 4, workers=2)
+    stats = playoff_math.reuse_stats()
+    assert stats["hits"] + stats["misses"] > 0
+
+
+def test_stage2_rejects_a_worker_count_below_one():
+    with pytest.raises(SystemExit):
+        stage2.parse_args(["--workers", "0"])
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+def test_parallel_stage4_builds_the_serial_scenario_map(stage1_json, run_stages, name):
+    code, out, err = run_stages(
+        ["scenario_engine/refine_current_week.py", "scenario_engine/generate_perms.py"],
+        stage1_json(name),
+    )
+    assert code == 0, err
+    payload = json.loads(out)
+    base, perms = payload["base_league_data"], payload["permutations"]
+
+    serial = stage4.build_team_scenarios(base, perms)
+    parallel = stage4.build_team_scenarios(base, perms, workers=3)
+    # Compared as JSON, so the order the teams were filled in must match too.
+    assert json.dumps(parallel) == json.dumps(serial)
+
+
+@pytest.mark.parametrize("per_task", [1, 5, 64])
+def test_stage4_batches_a_stream_of_outcomes_to_the_serial_map(monkeypatch, per_task):
+    base_data, permutations = spread_league(1)
+    serial = stage4.build_team_scenarios(base_data, permutations)
+    monkeypatch.setattr(stage4, "OUTCOMES_PER_TASK", per_task)
+    streamed = stage4.build_team_scenarios(
+        base_data, (list(p) for p in permutations), workers=2
+    )
+    assert streamed == serial
+
+
+def test_stage4_rejects_a_worker_count_below_one():
+    with pytest.raises(SystemExit):
+        stage4.parse_args(["--workers", "0"])
+
+
+def test_run_scenarios_passes_workers_to_both_engine_stages():
+    plain, parallel = (
+        subprocess.run(
+            ["./run_scenarios.sh", "--test", "scenario_engine_tests/week12.json", *flags],
+            capture_output=True,
+            text=True,
+            cwd=REPO_ROOT,
+            check=True,
+        ).stdout
+        for flags in ([], ["--workers", "2"])
+    )
+    assert parallel == plain
@@ -32,6 +32,7 @@ def test_stage2_emits_the_documented_wire_format(stage1_json, run_stages, name):
         "next_week_matchups",
         "remaining_matchups",
         "standings",
+        "witnesses",
         "weekly_scores",
         "abbreviations",
         "logos",
@@ -58,6 +59,11 @@ def test_stage2_emits_the_documented_wire_format(stage1_json, run_stages, name):
         }
         assert as_pairs == next_pairs
 
+    # One '0'/'1' per remaining game, in remaining_matchups order.
+    games = sum(len(week) for week in remaining)
+    for outcome in payload["witnesses"]:
+        assert len(outcome) == games and set(outcome) <= {"0", "1"}
+
 
 @pytest.mark.parametrize("name", FIXTURES)
 def test_whole_pipeline_runs_clean(stage1_json, run_stages, all_stages, name):
@@ -228,3 +234,57 @@ def test_usage_is_shown_when_called_with_nothing():
 
     assert code != 0
     assert "Usage:" in out or "Usage:" in err
+
+
+# --- one process --------------------------------------------------------------
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_the_one_process_runner_prints_what_the_pipe_printed(
+    stage1_json, run_stages, all_stages, name
+):
+    code, piped, err = run_stages(all_stages, stage1_json(name))
+    assert code == 0, err
+
+    code, out, err = run_script(["--test", f"scenario_engine_tests/{name}"])
+    assert code == 0, err
+    assert out == piped
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_each_dumped_stage_is_what_that_stage_writes(stage1_json, name):
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    def stage(script, *flags, payload):
+        return subprocess.run(
+            [sys.executable, f"scenario_engine/{script}", *flags],
+            input=payload,
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent.parent,
+            check=True,
+        ).stdout
+
+    written = [stage1_json(name)]
+    written.append(stage("refine_current_week.py", payload=written[-1]))
+    written.append(stage("generate_perms.py", "--compact", payload=written[-1]))
+    written.append(stage("refine_hypothetical.py", payload=written[-1]))
+
+    for number, expected in enumerate(written, 1):
+        code, out, err = run_script(
+            ["--test", f"scenario_engine_tests/{name}", "--dump-stage", str(number)]
+        )
+        assert code == 0, err
+        assert out == expected, f"stage {number}"
+
+
+@pytest.mark.parametrize("stage", ["0", "5", "two"])
+def test_dump_stage_names_a_stage_that_exists(stage):
+    code, out, err = run_script(
+        ["--test", "scenario_engine_tests/week12.json", "--dump-stage", stage]
+    )
+    assert code != 0
+    assert "Traceback" not in err
+    assert "--dump-stage" in err
@@ -14,7 +14,9 @@ import random
 
 import pytest
 
+import playoff_math
 from playoff_math import (
+    DEFAULT_NODE_BUDGET,
     LeagueState,
     beats,
     classify,
@@ -184,3 +186,760 @@ def test_no_games_left_is_decided_by_final_standings():
     )
 
     assert classify(state) == {"A": "clinched", "B": "clinched", "C": "eliminated"}
+
+
+# --- the transposition table ------------------------------------------------
+
+
+def related_states(rng, count, divisions=None):
+    """One schedule and one set of points, under many different records.
+
+    That is what stage 4 asks: the same later weeks, once per permutation of the
+    next one. A table shared across them must never let a position learned under
+    one set of records answer for another.
+    """
+    n = 6
+    games = round_robin_weeks(n, 3, rng)
+    points = [round(rng.uniform(1400, 2000), 2) for _ in range(n)]
+    states = []
+    for _ in range(count):
+        wins = [rng.randint(3, 6) for _ in range(n)]
+        states.append(
+            LeagueState(
+                [f"T{i}" for i in range(n)],
+                wins,
+                [9 - w for w in wins],
+                points,
+                games,
+                3,
+                divisions,
+            )
+        )
+    return states
+
+
+def searched_status(state, team, branching=playoff_math.DEFAULT_BRANCHING):
+    """status_of's verdict from the search alone, on the shared table.
+
+    `classify` and `status_of` answer most questions before the search is ever
+    reached, so a table test that went through them would test very little.
+    """
+    can_miss = playoff_math._search(
+        state, team, False, DEFAULT_NODE_BUDGET, branching=branching
+    )
+    can_make = playoff_math._search(
+        state, team, True, DEFAULT_NODE_BUDGET, branching=branching
+    )
+    if can_miss is None:
+        return "clinched"
+    return "eliminated" if can_make is None else "alive"
+
+
+@pytest.mark.parametrize("branching", sorted(playoff_math.BRANCHING))
+@pytest.mark.parametrize("divisions", [None, [0, 1, 0, 1, 0, 1]])
+@pytest.mark.parametrize("seed", range(4))
+def test_a_shared_table_never_leaks_between_questions(seed, divisions, branching):
+    playoff_math.TRANSPOSITIONS.clear()
+    for state in related_states(random.Random(seed), 6, divisions):
+        expected = brute_force_statuses(state)
+        for team in range(state.num_teams):
+            name = state.names[team]
+            assert searched_status(state, team, branching) == expected[name]
+            assert status_of(state, team) == expected[name]
+
+
+def test_a_rival_already_above_keeps_its_place_in_the_position():
+    """Two leagues whose positions differ only in which rival is above the team.
+
+    Folding the rivals already above into a bare count let these share a key:
+    the dead end learned in the first, where T5 cannot miss, answered for the
+    second, where it can.
+    """
+    playoff_math.TRANSPOSITIONS.clear()
+    points = [93.08, 103.21, 101.36, 98.04, 91.07, 90.42]
+    games = [(0, 3), (1, 4), (2, 5)]
+    for wins in ([3, 0, 2, 2, 0, 1], [0, 2, 1, 2, 0, 1]):
+        state = LeagueState(
+            [f"T{i}" for i in range(6)], wins, [3 - w for w in wins], points, games, 5
+        )
+        expected = brute_force_statuses(state)["T5"]
+        assert searched_status(state, 5, "schedule") == expected
+
+
+def test_a_position_is_never_shared_across_different_records_for_the_team():
+    """Two rivals on 4 wins who play each other twice, chasing 6 and then 5.
+
+    Neither the rivals' records nor the open games differ between the two
+    leagues, only the searched team's own. At 6 the rivals cannot both pass it;
+    at 5 they can, by splitting the games. A table that forgot the team's record
+    would carry the first dead end into the second league and call it clinched.
+    """
+    playoff_math.TRANSPOSITIONS.clear()
+    leagues = [
+        LeagueState(
+            ["T0", "T1", "T2"],
+            [team_wins, 4, 4],
+            [8 - team_wins, 8, 8],
+            [100.0, 200.0, 300.0],
+            [(1, 2), (1, 2)],
+            2,
+        )
+        for team_wins in (6, 5)
+    ]
+
+    assert [status_of(state, 0) for state in leagues] == ["clinched", "alive"]
+
+
+def test_the_table_stays_within_its_bound():
+    table = playoff_math.TranspositionTable(maxsize=50)
+    for state in related_states(random.Random(3), 8):
+        for team in range(state.num_teams):
+            for want_in in (False, True):
+                playoff_math._search(state, team, want_in, DEFAULT_NODE_BUDGET, table)
+
+    assert len(table) <= 50
+
+
+def test_stage4_reuses_positions_on_the_week12_fixture(load_fixture):
+    """Permutations of next week revisit the same later-week positions."""
+    import generate_perms
+    import refine_current_week
+    import refine_hypothetical
+
+    fixture = load_fixture("week12.json")
+    settings = fixture["league_settings"]
+    remaining = settings["weeks_in_season"] - settings["current_week"]
+    base = {
+        "league_data": {
+            "playoff_spots": settings["playoff_spots"],
+            "remaining_weeks": remaining,
+        },
+        "next_week_matchups": fixture["next_week_matchups"],
+        "remaining_matchups": refine_current_week.build_remaining_matchups(
+            fixture["teams"], remaining
+        ),
+        "standings": refine_current_week.calculate_stats(
+            fixture, settings["playoff_spots"], settings["weeks_in_season"], remaining
+        ),
+        "divisions": fixture["divisions"],
+    }
+    playoff_math.TRANSPOSITIONS.clear()
+    refine_hypothetical.build_team_scenarios(
+        base, generate_perms.generate_matchup_permutations(base)
+    )
+
+    stats = playoff_math.transposition_stats()
+    assert stats["hits"] > 0
+    assert stats["positions"] <= playoff_math.TRANSPOSITIONS.maxsize
+
+
+# --- the flow prefilter -----------------------------------------------------
+
+
+def completions_exist(state):
+    """{(team, want_in): does any completion put team in / out?} by enumeration."""
+    n = state.num_teams
+    exists = {}
+    for outcome in itertools.product(*[(i, j) for (i, j) in state.games]):
+        wins = list(state.wins)
+        for winner in outcome:
+            wins[winner] += 1
+        for t in range(n):
+            made = makes_playoffs(t, wins, state.points, n, state.playoff_spots)
+            exists[(t, made)] = True
+    return exists
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_the_flow_prefilter_never_contradicts_brute_force(seed):
+    """Whatever it settles must be right; what it cannot settle it must say so."""
+    rng = random.Random(3000 + seed)
+    n = rng.choice([5, 6, 7])
+    state = random_state(rng, n=n, weeks=2, spots=rng.randint(1, n - 1))
+    exists = completions_exist(state)
+
+    for team in range(n):
+        for want_in in (False, True):
+            found = playoff_math._flow_counterexample(state, team, want_in)
+            if found is playoff_math.UNDECIDED:
+                continue
+            assert (found is not None) == exists.get((team, want_in), False)
+            if found is not None:
+                wins = list(state.wins)
+                for _, winner in found:
+                    wins[winner] += 1
+                assert makes_playoffs(
+                    team, wins, state.points, n, state.playoff_spots
+                ) == want_in
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_one_seat_is_always_settled_without_searching(seed):
+    """With a single seat the flow argument is exact, in both directions."""
+    state = random_state(random.Random(4000 + seed), n=8, weeks=3, spots=1)
+
+    for team in range(state.num_teams):
+        for want_in in (False, True):
+            assert (
+                playoff_math._flow_counterexample(state, team, want_in)
+                is not playoff_math.UNDECIDED
+            )
+
+
+def test_a_divisional_league_is_always_left_to_the_search():
+    state = LeagueState(
+        ["A", "B", "C", "D"],
+        [5, 4, 3, 2],
+        [3, 4, 5, 6],
+        [900.0, 800.0, 700.0, 600.0],
+        [(0, 1), (2, 3)],
+        2,
+        [0, 0, 1, 1],
+    )
+
+    assert playoff_math._flow_counterexample(state, 0, False) is playoff_math.UNDECIDED
+
+
+def test_a_14_team_end_of_season_fits_a_small_budget():
+    """Five weeks left for 14 teams: 35 open games, 2^35 completions.
+
+    The bare search needs more than 20,000 nodes for one of these teams; with the
+    flow settling the easy questions first, the whole league fits.
+    """
+    rng = random.Random(13)
+    wins = [rng.randint(3, 9) for _ in range(14)]
+    state = LeagueState(
+        [f"T{i}" for i in range(14)],
+        wins,
+        [12 - w for w in wins],
+        [round(rng.uniform(1400, 2000), 2) for _ in range(14)],
+        round_robin_weeks(14, 5, rng),
+        6,
+    )
+
+    statuses = classify(state, budget=20_000)
+    assert sum(v == "clinched" for v in statuses.values()) <= 6
+
+
+# --- the shared walk ----------------------------------------------------------
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_the_shared_walk_answers_with_real_completions(seed):
+    """Every answer classify rests on is a whole season that really does it."""
+    rng = random.Random(6000 + seed)
+    state = random_state(rng, n=8, weeks=3, spots=4, played=8)
+
+    answers = playoff_math._answer_all(state, DEFAULT_NODE_BUDGET)
+
+    for (team, want_in), completion in answers.items():
+        if completion is None:
+            continue
+        assert sorted(k for k, _ in completion) == list(range(len(state.games)))
+        wins = list(state.wins)
+        for _, winner in completion:
+            wins[winner] += 1
+        assert makes_playoffs(
+            team, wins, state.points, state.num_teams, state.playoff_spots
+        ) == want_in
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_the_shared_walk_agrees_with_one_team_at_a_time(seed):
+    rng = random.Random(7000 + seed)
+    state = random_state(rng, n=10, weeks=3, spots=5, played=9)
+
+    assert classify(state) == {
+        state.names[t]: status_of(state, t) for t in range(state.num_teams)
+    }
+
+
+def test_the_shared_walk_counts_an_exact_tie_as_no_beat():
+    """T3 can end level with two teams on wins and points, and a seat for each.
+
+    The walk once seated such ties by index, as seed_order lists them, and so
+    called T3 eliminated where every other count has it alive.
+    """
+    wins = [2, 1, 1, 0, 2, 1, 4, 2]
+    state = LeagueState(
+        [f"T{i}" for i in range(8)],
+        wins,
+        [4 - w for w in wins],
+        [102.0, 102.0, 103.25, 102.0, 102.0, 100.0, 103.25, 101.5],
+        [(7, 6), (0, 4), (2, 5), (3, 1), (7, 1), (6, 5), (4, 2), (3, 0)],
+        3,
+    )
+
+    assert classify(state)["T3"] == status_of(state, 3) == "alive"
+    assert classify(state) == brute_force_statuses(state)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_the_shared_walk_agrees_with_brute_force_before_any_points(seed):
+    """Week one: every team on 0.0 points, so every level record is a tie."""
+    rng = random.Random(8000 + seed)
+    n = 8
+    wins = [rng.randint(0, 2) for _ in range(n)]
+    state = LeagueState(
+        [f"T{i}" for i in range(n)],
+        wins,
+        [2 - w for w in wins],
+        [0.0] * n,
+        round_robin_weeks(n, 2, rng),
+        rng.randint(1, n - 1),
+    )
+
+    assert classify(state) == brute_force_statuses(state)
+
+
+@pytest.mark.parametrize(
+    "wins, points, games, spots, divisions, team",
+    [
+        (
+            [3, 3, 2, 0, 1, 2, 0, 4],
+            [101, 101, 101, 101, 101, 102, 101, 101],
+            [(2, 5), (1, 4), (0, 6), (7, 3), (5, 1), (3, 7),
+             (6, 2), (4, 0), (0, 1), (4, 7), (3, 2), (5, 6)],
+            5,
+            [1, 0, 0, 1, 1, 1, 0, 0],
+            7,
+        ),
+        (
+            [2, 3, 2, 0, 1, 1, 3, 4],
+            [101, 101, 101, 100, 101, 101, 101, 103],
+            [(5, 0), (6, 4), (1, 2), (3, 7)],
+            4,
+            [1, 0, 0, 1, 1, 0, 1, 0],
+            6,
+        ),
+    ],
+)
+def test_a_divisional_tie_on_points_seats_the_lower_index_above(
+    wins, points, games, spots, divisions, team
+):
+    """With divisions, seed_order breaks an exact tie by index, and so do the bounds.
+
+    Both bounds once counted only rivals that could strictly pass the team, and
+    called it clinched where a rival level on wins and points with the lower
+    index can still be seeded above it.
+    """
+    state = LeagueState(
+        [f"T{i}" for i in range(8)],
+        wins,
+        [6 - w for w in wins],
+        points,
+        games,
+        spots,
+        divisions,
+    )
+
+    assert status_of(state, team) == classify(state)[f"T{team}"] == "alive"
+
+
+@pytest.mark.parametrize("seed", range(30))
+@pytest.mark.parametrize("scores", ["zero", "tied"])
+def test_divisional_verdicts_agree_with_brute_force_on_level_points(seed, scores):
+    """Every team on 0.0 points, or on one of three scores: ties everywhere."""
+    rng = random.Random(10000 + seed)
+    n = 8
+    wins = [rng.randint(0, 2) for _ in range(n)]
+    points = (
+        [0.0] * n
+        if scores == "zero"
+        else [rng.choice([100.0, 101.0, 102.0]) for _ in range(n)]
+    )
+    divisions = [rng.randint(0, 1) for _ in range(n)]
+    divisions[0] = 1 - divisions[1]
+    state = LeagueState(
+        [f"T{i}" for i in range(n)],
+        wins,
+        [2 - w for w in wins],
+        points,
+        round_robin_weeks(n, rng.randint(1, 3), rng),
+        rng.randint(1, n - 1),
+        divisions,
+    )
+    truth = brute_force_statuses(state)
+
+    assert {state.names[t]: status_of(state, t) for t in range(n)} == truth
+    assert classify(state) == truth
+
+
+# --- the witness pool -------------------------------------------------------
+
+
+def test_every_alive_team_is_answered_from_the_pool_after_classify():
+    """classify keeps the seasons it found; asking again needs no search."""
+    state = random_state(random.Random(11), n=8, weeks=3, spots=4, played=8)
+    pool = playoff_math.WitnessPool(state)
+    statuses = classify(state, pool=pool)
+    alive = [t for t in range(state.num_teams) if statuses[state.names[t]] == "alive"]
+    assert alive, "the fixture league should leave someone alive"
+    misses = pool.misses
+
+    for team in alive:
+        assert pool.find(state, team, True) is not None
+        assert pool.find(state, team, False) is not None
+    assert pool.misses == misses
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_a_pool_shared_across_seat_counts_never_changes_a_verdict(seed):
+    """Top-4, top-2 and top-1 are different questions over the same seasons."""
+    state = random_state(random.Random(8000 + seed), n=6, weeks=2, spots=4)
+    pool = playoff_math.WitnessPool(state)
+
+    for seats in (4, 2, 1):
+        narrowed = playoff_math.with_seats(state, seats)
+        assert {
+            state.names[t]: status_of(narrowed, t, pool=pool)
+            for t in range(state.num_teams)
+        } == brute_force_statuses(narrowed)
+
+
+def test_a_pool_never_seats_an_exact_tie_by_index():
+    """A and B finish level on wins and points: neither beats the other.
+
+    Both are in, then, with one seat, as makes_playoffs counts it. A pool that
+    seated its completions in seed_order would put B second, and offer the
+    season as proof that B can miss.
+    """
+    state = LeagueState(["A", "B"], [1, 1], [1, 1], [100.0, 100.0], [], 1)
+    pool = playoff_math.WitnessPool(state)
+    pool.add([])
+
+    assert pool.find(state, 1, False) is None
+    assert pool.find(state, 1, True) == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_a_pool_agrees_with_brute_force_before_any_points(seed):
+    rng = random.Random(9000 + seed)
+    n = 8
+    wins = [rng.randint(0, 2) for _ in range(n)]
+    state = LeagueState(
+        [f"T{i}" for i in range(n)],
+        wins,
+        [2 - w for w in wins],
+        [0.0] * n,
+        round_robin_weeks(n, 2, rng),
+        rng.randint(1, n - 1),
+    )
+    pool = playoff_math.WitnessPool(state)
+
+    assert classify(state, pool=pool) == brute_force_statuses(state)
+    assert classify(state, pool=pool) == brute_force_statuses(state)
+
+
+def test_a_pool_is_only_consulted_for_its_own_league():
+    state = random_state(random.Random(12), n=6, weeks=2, spots=3)
+    pool = playoff_math.WitnessPool(state)
+    classify(state, pool=pool)
+    other = state.with_results([(0, state.games[0][0])])
+
+    assert pool.covers(state)
+    assert not pool.covers(other)
+    assert classify(other, pool=pool) == brute_force_statuses(other)
+
+
+def test_a_pool_written_out_and_read_back_keeps_its_seasons():
+    state = random_state(random.Random(13), n=8, weeks=3, spots=4, played=8)
+    pool = playoff_math.WitnessPool(state)
+    classify(state, pool=pool)
+    outcomes = pool.outcomes()
+    assert outcomes and all(len(o) == len(state.games) for o in outcomes)
+
+    again = playoff_math.WitnessPool(state)
+    for outcome in outcomes + ["01", "2" * len(state.games)]:
+        again.add_outcome(outcome)
+    assert again.outcomes() == outcomes
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_handed_down_witnesses_and_verdicts_never_change_a_verdict(seed):
+    """A child league -- one game decided -- reusing what its parent proved."""
+    parent = random_state(random.Random(9000 + seed), n=8, weeks=3, spots=4)
+    pool = playoff_math.WitnessPool(parent)
+    verdicts = classify(parent, pool=pool)
+    child = parent.with_results([(0, parent.games[0][1])])
+
+    witnesses = [outcome[1:] for outcome in pool.outcomes() if outcome[0] == "1"]
+    inherited = playoff_math.WitnessPool(child)
+    for outcome in witnesses:
+        inherited.add_outcome(outcome)
+    before = playoff_math.reuse_stats()["inherited"]
+    assert classify(child, pool=inherited, known=verdicts) == brute_force_statuses(child)
+    assert playoff_math.reuse_stats()["inherited"] - before == sum(
+        v != "alive" for v in verdicts.values()
+    )
+
+
+def standings_and_weeks(state):
+    """`state` in the pipeline's shapes: standings, and its games as one week."""
+    standings = [
+        {"team_name": name, "wins": w, "losses": l, "points_for": p}
+        for name, w, l, p in zip(state.names, state.wins, state.losses, state.points)
+    ]
+    weeks = [
+        [{"team1": state.names[i], "team2": state.names[j]} for i, j in state.games]
+    ]
+    return standings, weeks
+
+
+def test_apply_verdicts_keeps_witnesses_for_the_next_run():
+    state = random_state(random.Random(14), n=8, weeks=3, spots=4, played=8)
+    standings, weeks = standings_and_weeks(state)
+    witnesses = []
+    first = playoff_math.apply_verdicts([dict(t) for t in standings], weeks, 4, kept=witnesses)
+    assert witnesses
+
+    playoff_math.reset_reuse_stats()
+    second = playoff_math.apply_verdicts(
+        [dict(t) for t in standings], weeks, 4, witnesses=list(witnesses)
+    )
+    assert second == first
+    assert playoff_math.reuse_stats()["hits"] > 0
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize(
+    "questions", [("verdict",), ("bye", "top_seed"), playoff_math.QUESTIONS]
+)
+def test_team_verdicts_answers_what_apply_verdicts_would(seed, questions):
+    state = random_state(random.Random(9500 + seed), n=8, weeks=3, spots=4)
+    standings, weeks = standings_and_weeks(state)
+    options = dict(swing_envelope=20.0, bye_spots=2)
+    full = playoff_math.apply_verdicts(
+        [dict(t) for t in standings], weeks, 4, **options
+    )
+    teams = {"T1", "T4", "T6"}
+
+    lean = playoff_math.team_verdicts(
+        standings, weeks, 4, teams=teams, questions=questions, **options
+    )
+    assert set(lean) == teams
+    for team in full:
+        if team["team_name"] in teams:
+            fields = lean[team["team_name"]]
+            assert fields == {key: team[key] for key in fields}
+            assert set(questions) <= set(fields)
+    assert "verdict" not in standings[0], "team_verdicts writes nothing back"
+
+
+def test_team_verdicts_refuses_a_question_it_does_not_know():
+    state = random_state(random.Random(15), n=6, weeks=2, spots=3)
+    standings, weeks = standings_and_weeks(state)
+    with pytest.raises(ValueError, match="magic_number"):
+        playoff_math.team_verdicts(standings, weeks, 3, questions=("magic_number",))
+
+
+def flip_keeps_verdict(state, team, k):
+    """Does `team`'s verdict read the same whichever way game k goes?"""
+    verdicts = {
+        classify(state.with_results([(k, winner)]))[state.names[team]]
+        for winner in state.games[k]
+    }
+    return len(verdicts) == 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_a_game_ruled_irrelevant_never_changes_the_verdict(seed):
+    state = random_state(random.Random(9700 + seed), n=8, weeks=3, spots=4)
+    next_week = range(4)
+    pruned = 0
+    for team in range(state.num_teams):
+        relevant = playoff_math.relevant_games(state, team, next_week)
+        assert [k for k in next_week if team in state.games[k]] == [
+            k for k in relevant if team in state.games[k]
+        ], "a team's own game is always kept"
+        for k in set(next_week) - set(relevant):
+            pruned += 1
+            assert flip_keeps_verdict(state, team, k)
+    if seed == 0:
+        assert pruned, "the bound should rule something out on a spread-out table"
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_an_irrelevant_game_cannot_move_a_tiebreak_downgrade_either(seed):
+    state = random_state(random.Random(9800 + seed), n=8, weeks=2, spots=4)
+    standings, _ = standings_and_weeks(state)
+    for team in range(state.num_teams):
+        for k in set(range(4)) - set(playoff_math.relevant_games(state, team, range(4))):
+            i, j = state.games[k]
+            verdicts = set()
+            for winner, loser in ((i, j), (j, i)):
+                moved = [dict(t) for t in standings]
+                moved[winner]["wins"] += 1
+                moved[loser]["losses"] += 1
+                later = [
+                    {"team1": state.names[a], "team2": state.names[b]}
+                    for a, b in state.games[4:]
+                ]
+                name = state.names[team]
+                answers = playoff_math.team_verdicts(
+                    moved, [later], 4, teams={name}, swing_envelope=60.0
+                )
+                verdicts.add(answers[name]["verdict"])
+            assert len(verdicts) == 1
+
+
+def test_probes_share_every_field_they_do_not_change():
+    state = LeagueState(
+        ["A", "B", "C"], [3, 2, 1], [1, 2, 3], [100.5, 90.0, 80.25], [(0, 1), (1, 2)], 2
+    )
+    narrowed = playoff_math.with_seats(state, 1)
+    assert narrowed.playoff_spots == 1
+    assert narrowed.wins is state.wins and narrowed.score is state.score
+
+    moved = playoff_math._with_points_override(state, 2, 100.51)
+    assert moved.score == (10050, 9000, 10051)
+    assert moved.wins is state.wins and moved.games is state.games
+
+    played = state.with_results([(0, 1)])
+    assert played.wins == (3, 3, 1) and played.games == ((1, 2),)
+    assert played.points is state.points and played.names is state.names
+
+
+def test_scores_compare_as_whole_hundredths():
+    """Summed floats drift; the hundredths they stand for do not."""
+    state = LeagueState(["A", "B"], [1, 1], [0, 0], [0.1 + 0.2, 0.3], [], 1)
+    assert state.score == (30, 30)
+
+
+def test_a_season_longer_than_the_recursion_limit_is_searched():
+    """The search keeps its own stack, so depth is bounded by memory alone."""
+    import sys
+
+    games = [(k % 4, (k + 1) % 4) for k in range(sys.getrecursionlimit() + 200)]
+    state = LeagueState("ABCD", [0] * 4, [0] * 4, [1.0, 2.0, 3.0, 4.0], games, 2)
+
+    way_in = playoff_math._search(state, 0, True, DEFAULT_NODE_BUDGET, table=None)
+    way_out = playoff_math._search(state, 0, False, DEFAULT_NODE_BUDGET, table=None)
+
+    for completion, want_in in ((way_in, True), (way_out, False)):
+        assert completion is not None and len(completion) == len(games)
+        wins = [0] * 4
+        for _, winner in completion:
+            wins[winner] += 1
+        assert makes_playoffs(0, wins, state.score, 4, 2) == want_in
+
+
+def test_the_shared_walk_keeps_its_own_stack_too():
+    """Divisions leave every question to the walk; none of them fits the call stack."""
+    import sys
+
+    games = [(k % 4, (k + 1) % 4) for k in range(sys.getrecursionlimit() + 200)]
+    state = LeagueState(
+        "ABCD", [0] * 4, [0] * 4, [1.0, 2.0, 3.0, 4.0], games, 2, [0, 0, 1, 1]
+    )
+
+    answers = playoff_math._answer_all(state, DEFAULT_NODE_BUDGET)
+
+    for (team, want_in), completion in answers.items():
+        assert completion is not None and len(completion) == len(games)
+        wins = [0] * 4
+        for _, winner in completion:
+            wins[winner] += 1
+        assert makes_playoffs(team, wins, state.score, 4, 2, state.divisions) == want_in
+
+
+def test_the_search_still_stops_at_its_budget():
+    rng = random.Random(7)
+    state = random_state(rng, n=12, weeks=4, spots=6, played=10)
+    with pytest.raises(playoff_math.SearchBudgetExceeded):
+        for team in range(state.num_teams):
+            for want_in in (True, False):
+                playoff_math._search(state, team, want_in, 5, table=None)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_every_search_answer_is_a_whole_season(seed):
+    """An early exit must still name every result: the witness pool replays it."""
+    rng = random.Random(seed)
+    state = random_state(rng, n=8, weeks=3, spots=4)
+    for team in range(state.num_teams):
+        for want_in in (True, False):
+            found = playoff_math._search(state, team, want_in, DEFAULT_NODE_BUDGET)
+            if found is None:
+                continue
+            assert sorted(k for k, _ in found) == list(range(len(state.games)))
+            wins = list(state.wins)
+            for _, winner in found:
+                wins[winner] += 1
+            assert makes_playoffs(team, wins, state.score, 8, 4) == want_in
+
+
+@pytest.mark.parametrize("branching", sorted(playoff_math.BRANCHING))
+@pytest.mark.parametrize("seed", range(10))
+def test_every_branching_order_agrees_with_brute_force(branching, seed):
+    """Orders may only change how many nodes an answer costs, never the answer."""
+    rng = random.Random(seed)
+    state = random_state(rng, n=6, weeks=2, spots=3)
+    expected = brute_force_statuses(state)
+    for team in range(state.num_teams):
+        can_miss = playoff_math._search(
+            state, team, False, DEFAULT_NODE_BUDGET, table=None, branching=branching
+        )
+        can_make = playoff_math._search(
+            state, team, True, DEFAULT_NODE_BUDGET, table=None, branching=branching
+        )
+        got = (
+            "clinched" if can_miss is None
+            else "eliminated" if can_make is None
+            else "alive"
+        )
+        assert got == expected[state.names[team]]
+
+
+def test_the_constrained_order_decides_the_race_before_the_settled_games():
+    """T1 can still pass T0; T2, T3 and T4 cannot, whatever they do."""
+    state = LeagueState(
+        ["T0", "T1", "T2", "T3", "T4"],
+        [5, 5, 3, 1, 1], [2, 2, 4, 6, 6],
+        [1500.0, 1400.0, 1600.0, 1300.0, 1200.0],
+        [(3, 4), (1, 2)],
+        2,
+    )
+    ordered = playoff_math._constrained_order(state, 0, True, [0, 1], list(state.wins))
+    assert [k for k, _, _ in ordered] == [1, 0]
+    # Hunting for a way in, the win goes where it does least harm: T2 needs two
+    # more to pass T0 and has only the one game left.
+    assert ordered[0][1] == 2
+    # Hunting for a way out, it goes to T1, one win from passing.
+    ordered = playoff_math._constrained_order(state, 0, False, [0, 1], list(state.wins))
+    assert ordered[0][:2] == (1, 1)
+
+
+def test_a_question_is_keyed_on_the_order_its_games_are_decided_in():
+    """The same games, points and record for T0, under rivals that flip the order.
+
+    "constrained" decides T1-T2 first in one league and T3-T4 first in the
+    other, so position 1 is a different game decided in each. Sharing one
+    question would let a dead end after one game stand for the other game.
+    """
+    leagues = [
+        LeagueState(
+            ["T0", "T1", "T2", "T3", "T4"],
+            wins,
+            [7 - w for w in wins],
+            [1500.0, 1400.0, 1600.0, 1300.0, 1200.0],
+            [(3, 4), (1, 2)],
+            2,
+        )
+        for wins in ([5, 5, 3, 1, 1], [5, 1, 1, 5, 3])
+    ]
+    orders = [
+        [
+            k
+            for k, _, _ in playoff_math._constrained_order(
+                state, 0, True, [0, 1], list(state.wins)
+            )
+        ]
+        for state in leagues
+    ]
+    assert orders == [[1, 0], [0, 1]]
+
+    table = playoff_math.TranspositionTable()
+    for state in leagues:
+        playoff_math._search(state, 0, True, DEFAULT_NODE_BUDGET, table)
+    assert len(table._questions) == 2
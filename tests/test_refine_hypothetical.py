@@ -1,11 +1,17 @@
 """Stage 4: replay each permutation and recompute standings."""
 
 import copy
+import io
 import json
+import random
+import subprocess
+import sys
+from pathlib import Path
 
 import pytest
 
 import generate_perms as stage3
+import playoff_math
 import refine_current_week as stage2
 import refine_hypothetical as stage4
 
@@ -68,6 +74,86 @@ def test_apply_permutation_does_not_mutate_the_base_payload(load_fixture, name):
     )
 
 
+class Uncopyable:
+    def __deepcopy__(self, memo):
+        raise AssertionError("the pass-through payload was copied")
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+def test_permutations_never_copy_the_pass_through_payload(load_fixture, name):
+    """Only records change per permutation; scores, logos and the rest are ballast."""
+    base, perms = base_data_for(load_fixture(name))
+    base["weekly_scores"] = Uncopyable()
+    base["logos"] = Uncopyable()
+
+    evaluator = stage4.PermutationEvaluator(base)
+    for perm in perms:
+        standings = evaluator.standings_for(perm)
+        assert standings == stage4.apply_permutation(base, perm)
+
+
+@pytest.mark.parametrize("count", range(6))
+def test_gray_order_visits_every_outcome_once_one_flip_at_a_time(count):
+    masks = sorted(range(1 << count), key=stage4.gray_rank)
+
+    assert masks[0] == 0
+    for before, after in zip(masks, masks[1:]):
+        assert bin(before ^ after).count("1") == 1
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+def test_walking_to_an_outcome_gives_the_verdicts_applying_it_does(load_fixture, name):
+    base, perms = base_data_for(load_fixture(name))
+    matchups = base["next_week_matchups"]
+    by_mask = {stage4.outcome_mask(perm, matchups): perm for perm in perms}
+    names = [t["team_name"] for t in base["standings"]]
+
+    evaluator = stage4.PermutationEvaluator(base)
+    for mask in sorted(by_mask, key=stage4.gray_rank):
+        evaluator.walk_to(mask)
+        assert evaluator.walked_verdicts(names) == evaluator.verdicts_for(
+            by_mask[mask], names
+        )
+
+
+def test_the_serial_path_walks_each_batch_in_gray_order(load_fixture, monkeypatch):
+    base, perms = base_data_for(load_fixture("week12.json"))
+    batches = []
+    walked = []
+    decide = stage4.decide_outcomes
+    walk_to = stage4.PermutationEvaluator.walk_to
+
+    def recording_decide(evaluator, masks, teams):
+        batches.append(list(masks))
+        return decide(evaluator, masks, teams)
+
+    def recording_walk_to(self, mask):
+        walked.append(mask)
+        walk_to(self, mask)
+
+    monkeypatch.setattr(stage4, "decide_outcomes", recording_decide)
+    monkeypatch.setattr(stage4.PermutationEvaluator, "walk_to", recording_walk_to)
+    stage4.build_team_scenarios(base, perms)
+
+    assert batches
+    assert walked == [
+        mask for batch in batches for mask in sorted(batch, key=stage4.gray_rank)
+    ]
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+def test_asking_only_the_tracked_teams_gives_their_full_verdicts(load_fixture, name):
+    base, perms = base_data_for(load_fixture(name))
+    tracked = {t["team_name"] for t in base["standings"][::2]}
+
+    evaluator = stage4.PermutationEvaluator(base)
+    for perm in perms:
+        full = evaluator.standings_for(perm)
+        assert evaluator.verdicts_for(perm, tracked) == {
+            t["team_name"]: t["verdict"] for t in full if t["team_name"] in tracked
+        }
+
+
 def test_no_team_below_the_cutoff_does_not_crash():
     """An all-tied league, two stages downstream."""
     base = {
@@ -159,3 +245,182 @@ def test_the_tiebreaker_guard_only_ever_downgrades(load_fixture, name):
                 assert team["status"] == playoff_math.STATUS_ELIMINATED
             else:
                 assert team["status"] == playoff_math.STATUS_ALIVE
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+def test_what_stage2_proved_only_saves_work(stage1_json, run_stages, name):
+    """Handed-down witnesses and verdicts give the standings a cold start does."""
+    code, out, err = run_stages(
+        ["scenario_engine/refine_current_week.py", "scenario_engine/generate_perms.py"],
+        stage1_json(name),
+    )
+    assert code == 0, err
+    payload = json.loads(out)
+    base = payload["base_league_data"]
+    assert base["witnesses"]
+
+    warm = stage4.PermutationEvaluator(base)
+    cold = stage4.PermutationEvaluator(base)
+    cold.known = {}
+    cold.witnesses = []
+    for perm in payload["permutations"]:
+        assert warm.standings_for(perm) == cold.standings_for(perm)
+
+
+def test_a_permutations_standings_inherit_stage2s_settled_verdicts(
+    stage1_json, run_stages
+):
+    """Stage 4 asks only about the teams stage 2 left alive; standings_for asks all."""
+    code, out, err = run_stages(
+        ["scenario_engine/refine_current_week.py", "scenario_engine/generate_perms.py"],
+        stage1_json("week12.json"),
+    )
+    assert code == 0, err
+    payload = json.loads(out)
+    evaluator = stage4.PermutationEvaluator(payload["base_league_data"])
+    settled = sum(
+        verdict in ("clinched", "eliminated") for verdict in evaluator.known.values()
+    )
+    assert settled
+
+    playoff_math.reset_reuse_stats()
+    evaluator.standings_for(payload["permutations"][0])
+    assert playoff_math.reuse_stats()["inherited"] == settled
+
+
+def test_stage4_reports_how_many_searches_were_saved(stage1_json, run_stages):
+    code, out, err = run_stages(
+        ["scenario_engine/refine_current_week.py", "scenario_engine/generate_perms.py"],
+        stage1_json("week12.json"),
+    )
+    assert code == 0, err
+
+    stats = subprocess.run(
+        [sys.executable, "scenario_engine/refine_hypothetical.py", "--stats"],
+        input=out,
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+        check=True,
+    ).stderr
+    assert "witness pool:" in stats
+
+
+def spread_league(seed):
+    """A stage-3 base whose records are far enough apart for games not to matter."""
+    rng = random.Random(seed)
+    names = [f"T{t}" for t in range(10)]
+    standings = []
+    for name in names:
+        wins = rng.randint(0, 11)
+        standings.append(
+            {
+                "team_name": name,
+                "wins": wins,
+                "losses": 11 - wins,
+                "points_for": round(rng.uniform(1400, 2000), 2),
+            }
+        )
+    standings.sort(key=lambda t: (-t["wins"], t["losses"], -t["points_for"]))
+    weeks = []
+    for _ in range(2):
+        rng.shuffle(names)
+        weeks.append([{"team1": a, "team2": b} for a, b in zip(names[::2], names[1::2])])
+    playoff_math.apply_verdicts(standings, weeks, 4)
+    base = {
+        "league_data": {"playoff_spots": 4},
+        "next_week_matchups": weeks[0],
+        "remaining_matchups": weeks,
+        "standings": standings,
+    }
+    return base, stage3.generate_matchup_permutations(base)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_skipping_irrelevant_games_gives_every_permutation_its_own_verdict(seed):
+    base, perms = spread_league(seed)
+    evaluator = stage4.PermutationEvaluator(base)
+    tracked = [t["team_name"] for t in base["standings"] if t["verdict"] == "alive"]
+    full = 1 << len(base["next_week_matchups"])
+    if seed == 0:
+        assert any(m != full - 1 for m in evaluator.relevance(tracked).values())
+
+    scenario_map = stage4.build_team_scenarios(base, perms)
+    for i, perm in enumerate(perms):
+        for name, verdict in evaluator.verdicts_for(perm, tracked).items():
+            bucket = {
+                "clinched": "clinched_in",
+                "eliminated": "eliminated_in",
+                "alive": "still_alive_in",
+            }[verdict]
+            assert i in scenario_map[name][bucket]
+
+
+def test_an_outcome_integer_stands_for_the_permutation_it_encodes(load_fixture):
+    base, perms = base_data_for(load_fixture("week12.json"))
+    matchups = base["next_week_matchups"]
+    evaluator = stage4.PermutationEvaluator(base)
+    for perm in perms:
+        mask = stage4.outcome_mask(perm, matchups)
+        assert stage4.outcome_winners(mask, matchups) == list(perm)
+        assert stage4.outcome_mask(mask, matchups) == mask
+        assert evaluator.standings_for(mask) == evaluator.standings_for(perm)
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+def test_stage4_reads_the_compact_and_streamed_payloads_to_the_same_report(stage1_json, run_stages, name):
+    code, stage2_out, err = run_stages(
+        ["scenario_engine/refine_current_week.py"], stage1_json(name)
+    )
+    assert code == 0, err
+
+    def run(*command, payload):
+        return subprocess.run(
+            [sys.executable, *command],
+            input=payload,
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).resolve().parent.parent,
+            check=True,
+        ).stdout
+
+    listed, compact, streamed = (
+        run(
+            "scenario_engine/refine_hypothetical.py",
+            payload=run("scenario_engine/generate_perms.py", *flags, payload=stage2_out),
+        )
+        for flags in ([], ["--compact"], ["--stream"])
+    )
+    assert compact == listed
+    assert streamed == listed
+
+
+def test_streamed_outcomes_are_read_as_they_arrive():
+    base_data, permutations = spread_league(3)
+    arrived = []
+
+    def lines():
+        for permutation in permutations:
+            arrived.append(permutation)
+            yield json.dumps(list(permutation)) + "\n"
+
+    outcomes = stage4.OutcomeStream(lines(), base_data["next_week_matchups"])
+    for count, _ in enumerate(outcomes, 1):
+        # One line in, one outcome out: nothing waits for the end of the stream.
+        assert len(arrived) == count
+    assert list(outcomes.seen) == [
+        stage4.outcome_mask(p, base_data["next_week_matchups"]) for p in permutations
+    ]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_a_streamed_payload_decides_like_the_listed_one(seed):
+    base_data, permutations = spread_league(seed)
+    written = io.StringIO()
+    stage3.stream_perms(base_data, written)
+    read_base, outcomes = stage4.read_stage3(io.StringIO(written.getvalue()))
+    assert read_base == json.loads(json.dumps(base_data))
+    assert stage4.build_team_scenarios(read_base, outcomes) == (
+        stage4.build_team_scenarios(base_data, permutations)
+    )
+    assert len(outcomes) == len(permutations)
@@ -0,0 +1,183 @@
+"""The what-if server must answer as the batch pipeline would, only sooner."""
+
+import json
+import random
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+import generate_perms as stage3
+import refine_current_week as stage2
+import refine_hypothetical as stage4
+import server
+
+
+@pytest.fixture(scope="module")
+def sessions():
+    made = {}
+
+    def _session(name, load_fixture):
+        if name not in made:
+            made[name] = server.ScenarioSession(load_fixture(name))
+        return made[name]
+
+    return _session
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+def test_with_nothing_fixed_the_conditions_are_stage_fours(load_fixture, sessions, name):
+    session = sessions(name, load_fixture)
+    settled = stage2.settle_league(load_fixture(name))
+    payload = stage4.scenarios_payload(
+        settled, stage4.outcomes_in(stage3.compact_payload(settled))
+    )
+
+    for scenario in payload["scenarios"]:
+        answer = session.conditions(scenario["team"])
+        answer.pop("verdict")
+        assert answer == scenario
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json"])
+def test_with_every_game_fixed_the_verdicts_are_that_permutations(
+    load_fixture, sessions, name
+):
+    session = sessions(name, load_fixture)
+    evaluator = stage4.PermutationEvaluator(session.settled)
+    for mask in (0, session.count - 1, session.count // 3):
+        winners = stage4.outcome_winners(mask, session.matchups)
+        decided = evaluator.verdicts_for(mask, list(session.open))
+        answered = session.verdicts(winners)
+        for team, verdict in answered.items():
+            assert verdict == decided.get(team, session.verdicts_now[team])
+
+
+def test_a_fixed_game_is_never_a_condition(load_fixture, sessions):
+    session = sessions("week13.json", load_fixture)
+    fixed = session.matchups[0]["team1"]
+    for team in session.open:
+        answer = session.conditions(team, [fixed])
+        for label in ("clinch", "elim"):
+            for alternative in answer.get(label, []):
+                assert all(c["matchup"] != 0 for c in alternative["conditions"])
+
+
+@pytest.mark.parametrize(
+    "winners, message",
+    [
+        (["Nobody"], "no such team"),
+        (["<both>"], "cannot both win"),
+    ],
+)
+def test_an_impossible_question_says_why(load_fixture, sessions, winners, message):
+    session = sessions("week12.json", load_fixture)
+    if winners == ["<both>"]:
+        winners = [session.matchups[0]["team1"], session.matchups[0]["team2"]]
+    with pytest.raises(ValueError, match=message):
+        session.verdicts(winners)
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+@pytest.mark.parametrize("seed", range(3))
+def test_results_going_final_change_only_what_a_full_recompute_would(
+    load_fixture, name, seed
+):
+    live = server.ScenarioSession(load_fixture(name))
+    fresh = server.ScenarioSession(load_fixture(name))
+    rng = random.Random(seed)
+    games = list(live.matchups)
+    rng.shuffle(games)
+    winners = []
+    for game in games:
+        winner = game[rng.choice(["team1", "team2"])]
+        before = {team: fresh.conditions(team, winners) for team in live.open}
+        winners.append(winner)
+        after = {team: fresh.conditions(team, winners) for team in live.open}
+
+        changed = live.finalise(winner)
+
+        assert changed == {t: a for t, a in after.items() if a != before[t]}
+        assert live.verdicts() == fresh.verdicts(winners)
+        assert len(live.live) == len(fresh.outcomes(winners))
+
+
+def test_a_final_result_is_final(load_fixture):
+    session = server.ScenarioSession(load_fixture("week12.json"))
+    game = session.matchups[0]
+    session.finalise(game["team1"])
+
+    assert session.finalise(game["team1"]) == {}
+    with pytest.raises(ValueError, match="cannot both win"):
+        session.finalise(game["team2"])
+    with pytest.raises(ValueError, match="cannot both win"):
+        session.verdicts([game["team2"]])
+
+
+def test_the_live_mode_prints_only_the_changed_sections(load_fixture, capsys):
+    session = server.ScenarioSession(load_fixture("week13.json"))
+    game = session.matchups[1]
+    expected = server.ScenarioSession(load_fixture("week13.json")).finalise(game["team2"])
+
+    server.follow(session, [f"{game['team2']}\n", "Nobody\n", f"{game['team2']}\n"])
+
+    out, err = capsys.readouterr()
+    assert f"FINAL: {game['team2']} WIN" in out
+    for team in expected:
+        assert team in out
+    assert "no scenario changes" in out
+    assert "no such team: Nobody" in err
+
+
+def test_the_server_answers_over_http(load_fixture, sessions):
+    session = sessions("week13.json", load_fixture)
+    httpd = server.make_server(session)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+
+    def get(path, **query):
+        url = f"{base}{path}?{urllib.parse.urlencode(query, doseq=True)}"
+        with urllib.request.urlopen(url) as response:
+            return json.load(response)
+
+    try:
+        winner = session.matchups[0]["team2"]
+        assert get("/verdicts", win=[winner]) == session.verdicts([winner])
+        team = next(iter(session.open))
+        assert get("/conditions", team=team) == session.conditions(team)
+        assert [t["team_name"] for t in get("/standings")] == list(session.verdicts_now)
+
+        with pytest.raises(urllib.error.HTTPError) as bad:
+            get("/verdicts", win=["Nobody"])
+        assert bad.value.code == 400
+        assert "no such team" in json.load(bad.value)["error"]
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            get("/nowhere")
+        assert missing.value.code == 404
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_a_final_result_can_be_posted(load_fixture):
+    session = server.ScenarioSession(load_fixture("week13.json"))
+    expected = server.ScenarioSession(load_fixture("week13.json"))
+    httpd = server.make_server(session)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    winner = session.matchups[1]["team2"]
+    try:
+        request = urllib.request.Request(
+            f"{base}/final?{urllib.parse.urlencode({'win': winner})}", method="POST"
+        )
+        with urllib.request.urlopen(request) as response:
+            changed = json.load(response)["changed"]
+        assert changed == expected.finalise(winner)
+        with urllib.request.urlopen(f"{base}/verdicts") as response:
+            assert json.load(response) == expected.verdicts()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
@@ -0,0 +1,96 @@
+"""The verdict cache may save a run its work, never change what the run says."""
+
+import copy
+import json
+import os
+import time
+
+import pytest
+
+import generate_perms as stage3
+import playoff_math
+import refine_current_week as stage2
+import refine_hypothetical as stage4
+import verdict_cache
+from verdict_cache import VerdictCache, cache_key
+
+
+def test_what_is_put_is_got_back(tmp_path):
+    cache = VerdictCache(str(tmp_path / "cache"))
+    cache.put("abc", {"standings": [{"team_name": "A", "verdict": "alive"}]})
+
+    assert cache.get("abc") == {"standings": [{"team_name": "A", "verdict": "alive"}]}
+    assert cache.get("missing") is None
+
+
+def test_an_unreadable_entry_is_a_miss(tmp_path):
+    cache = VerdictCache(str(tmp_path))
+    (tmp_path / "abc.json").write_text("{not json")
+
+    assert cache.get("abc") is None
+
+
+def test_the_least_recently_used_entries_go_first(tmp_path):
+    cache = VerdictCache(str(tmp_path), max_bytes=10**9)
+    for number, key in enumerate("abc"):
+        cache.put(key, "x" * 100)
+        os.utime(tmp_path / f"{key}.json", (1000 + number, 1000 + number))
+    cache.get("a")  # used since b and c were written
+
+    cache.max_bytes = 2 * os.path.getsize(tmp_path / "a.json")
+    cache.evict()
+
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+
+
+def test_the_key_follows_every_input_and_the_engine_version(monkeypatch):
+    key = cache_key("settled", standings=[{"wins": 3}], playoff_spots=4)
+
+    assert key == cache_key("settled", playoff_spots=4, standings=[{"wins": 3}])
+    assert key != cache_key("settled", standings=[{"wins": 4}], playoff_spots=4)
+    assert key != cache_key("scenarios", standings=[{"wins": 3}], playoff_spots=4)
+    monkeypatch.setattr(playoff_math, "ENGINE_VERSION", playoff_math.ENGINE_VERSION + 1)
+    assert key != cache_key("settled", standings=[{"wins": 3}], playoff_spots=4)
+
+
+def test_no_cache_directory_means_no_cache():
+    assert verdict_cache.open_cache(None) is None
+    assert verdict_cache.open_cache("") is None
+
+
+def engine_refuses(*args, **kwargs):
+    raise AssertionError("the engine ran on a league the cache already holds")
+
+
+@pytest.mark.parametrize("name", ["week12.json", "week13.json", "PC_test.json"])
+def test_a_second_run_skips_the_engine_and_says_the_same(
+    load_fixture, tmp_path, monkeypatch, name
+):
+    fixture = load_fixture(name)
+    cache = VerdictCache(str(tmp_path))
+    settled = stage2.settle_league(copy.deepcopy(fixture), cache=cache)
+    counted = stage3.compact_payload(settled)
+    scenarios = stage4.scenarios_payload(
+        settled, stage4.outcomes_in(counted), cache=cache
+    )
+
+    monkeypatch.setattr(playoff_math, "apply_verdicts", engine_refuses)
+    monkeypatch.setattr(stage4.PermutationEvaluator, "relevance", engine_refuses)
+    again = stage2.settle_league(copy.deepcopy(fixture), cache=cache)
+    # Compared as the stage prints it: an entry read back from disk has lists
+    # where the engine built tuples.
+    assert json.dumps(again) == json.dumps(settled)
+    assert json.dumps(
+        stage4.scenarios_payload(again, stage4.outcomes_in(counted), cache=cache)
+    ) == json.dumps(scenarios)
+
+
+def test_verdicts_cut_short_by_the_deadline_are_not_kept(load_fixture, tmp_path):
+    fixture = load_fixture("week12.json")
+    cache = VerdictCache(str(tmp_path))
+    settled = stage2.settle_league(
+        copy.deepcopy(fixture), deadline=time.monotonic() - 1, cache=cache
+    )
+
+    assert any(team.get("undetermined") for team in settled["standings"])
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,171 @@
+"""The compact wire format may change how a payload travels, never what arrives."""
+
+import copy
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import config
+import wire
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def league():
+    return {
+        "league_data": {"playoff_spots": 4},
+        "standings": [{"team_name": "A", "wins": 3}],
+        "weekly_scores": [{"name": "A", "scores": [101.5, 99.2]}],
+        "logos": {"A": "data:image/png;base64," + "A" * 5000},
+        "projected_ppg": {"A": 110.0},
+    }
+
+
+def test_the_pretty_wire_is_the_indented_json_it_always_was():
+    payload = league()
+    assert wire.dumps(payload) == json.dumps(payload, indent=2)
+
+
+@pytest.mark.parametrize("nested", [False, True])
+def test_blobs_go_to_side_files_and_come_back(tmp_path, nested):
+    payload = {"base_league_data": league(), "outcome_count": 4} if nested else league()
+    original = copy.deepcopy(payload)
+
+    text = wire.dumps(payload, "compact", blob_dir=str(tmp_path))
+
+    assert payload == original, "the payload handed in is left alone"
+    assert "\n" not in text and "base64" not in text
+    sent = json.loads(text)
+    carried = sent["base_league_data"] if nested else sent
+    for key in wire.BLOBS:
+        assert set(carried[key]) == {wire.REFERENCE}
+    assert wire.resolve(sent) == original
+
+
+def test_a_reference_passes_through_later_stages_as_it_is(tmp_path):
+    first = json.loads(wire.dumps(league(), "compact", blob_dir=str(tmp_path)))
+    written = sorted(os.listdir(tmp_path))
+    stamps = [os.stat(tmp_path / name).st_mtime_ns for name in written]
+
+    again = json.loads(
+        wire.dumps({"base_league_data": first}, "compact", blob_dir=str(tmp_path))
+    )
+
+    assert again["base_league_data"] == first
+    assert sorted(os.listdir(tmp_path)) == written
+    assert [os.stat(tmp_path / name).st_mtime_ns for name in written] == stamps
+
+
+@pytest.fixture
+def no_blob_dir(monkeypatch, tmp_path):
+    """No blob directory configured, and the temp directory an empty one."""
+    monkeypatch.delenv("SCENARIO_BLOBS", raising=False)
+    monkeypatch.setattr(config, "_local", None)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    return tmp_path
+
+
+def test_without_a_blob_directory_a_run_keeps_its_own_and_the_report_clears_it(
+    no_blob_dir,
+):
+    first = json.loads(wire.dumps(league(), "compact"))
+    (run,) = os.listdir(no_blob_dir)
+    assert run.startswith(wire.RUN_PREFIX)
+    assert os.stat(no_blob_dir / run).st_mode & 0o077 == 0
+
+    # A later stage writes next to the references it was handed.
+    payload = {"base_league_data": first, "logos": {"B": "data:image/png;base64,B"}}
+    sent = json.loads(wire.dumps(payload, "compact"))
+    assert os.listdir(no_blob_dir) == [run]
+
+    assert wire.resolve(sent)["base_league_data"] == league()
+    assert os.listdir(no_blob_dir) == []
+
+
+def test_a_file_that_is_not_its_blob_is_rewritten(tmp_path):
+    text = json.dumps(league()["weekly_scores"], separators=(",", ":"))
+    planted = tmp_path / (hashlib.sha256(text.encode()).hexdigest() + ".json")
+    planted.write_text('[{"name": "Mallory", "scores": [999]}]')
+
+    sent = json.loads(wire.dumps(league(), "compact", blob_dir=str(tmp_path)))
+
+    assert planted.read_text() == text
+    assert wire.resolve(sent) == league()
+
+
+def test_a_blob_changed_after_it_was_written_is_refused(tmp_path):
+    sent = json.loads(wire.dumps(league(), "compact", blob_dir=str(tmp_path)))
+    path = sent["weekly_scores"][wire.REFERENCE]
+    with open(path, "w") as file:
+        file.write("[]")
+
+    with pytest.raises(ValueError, match="has changed"):
+        wire.resolve(sent)
+
+
+@pytest.mark.parametrize("report", ["pretty_print.py", "to_html.py"])
+def test_a_compact_pipe_renders_the_same_report(tmp_path, report):
+    env = {**os.environ, "SCENARIO_BLOBS": str(tmp_path)}
+
+    def run(script, *flags, payload):
+        return subprocess.run(
+            [sys.executable, f"scenario_engine/{script}", *flags],
+            input=payload,
+            capture_output=True,
+            text=True,
+            cwd=REPO_ROOT,
+            env=env,
+            check=True,
+        ).stdout
+
+    def pipe(*flags):
+        payload = run(
+            "league_data.py", "--test", "scenario_engine_tests/week13.json", *flags,
+            payload="",
+        )
+        payload = run("refine_current_week.py", *flags, payload=payload)
+        payload = run("generate_perms.py", "--compact", *flags, payload=payload)
+        payload = run("refine_hypothetical.py", *flags, payload=payload)
+        return run(report, payload=payload)
+
+    assert pipe("--wire", "compact") == pipe()
+    assert os.listdir(tmp_path)
+
+
+def test_a_compact_pipe_with_no_blob_directory_leaves_nothing_behind(tmp_path):
+    env = {k: v for k, v in os.environ.items() if k != "SCENARIO_BLOBS"}
+    env["TMPDIR"] = str(tmp_path)
+    payload = ""
+    for script, *flags in (
+        ("league_data.py", "--test", "scenario_engine_tests/week13.json"),
+        ("refine_current_week.py",),
+        ("generate_perms.py", "--compact"),
+        ("refine_hypothetical.py",),
+    ):
+        payload = subprocess.run(
+            [sys.executable, f"scenario_engine/{script}", *flags, "--wire", "compact"],
+            input=payload,
+            capture_output=True,
+            text=True,
+            cwd=REPO_ROOT,
+            env=env,
+            check=True,
+        ).stdout
+    assert len(os.listdir(tmp_path)) == 1
+
+    subprocess.run(
+        [sys.executable, "scenario_engine/pretty_print.py"],
+        input=payload,
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        env=env,
+        check=True,
+    )
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,120 @@
+"""Time prime-implicant generation over random sets of qualifying outcomes.
+
+`conditions.minimal_dnf` spends most of its time finding the prime implicants of
+the outcomes a team clinches or is eliminated in, and that set can be anything
+up to every outcome of ten-odd matchups. This draws random minterm sets at each
+variable count and density asked for and times `conditions._prime_implicants`
+on them, next to the all-pairs rounds it replaced -- kept here as `pairwise` --
+so a change to either is a measured decision rather than a guess. Where both
+run, their primes are checked to be the same set.
+
+The all-pairs rounds are quadratic in the implicants, so they are only run up
+to --pairwise-max variables; above that only the current code is timed. The
+sets are seeded, so every run draws the same ones.
+
+    python3 tools/dnf_benchmark.py
+    python3 tools/dnf_benchmark.py --vars 8 12 --densities 0.25 0.5 --sets 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scenario_engine"))
+
+import conditions
+
+
+def pairwise(minterms, num_vars):
+    """The prime implicants by comparing every pair of each round, as before."""
+    full_care = (1 << num_vars) - 1
+    groups = {(m, full_care) for m in minterms}
+    primes = set()
+    while groups:
+        merged = set()
+        combined = set()
+        group_list = sorted(groups)
+        for i in range(len(group_list)):
+            value_a, care_a = group_list[i]
+            for j in range(i + 1, len(group_list)):
+                value_b, care_b = group_list[j]
+                if care_a != care_b:
+                    continue
+                diff = (value_a ^ value_b) & care_a
+                if diff and diff & (diff - 1) == 0:
+                    merged.add(group_list[i])
+                    merged.add(group_list[j])
+                    combined.add((value_a & ~diff, care_a & ~diff))
+        primes.update(g for g in group_list if g not in merged)
+        groups = combined
+    return primes
+
+
+def minterm_sets(rng, num_vars, density, count):
+    """`count` random sets, each outcome in with probability `density`."""
+    sets = []
+    for _ in range(count):
+        chosen = {m for m in range(1 << num_vars) if rng.random() < density}
+        sets.append(chosen or {rng.randrange(1 << num_vars)})
+    return sets
+
+
+def measure(generate, sets, num_vars):
+    """(seconds, primes found) for `generate` over every set."""
+    found = []
+    start = time.perf_counter()
+    for minterms in sets:
+        found.append(generate(minterms, num_vars))
+    return time.perf_counter() - start, found
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="dnf_benchmark.py",
+        description="Time prime-implicant generation over random minterm sets.",
+    )
+    parser.add_argument(
+        "--vars", type=int, nargs=2, default=[6, 14], metavar=("LOW", "HIGH"),
+        help="variable counts to run, inclusive (default: 6 14)",
+    )
+    parser.add_argument(
+        "--densities", type=float, nargs="+", default=[0.1, 0.5, 0.9],
+        help="share of all outcomes in each set",
+    )
+    parser.add_argument("--sets", type=int, default=5, help="sets per shape")
+    parser.add_argument(
+        "--pairwise-max", type=int, default=10,
+        help="most variables to also time the all-pairs rounds at",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    low, high = args.vars
+    print(f"{'vars':>4}  {'density':>7}  {'primes':>8}  {'current':>9}  {'pairwise':>9}")
+    for num_vars in range(low, high + 1):
+        for density in args.densities:
+            rng = random.Random(f"{args.seed}:{num_vars}:{density}")
+            sets = minterm_sets(rng, num_vars, density, args.sets)
+            seconds, found = measure(conditions._prime_implicants, sets, num_vars)
+            primes = sum(len(p) for p in found) // len(sets)
+            baseline = "-"
+            if num_vars <= args.pairwise_max:
+                before, expected = measure(pairwise, sets, num_vars)
+                if expected != found:
+                    print(f"primes differ at {num_vars} vars, density {density}")
+                    return 1
+                baseline = f"{before:8.3f}s"
+            print(
+                f"{num_vars:>4}  {density:>7.2f}  {primes:>8,}  {seconds:8.3f}s  {baseline:>9}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())